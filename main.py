@@ -0,0 +1,311 @@
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from contextlib import ExitStack
+from itertools import islice
+from typing import Any, Dict, IO, Iterator, List, Tuple
+
+from src.config.settings import CLASSIFIER_CONFIG, SNAPSHOT_CONFIG, WORKER_CONFIG
+from src.models import SupportTicket, TicketResolution
+from src.utils.datasets import ARCHIVE_PATH
+from src.utils.metrics import percentile
+from src.utils.serialization import to_jsonable
+from src.utils.snapshot import COMPONENTS as SNAPSHOT_COMPONENTS
+from src.utils.ticket_io import iter_records, ticket_from_record
+
+logger = logging.getLogger("main")
+
+
+def iter_inputs(paths: List[str], fmt: str, stack: ExitStack) -> Iterator[Any]:
+    """Records from every input in order, "-" reads stdin"""
+    for path in paths:
+        stream = sys.stdin if path == "-" else stack.enter_context(open(path, "r", encoding="utf-8"))
+        path_fmt = fmt
+        if fmt == "auto" and path != "-":
+            path_fmt = "jsonl" if path.endswith((".jsonl", ".ndjson")) else "auto"
+        yield from iter_records(stream, path_fmt)
+
+
+def invalid_resolution(record: Any, offset: int, error: Exception) -> TicketResolution:
+    """Failed resolution for a record that isn't a valid ticket"""
+    ticket_id = record.get("id") if isinstance(record, dict) else None
+    return TicketResolution(
+        ticket_id=str(ticket_id) if ticket_id is not None else f"offset-{offset}",
+        response_text="",
+        status="failed",
+        error=f"Invalid ticket: {str(error)}",
+        analysis=None,
+        response=None,
+        context_snapshot={}
+    )
+
+
+async def process_stream(
+    records: Iterator[Any],
+    output: IO[str],
+    concurrency: int,
+    chunk_size: int,
+    resume_from: int,
+    include_context: bool,
+    summary: Dict[str, Any],
+    workers: int = 0
+):
+    """
+    Process records chunk by chunk, writing resolutions as soon as each chunk
+    finishes. `summary` is kept up to date after every chunk so an interrupted
+    run still reports where to resume.
+    """
+    from src.agents.TicketProcessor import TicketProcessor, WorkerPool
+
+    # worker processes each run `concurrency` tickets at a time, the pool preloads before forking
+    if workers:
+        processor = WorkerPool(workers=workers, concurrency=concurrency).start()
+    else:
+        processor = TicketProcessor()
+        # load the models up front, not inside the first tickets' stage timeouts
+        await asyncio.to_thread(processor.warmup)
+    try:
+        await _process_chunks(processor, records, output, concurrency, chunk_size, resume_from, include_context, summary)
+    finally:
+        if workers:
+            processor.shutdown(timeout=30)
+
+
+async def _process_chunks(
+    processor: Any,
+    records: Iterator[Any],
+    output: IO[str],
+    concurrency: int,
+    chunk_size: int,
+    resume_from: int,
+    include_context: bool,
+    summary: Dict[str, Any]
+):
+    offset = resume_from
+    counts = {"completed": 0, "needs_approval": 0, "failed": 0}
+    latencies: List[float] = []
+    stage_latencies: Dict[str, List[float]] = {}
+    start = time.perf_counter()
+    summary.update(next_offset=offset)
+
+    # skip what a previous run already wrote
+    records = islice(enumerate(records), resume_from, None)
+
+    while True:
+        chunk: List[Tuple[int, Any]] = list(islice(records, chunk_size))
+        if not chunk:
+            break
+
+        tickets: List[SupportTicket] = []
+        slots: List[Any] = []
+        for index, record in chunk:
+            try:
+                tickets.append(ticket_from_record(record))
+                slots.append(None)
+            except ValueError as e:
+                slots.append(invalid_resolution(record, index, e))
+
+        resolutions = iter(await processor.process_batch(tickets, concurrency=concurrency))
+        for slot in slots:
+            resolution = slot or next(resolutions)
+            if not include_context:
+                resolution.context_snapshot = {}
+            output.write(json.dumps(to_jsonable(resolution)) + "\n")
+            counts[resolution.status] = counts.get(resolution.status, 0) + 1
+            if resolution.processing_time is not None:
+                latencies.append(resolution.processing_time)
+            for stage, seconds in resolution.timings.items():
+                stage_latencies.setdefault(stage, []).append(seconds)
+        output.flush()
+        offset += len(chunk)
+
+        elapsed = time.perf_counter() - start
+        processed = offset - resume_from
+        summary.update({
+            "processed": processed,
+            **counts,
+            "elapsed_s": round(elapsed, 3),
+            "throughput_per_s": round(processed / elapsed, 2) if elapsed else 0.0,
+            "latency_ms": {
+                f"p{q}": round(percentile(latencies, q) * 1000, 1) for q in (50, 95, 99)
+            },
+            "stage_latency_ms": {
+                stage: {f"p{q}": round(percentile(values, q) * 1000, 1) for q in (50, 95, 99)}
+                for stage, values in sorted(stage_latencies.items())
+            },
+            "next_offset": offset
+        })
+
+
+def cmd_process(args: argparse.Namespace) -> int:
+    chunk_size = args.chunk_size or args.concurrency * 8 * max(args.workers, 1)
+    summary: Dict[str, Any] = {"processed": 0, "next_offset": args.resume_from}
+    status = 0
+    with ExitStack() as stack:
+        if args.output == "-":
+            output = sys.stdout
+        else:
+            # resuming continues the previous output file
+            mode = "a" if args.resume_from or args.append else "w"
+            output = stack.enter_context(open(args.output, mode, encoding="utf-8"))
+
+        try:
+            asyncio.run(process_stream(
+                iter_inputs(args.inputs, args.format, stack),
+                output,
+                concurrency=args.concurrency,
+                chunk_size=chunk_size,
+                resume_from=args.resume_from,
+                include_context=args.include_context,
+                summary=summary,
+                workers=args.workers
+            ))
+        except KeyboardInterrupt:
+            summary["interrupted"] = True
+            status = 130
+        except ValueError as e:
+            # malformed input stream, everything before next_offset was written
+            summary["error"] = str(e)
+            status = 1
+
+    print(json.dumps(summary), file=sys.stderr)
+    return status
+
+
+def cmd_export_classifier(args: argparse.Namespace) -> int:
+    from src.agents.TicketAnalysisAgent import DistilBertBackend, OnnxBackend, TicketTrimmer, format_ticket_text
+    from src.agents.TicketAnalysisAgent.export import export_onnx, parity_check
+    from src.config.settings import CLASSIFIER_CONFIG
+
+    quantize = not args.no_quantize
+    model_file = export_onnx(args.model_path, args.output_dir, quantize=quantize)
+
+    # the optimized model has to agree with the fp32 PyTorch model it came from,
+    # on the trimmed and marked-up text the processor classifies
+    with open(args.sample, "r", encoding="utf-8") as file:
+        tickets = [ticket_from_record(record) for record in iter_records(file)]
+    trimmer = TicketTrimmer.from_config()
+    texts = []
+    for ticket in tickets:
+        subject, content, _, _ = trimmer.trim(ticket.subject, ticket.content)
+        texts.append(format_ticket_text(ticket.customer_info.get("role", ""), subject, content))
+    reference = DistilBertBackend(**dict(CLASSIFIER_CONFIG["distilbert"], model_path=args.model_path, quantize=False))
+    candidate = OnnxBackend(**dict(CLASSIFIER_CONFIG["onnx"], model_path=args.output_dir, quantized=quantize))
+    report = dict(parity_check(reference, candidate, texts), model_file=model_file)
+
+    print(json.dumps(report))
+    if report["agreement"] < args.min_agreement:
+        logger.error(f"Exported model agrees on {report['agreement']:.1%} of tickets, "
+                     f"below the required {args.min_agreement:.1%}")
+        return 1
+    return 0
+
+
+def cmd_train(args: argparse.Namespace) -> int:
+    from src.agents.TicketAnalysisAgent.training import train_tfidf
+
+    report = train_tfidf(
+        args.output,
+        archive_path=args.archive,
+        limit=args.limit,
+        holdout=args.holdout,
+        thresholds=CLASSIFIER_CONFIG["cascade"]["thresholds"],
+        calibration_path=args.calibration
+    )
+    print(json.dumps(report))
+    return 0
+
+
+def cmd_snapshot(args: argparse.Namespace) -> int:
+    from src.utils.snapshot import create_snapshot
+
+    manifest = create_snapshot(args.output, args.components)
+    print(json.dumps(dict(manifest, path=args.output)))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Customer support ticket processing")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    process = subparsers.add_parser(
+        "process",
+        help="Process SupportTicket records into TicketResolution JSONL",
+        description="Stream tickets from JSON/JSONL files or stdin and write one resolution per line. "
+                    "A throughput and latency summary (with the offset to resume from) goes to stderr."
+    )
+    process.add_argument("inputs", nargs="*", default=["-"], help="JSON or JSONL files, - for stdin (default)")
+    process.add_argument("-o", "--output", default="-", help="Resolution JSONL file, - for stdout (default)")
+    process.add_argument("-c", "--concurrency", type=int, default=4, help="Tickets in flight per pipeline stage")
+    process.add_argument("-w", "--workers", type=int, default=WORKER_CONFIG["workers"],
+                         help="Worker processes, 0 processes in this process (default TICKET_WORKERS)")
+    process.add_argument("--chunk-size", type=int, default=None,
+                         help="Tickets read ahead per batch (default 8 x concurrency x workers)")
+    process.add_argument("--resume-from", type=int, default=0,
+                         help="Skip this many input records and append to the output")
+    process.add_argument("--append", action="store_true", help="Append to the output file")
+    process.add_argument("--format", choices=["auto", "json", "jsonl"], default="auto")
+    process.add_argument("--include-context", action="store_true",
+                         help="Keep context_snapshot in the output records")
+    process.set_defaults(func=cmd_process)
+
+    export = subparsers.add_parser(
+        "export-classifier",
+        help="Export the DistilBERT classifier to (int8) ONNX and check parity",
+        description="Export the fine-tuned classifier for the onnx backend, then compare its "
+                    "predictions on the sample tickets against the original PyTorch model."
+    )
+    export.add_argument("--model-path", default="notebook/ticket_classifier",
+                        help="Fine-tuned DistilBERT directory")
+    export.add_argument("--output-dir", default="notebook/ticket_classifier_onnx",
+                        help="Export directory, CLASSIFIER_CONFIG['onnx']['model_path']")
+    export.add_argument("--no-quantize", action="store_true", help="Keep fp32 weights")
+    export.add_argument("--sample", default="tests/data/test_template/ticket_sample.json",
+                        help="Tickets used for the parity check")
+    export.add_argument("--min-agreement", type=float, default=0.95,
+                        help="Fail when fewer tickets get the same top category")
+    export.set_defaults(func=cmd_export_classifier)
+
+    train = subparsers.add_parser(
+        "train",
+        help="Train the TF-IDF tier of the cascade classifier on the ticket archive",
+        description="Fit TF-IDF and logistic regression on the archive tickets for the tfidf backend. "
+                    "Half the held-out tickets calibrate it and the keyword rules for the cascade, "
+                    "accuracy and coverage at the cascade thresholds on the other half are printed as JSON."
+    )
+    train.add_argument("--archive", default=ARCHIVE_PATH, help="Customer support tickets zip")
+    train.add_argument("-o", "--output", default=CLASSIFIER_CONFIG["tfidf"]["model_path"],
+                       help="Model file, CLASSIFIER_CONFIG['tfidf']['model_path']")
+    train.add_argument("--limit", type=int, default=None, help="Use only the first N archive rows")
+    train.add_argument("--holdout", type=float, default=0.2,
+                       help="Share of tickets held out for calibration and the report")
+    train.add_argument("--calibration", default=CLASSIFIER_CONFIG["cascade"]["calibration_path"],
+                       help="Calibration file, CLASSIFIER_CONFIG['cascade']['calibration_path']")
+    train.set_defaults(func=cmd_train)
+
+    snapshot = subparsers.add_parser(
+        "snapshot",
+        help="Write the configured models to a warm-start snapshot",
+        description="Load spaCy, the classifier and the sentence encoder as configured and save local "
+                    "copies (trimmed spaCy pipeline, safetensors weights, tokenizers). Processes started "
+                    "with TICKET_SNAPSHOT_DIR pointing at it load them from disk, offline."
+    )
+    snapshot.add_argument("-o", "--output", default=SNAPSHOT_CONFIG["path"] or "data/snapshot",
+                          help="Snapshot directory, replaced if it exists (default TICKET_SNAPSHOT_DIR)")
+    snapshot.add_argument("--components", nargs="+", choices=SNAPSHOT_COMPONENTS,
+                          help="Only snapshot these models (default all of them)")
+    snapshot.set_defaults(func=cmd_snapshot)
+
+    return parser
+
+
+def main(argv: List[str] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,27 @@
 from src.models import ResponseSuggestion, TicketAnalysis, Priority, TicketCategory
+from src.utils.metrics import span
+from src.utils.model_registry import get_model
+from src.utils.template_registry import compile_template
 
-from typing import Dict, Any, List
-import spacy
-from jinja2 import Template
-import textstat
-from textblob import TextBlob
+from .scoring import ResponseScorer
+
+from typing import Dict, Any, List, Optional
+import asyncio
+import logging
+
+from jinja2 import TemplateError
+
+logger = logging.getLogger(__name__)
 
 class ResponseAgent:
     def __init__(self):
-        self.nlp = spacy.load("en_core_web_sm")
         self.approval_triggers = ["credit", "refund", "compensation", "legal"]
+        self.scorer = ResponseScorer()
+
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_model("spacy_nlp")
 
     async def generate_response(
         self,
@@ -37,16 +49,35 @@ class ResponseAgent:
             "suggested_actions": List[str]
         }
         """
-        # select and customize template
-        template = self._select_template(ticket_analysis, response_templates)
-        filled_template = self._customize_template(
-            template,
+        # rendering and scoring are CPU-bound, keep them off the event loop
+        return await asyncio.to_thread(
+            self._compose_response,
             ticket_analysis,
+            response_templates,
             context
         )
 
+    def _compose_response(
+        self,
+        ticket_analysis: TicketAnalysis,
+        response_templates: Dict[str, str],
+        context: Dict[str, Any]
+    ) -> ResponseSuggestion:
+        """Render the selected template and score it"""
+        # select and customize template
+        with span("render"):
+            template = self._select_template(ticket_analysis, response_templates)
+            variables = self._template_variables(ticket_analysis, context)
+            filled_template = self._render_template(template, variables)
+
         # finding confidence and approval
-        confidence = self._calculate_confidence(filled_template, ticket_analysis)
+        with span("score"):
+            confidence = self._calculate_confidence(
+                filled_template,
+                ticket_analysis,
+                template,
+                variables
+            )
         requires_approval = self._requires_approval(filled_template, ticket_analysis, confidence)
         actions = self._generate_actions(ticket_analysis, context)
 
@@ -57,6 +88,27 @@ class ResponseAgent:
             suggested_actions=actions
         )
     
+    def template_response(
+        self,
+        ticket_analysis: TicketAnalysis,
+        response_templates: Dict[str, str],
+        context: Dict[str, Any]
+    ) -> ResponseSuggestion:
+        """
+        Degraded response: the selected template rendered without readability
+        and sentiment scoring, so its confidence is the priority baseline alone
+        """
+        with span("render"):
+            template = self._select_template(ticket_analysis, response_templates)
+            filled_template = self._render_template(template, self._template_variables(ticket_analysis, context))
+        confidence = self._base_confidence(ticket_analysis)
+        return ResponseSuggestion(
+            response_text=filled_template,
+            confidence_score=confidence,
+            requires_approval=self._requires_approval(filled_template, ticket_analysis, confidence),
+            suggested_actions=self._generate_actions(ticket_analysis, context)
+        )
+
     def _select_template(
         self,
         analysis: TicketAnalysis,
@@ -83,6 +135,14 @@ class ResponseAgent:
         context: Dict[str, Any]
     ) -> str:
         """Customize template based on customer information"""
+        return self._render_template(template, self._template_variables(analysis, context))
+
+    def _template_variables(
+        self,
+        analysis: TicketAnalysis,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Template variables from the analysis and customer information"""
         # extract entities for templating
         customer_name = self._extract_customer_name(context)
         # expected update based on priority
@@ -92,7 +152,7 @@ class ResponseAgent:
             Priority.MEDIUM: "Within 1 to 2 weeks.",
             Priority.LOW: "Within 1 month or as resources permit."
         }
-        variables = {
+        return {
             "name": customer_name or "valued customer",
             "priority": analysis.priority.name.lower(),
             "key_points": ", ".join(analysis.key_points[:3]),
@@ -102,12 +162,13 @@ class ResponseAgent:
             "feedback_channel": "email",
             **context.get("customer_info", {})
         }
-        
+
+    def _render_template(self, template: str, variables: Dict[str, Any]) -> str:
         # render template with error handling
         try:
-            return Template(template).render(**variables)
-        except:
-            print("hi")
+            return compile_template(template).render(**variables)
+        except (TemplateError, KeyError) as e:
+            logger.warning(f"Template rendering failed, using it unrendered: {str(e)}")
             return template  # fallback to raw template
         
     def _extract_customer_name(self, context: Dict[str, Any]) -> str:
@@ -115,33 +176,45 @@ class ResponseAgent:
         if "customer_name" in context.get("customer_info", {}):
             return context["customer_info"]["customer_name"]
         
-        # fallback to NER extraction from ticket history
+        # names from the processor's shared NER pass over this ticket
+        ticket_context = context.get("ticket_context")
+        if ticket_context is not None and ticket_context.person_names:
+            return ticket_context.person_names[0]
+
+        # fallback to NER extraction from ticket history, one pass per ticket
         if "previous_tickets" in context:
-            doc = self.nlp("\n".join(context["previous_tickets"]))
-            for ent in doc.ents:
-                if ent.label_ == "PERSON":
-                    return ent.text
+            for doc in self.nlp.pipe(context["previous_tickets"]):
+                for ent in doc.ents:
+                    if ent.label_ == "PERSON":
+                        return ent.text
         return ""
     
     def _calculate_confidence(
         self,
         response: str,
-        analysis: TicketAnalysis
+        analysis: TicketAnalysis,
+        template: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None
     ) -> float:
         """Calculate confidence based on readability and sentiment"""
+        # template statistics are precomputed, only the variables are scored per response
+        score = self.scorer.score(response, template, variables)
+
         # base confidence based on priority
-        confidence = 0.7 if analysis.priority.value < 3 else 0.5
+        confidence = self._base_confidence(analysis)
         
         # adjust based on text metrics
-        readability = textstat.flesch_reading_ease(response)
-        confidence += 0.2 if readability > 60 else -0.1
+        confidence += 0.2 if score.readability > 60 else -0.1
         
         # reduce confidence if response is negative 
-        response_sentiment = TextBlob(response).sentiment.polarity
-        confidence += 0.1 * response_sentiment
+        confidence += 0.1 * score.polarity
         
         return max(0, min(1, confidence))
     
+    @staticmethod
+    def _base_confidence(analysis: TicketAnalysis) -> float:
+        return 0.7 if analysis.priority.value < 3 else 0.5
+
     def _requires_approval(
         self,
         response: str,
@@ -1 +1,2 @@
-from .ResponseAgent import ResponseAgent
\ No newline at end of file
+from .ResponseAgent import ResponseAgent
+from .scoring import ResponseScorer
@@ -0,0 +1,235 @@
+from src.models import ResponseScore
+from src.utils.template_registry import compile_template
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import math
+import re
+
+from jinja2 import nodes
+
+# Flesch reading ease constants for English, as in textstat (0.7.5, see requirements.txt)
+FRE_BASE = 206.835
+FRE_SENTENCE_LENGTH = 1.015
+FRE_SYLLABLES_PER_WORD = 84.6
+
+# textstat's sentence pattern, sentences of two words or fewer are not counted
+_SENTENCE = re.compile(r"\b[^.!?]+[.!?]*", re.UNICODE)
+_PLACEHOLDER = re.compile("\x00(\\w+)\x00")
+_WHITESPACE = re.compile(r"\s")
+
+# (words, syllables, sentiment tokens) of a piece of text
+Stats = Tuple[int, int, Tuple[str, ...]]
+
+
+@dataclass
+class _Profile:
+    """A template split into static text and variables, static statistics precomputed"""
+    statics: List[str]  # rendered text around the variables, one more than names
+    names: List[str]
+    heads: List[str]  # text before the first whitespace of each static segment
+    tails: List[str]  # text after its last whitespace
+    cores: List[Optional[Stats]]  # statistics of what lies between, None without whitespace
+
+
+@lru_cache(maxsize=65536)
+def chunk_stats(text: str) -> Stats:
+    """
+    Word and syllable counts and sentiment tokens of whitespace-delimited text.
+    Both scorers work token by token, so the stats of adjacent chunks add up to
+    the stats of their concatenation.
+    """
+    # imported here as both pull in nltk, which is slow to import
+    import textstat
+    from textblob.en import sentiment
+
+    tokens = " ".join(sentiment.tokenizer(text)).split()
+    return (
+        textstat.lexicon_count(text),
+        textstat.syllable_count(text),
+        tuple(token.lower() for token in tokens)
+    )
+
+
+@lru_cache(maxsize=65536)
+def _sentence_words(sentence: str) -> int:
+    import textstat
+    return textstat.lexicon_count(sentence)
+
+
+def count_sentences(text: str) -> int:
+    """textstat.sentence_count, with the word count of repeated sentences cached"""
+    if not text:
+        return 0
+    sentences = _SENTENCE.findall(text)
+    ignored = sum(1 for sentence in sentences if _sentence_words(sentence) <= 2)
+    return max(1, len(sentences) - ignored)
+
+
+def _legacy_round(number: float, points: int) -> float:
+    """textstat's rounding of its outputs, half away from zero"""
+    p = 10 ** points
+    return float(math.floor(number * p + math.copysign(0.5, number))) / p
+
+
+def flesch_reading_ease(words: int, sentences: int, syllables: int) -> float:
+    """textstat.flesch_reading_ease from precomputed counts, rounded the way textstat rounds"""
+    sentence_length = _legacy_round(words / sentences, 1) if sentences else 0.0
+    syllables_per_word = _legacy_round(syllables / words, 1) if words else 0.0
+    return _legacy_round(
+        FRE_BASE
+        - FRE_SENTENCE_LENGTH * sentence_length
+        - FRE_SYLLABLES_PER_WORD * syllables_per_word,
+        2
+    )
+
+
+def polarity(tokens: Sequence[str]) -> float:
+    """TextBlob's average polarity over the assessed tokens"""
+    from textblob.en import sentiment
+
+    assessments = sentiment.assessments(((token, None) for token in tokens), negation=True)
+    total = 0
+    for _, score, _, _ in assessments:
+        total += score
+    return total / float(len(assessments) or 1)
+
+
+def _linear_names(source: str) -> Optional[List[str]]:
+    """Variable names of a template made only of text and {{ name }}, else None"""
+    template = compile_template(source)
+    names = []
+    for node in template.environment.parse(source).body:
+        if not isinstance(node, nodes.Output):
+            return None
+        for child in node.nodes:
+            if isinstance(child, nodes.Name):
+                names.append(child.name)
+            elif not isinstance(child, nodes.TemplateData):
+                return None
+    return names
+
+
+@lru_cache(maxsize=256)
+def template_profile(source: str) -> Optional[_Profile]:
+    """Profile of a template, None when it can't be scored incrementally"""
+    if "\x00" in source:
+        return None
+    names = _linear_names(source)
+    if names is None:
+        return None
+
+    # render with placeholders so whitespace handling matches real renders
+    parts = _PLACEHOLDER.split(
+        compile_template(source).render(**{name: f"\x00{name}\x00" for name in names})
+    )
+    statics, names = parts[0::2], parts[1::2]
+
+    heads, tails, cores = [], [], []
+    for static in statics:
+        first = _WHITESPACE.search(static)
+        if first is None:
+            heads.append(static)
+            tails.append("")
+            cores.append(None)
+            continue
+        last = max(i for i, char in enumerate(static) if char.isspace())
+        heads.append(static[:first.start()])
+        tails.append(static[last + 1:])
+        cores.append(chunk_stats(static[first.start():last + 1]))
+    return _Profile(statics, names, heads, tails, cores)
+
+
+class ResponseScorer:
+    """
+    Readability and sentiment of rendered responses, computed from statistics
+    precomputed for each template's static text.
+
+    Only the text around the interpolated variables is tokenized per response;
+    the result matches textstat.flesch_reading_ease and TextBlob polarity on
+    the full text. Templates with control flow or filters, and responses that
+    don't match their template, are scored on the full text.
+    """
+
+    def score(
+        self,
+        text: str,
+        template: Optional[str] = None,
+        variables: Optional[Dict[str, Any]] = None
+    ) -> ResponseScore:
+        profile = template_profile(template) if template is not None else None
+        if profile is not None:
+            values = [self._value(variables or {}, name) for name in profile.names]
+            if self._render(profile, values) == text:
+                return self._score_profile(profile, values, text)
+        return self.score_text(text)
+
+    def score_batch(
+        self,
+        responses: Sequence[Tuple[str, Optional[str], Optional[Dict[str, Any]]]]
+    ) -> List[ResponseScore]:
+        """Scores of many (text, template, variables) responses"""
+        # identical responses (same template and values) are scored once
+        scores: Dict[Tuple[str, Optional[str]], ResponseScore] = {}
+        results = []
+        for text, template, variables in responses:
+            key = (text, template)
+            if key not in scores:
+                scores[key] = self.score(text, template, variables)
+            results.append(scores[key])
+        return results
+
+    def score_text(self, text: str) -> ResponseScore:
+        """Full textstat and TextBlob pass"""
+        import textstat
+        from textblob import TextBlob
+
+        return ResponseScore(
+            readability=textstat.flesch_reading_ease(text),
+            polarity=TextBlob(text).sentiment.polarity
+        )
+
+    @staticmethod
+    def _value(variables: Dict[str, Any], name: str) -> str:
+        # jinja renders missing variables as empty strings
+        return str(variables[name]) if name in variables else ""
+
+    @staticmethod
+    def _render(profile: _Profile, values: List[str]) -> str:
+        parts = [profile.statics[0]]
+        for value, static in zip(values, profile.statics[1:]):
+            parts.append(value)
+            parts.append(static)
+        return "".join(parts)
+
+    def _score_profile(self, profile: _Profile, values: List[str], text: str) -> ResponseScore:
+        words = syllables = 0
+        tokens: List[str] = []
+
+        def add(stats: Stats):
+            nonlocal words, syllables
+            words += stats[0]
+            syllables += stats[1]
+            tokens.extend(stats[2])
+
+        # text between the last whitespace of one static segment and the first of
+        # the next one (values included) is the only part measured per response
+        pending = ""
+        for i, static in enumerate(profile.statics):
+            if i:
+                pending += values[i - 1]
+            core = profile.cores[i]
+            if core is None:
+                pending += static
+                continue
+            add(chunk_stats(pending + profile.heads[i]))
+            add(core)
+            pending = profile.tails[i]
+        add(chunk_stats(pending))
+
+        return ResponseScore(
+            readability=flesch_reading_ease(words, count_sentences(text), syllables),
+            polarity=polarity(tokens),
+            incremental=True
+        )
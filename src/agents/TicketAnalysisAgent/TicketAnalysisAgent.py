@@ -1,38 +1,60 @@
-from src.models import TicketAnalysis, TicketCategory, Priority
+from src.models import TicketAnalysis, TicketCategory, Priority, TicketContext, RuleMatches, TruncationStats
+from src.config.settings import BATCHING_CONFIG, CLASSIFIER_CONFIG, ANALYSIS_CACHE_CONFIG
+from src.utils.analysis_cache import AnalysisCache, create_analysis_cache
+from src.utils.batching import MicroBatcher
+from src.utils.metrics import registry, span
+from src.utils.model_registry import get_model
+from .classifiers import ClassifierBackend, backend_version
+from .keyphrases import KeyPhraseEngine
+from .rules import RuleEngine
+from .truncation import TicketTrimmer
 
-from typing import List, Optional, Dict, Any
+from dataclasses import replace
+from typing import List, Optional, Dict, Any, Tuple
+import asyncio
 import re
-import yake
-from transformers import pipeline
-
-kw_extractor = yake.KeywordExtractor()
-classifier = pipeline("zero-shot-classification", model="facebook/bart-large-mnli")
 
 class TicketAnalysisAgent:
-    def __init__(self):
-        # urgency word patterns
-        self.urgency_pattern = re.compile(
-            r"\b(asap|urgent|immediately|critical|emmergency|right away|severe|403)\b",
-            re.IGNORECASE
-        )
-        # buisiness impact words
-        self.impact_words = {
-            "payroll" : 2.0,
-            "revenue" : 1.8,
-            "sales" : 1.5,
-            "demo" : 1.5,
-            "client" : 1.3
-        }
-        # customer role weights
-        self.role_weights = {
-            "ceo" : 2.0, "cfo" : 2.0, "cto" : 2.0,
-            "director" : 1.7, "manager" : 1.3
-        }
+    def __init__(
+        self,
+        classifier: Optional[ClassifierBackend] = None,
+        cache: Optional[AnalysisCache] = None,
+        rules: Optional[RuleEngine] = None,
+        keyphrases: Optional[KeyPhraseEngine] = None,
+        trimmer: Optional[TicketTrimmer] = None
+    ):
+        # category model, the shared CLASSIFIER_CONFIG backend unless given
+        self._classifier = classifier
+        # model-derived results keyed on ticket content, None disables caching
+        self.cache = cache if cache is not None else create_analysis_cache()
+        self.confidence_threshold = CLASSIFIER_CONFIG["confidence_threshold"]
+        # urgency, role, impact and category keyword rules, compiled once
+        self.rules = rules or RuleEngine.from_config()
+        # key point extractor with a per-content cache, KEYPHRASE_CONFIG unless given
+        self.keyphrases = keyphrases or KeyPhraseEngine.from_config()
+        # token budget and classifier chunking, PREPROCESS_CONFIG unless given
+        self.trimmer = trimmer or TicketTrimmer.from_config()
+        # concurrent analyze_ticket calls share one classifier forward pass
+        self.batcher = MicroBatcher(self._classify_with_scores, **BATCHING_CONFIG)
+
+    @property
+    def classifier(self) -> ClassifierBackend:
+        """Classifier backend, loaded on first use"""
+        if self._classifier is None:
+            self._classifier = get_model("classifier")
+        return self._classifier
+
+    @property
+    def model_version(self) -> str:
+        """Everything a cached result depends on besides the ticket text"""
+        classifier = self._classifier.version if self._classifier is not None else backend_version()
+        return f"{classifier}|threshold={self.confidence_threshold}|rules={self.rules.version}|keyphrases={self.keyphrases.version}|chunk={self.trimmer.chunk_tokens}|{ANALYSIS_CACHE_CONFIG['version']}"
 
     async def analyze_ticket(
         self,
         ticket_content: str,
-        customer_history: Optional[Dict[str, Any]] = None
+        customer_history: Optional[Dict[str, Any]] = None,
+        ticket_context: Optional[TicketContext] = None
     ) -> TicketAnalysis:
         """
         Implement:
@@ -57,22 +79,132 @@ class TicketAnalysisAgent:
         }
         """
         # clean and preprocess ticket_content
-        clean_text = self._preprocess_text(ticket_content)
+        with span("preprocess"):
+            clean_text = self._clean_text(ticket_content, ticket_context)
+
+        cache_key, cached = self._cache_lookup(clean_text)
+        if cached is None:
+            # classify text, batched with any other tickets in flight
+            with span("classify"):
+                category, scores = await self.batcher.submit(clean_text)
+            key_points = None
+        else:
+            category, scores, key_points = cached
+
+        # keyword extraction and scoring are CPU-bound, keep them off the event loop
+        analysis = await asyncio.to_thread(
+            self._build_analysis,
+            clean_text,
+            category,
+            customer_history,
+            scores,
+            key_points,
+            truncation=self._truncation(ticket_content, clean_text, ticket_context)
+        )
+        if cached is None:
+            self._cache_store(cache_key, analysis)
+        return analysis
 
-        # classify text
-        category = self._classify_ticket(clean_text)
-        # detect urgency
-        urgency_indicators = self._detect_urgency(clean_text)
+    async def analyze_tickets(
+        self,
+        batch: List[str],
+        customer_histories: Optional[List[Optional[Dict[str, Any]]]] = None,
+        ticket_contexts: Optional[List[Optional[TicketContext]]] = None
+    ) -> List[TicketAnalysis]:
+        """Analyse several tickets with a single classifier pass"""
+        if customer_histories is None:
+            customer_histories = [None] * len(batch)
+        if ticket_contexts is None:
+            ticket_contexts = [None] * len(batch)
+        if not len(customer_histories) == len(ticket_contexts) == len(batch):
+            raise ValueError("customer_histories and ticket_contexts must match the number of tickets")
 
-        # calculate priority
-        priority = self._calculate_priority(
+        clean_texts = [
+            self._clean_text(text, ticket_context)
+            for text, ticket_context in zip(batch, ticket_contexts)
+        ]
+
+        lookups = [self._cache_lookup(clean_text) for clean_text in clean_texts]
+        misses = [i for i, (_, cached) in enumerate(lookups) if cached is None]
+
+        # only uncached tickets go through the model, off the event loop
+        loop = asyncio.get_running_loop()
+        classified = await loop.run_in_executor(
+            self.batcher.executor,
+            self._classify_with_scores,
+            [clean_texts[i] for i in misses]
+        )
+        results = [cached for _, cached in lookups]
+        for i, (category, scores) in zip(misses, classified):
+            results[i] = (category, scores, None)
+
+        def build_all():
+            # every ticket's rule signals in one scan
+            matches = self.rules.match_batch(clean_texts)
+            # key points of the uncached tickets in one batch
+            with span("key_points"):
+                for i, key_points in zip(misses, self.keyphrases.extract_batch([clean_texts[i] for i in misses])):
+                    category, scores, _ = results[i]
+                    results[i] = (category, scores, key_points)
+            return [
+                self._build_analysis(
+                    clean_text, category, history, scores, key_points, rule_matches,
+                    self._truncation(text, clean_text, ticket_context)
+                )
+                for text, clean_text, (category, scores, key_points), history, rule_matches, ticket_context
+                in zip(batch, clean_texts, results, customer_histories, matches, ticket_contexts)
+            ]
+
+        analyses = await asyncio.to_thread(build_all)
+        for i in misses:
+            self._cache_store(lookups[i][0], analyses[i])
+        return analyses
+
+    def analyze_rules_only(
+        self,
+        ticket_content: str,
+        customer_history: Optional[Dict[str, Any]] = None,
+        ticket_context: Optional[TicketContext] = None
+    ) -> TicketAnalysis:
+        """
+        Degraded analysis without the classifier or key phrase extraction:
+        category and priority come from the keyword rules, and the matched
+        category terms stand in for the key points
+        """
+        clean_text = self._clean_text(ticket_content, ticket_context)
+        with span("rules"):
+            matches = self.rules.match(clean_text)
+        category = matches.category
+        return self._build_analysis(
             clean_text,
-            urgency_indicators,
-            customer_history
+            category,
+            customer_history,
+            key_points=list(matches.categories.get(category.value, [])),
+            rule_matches=matches,
+            truncation=self._truncation(ticket_content, clean_text, ticket_context)
         )
 
-        # extract key poits
-        key_points = self._extract_key_points(clean_text)
+    def _build_analysis(
+        self,
+        clean_text: str,
+        category: TicketCategory,
+        customer_history: Optional[Dict[str, Any]],
+        scores: Optional[Dict[str, float]] = None,
+        key_points: Optional[List[str]] = None,
+        rule_matches: Optional[RuleMatches] = None,
+        truncation: Optional[TruncationStats] = None
+    ) -> TicketAnalysis:
+        """Score priority and extract details once the category is known"""
+        with span("priority"):
+            # urgency, role and business impact in a single pass
+            if rule_matches is None:
+                rule_matches = self.rules.match(clean_text)
+            priority = rule_matches.priority
+
+        # extract key poits, unless they came from the cache
+        if key_points is None:
+            with span("key_points"):
+                key_points = self._extract_key_points(clean_text)
 
         # determine required expertise
         required_expertise = self._determine_expertise(category)
@@ -85,7 +217,63 @@ class TicketAnalysisAgent:
             priority = priority,
             key_points = key_points,
             required_expertise = required_expertise,
-            suggested_response_type = suggested_response_type
+            suggested_response_type = suggested_response_type,
+            classifier_scores = scores or {},
+            matched_terms = {
+                "urgency": rule_matches.urgency,
+                "roles": list(rule_matches.roles),
+                "impact": list(rule_matches.impact),
+                "category": rule_matches.categories.get(category.value, [])
+            },
+            truncation = truncation
+        )
+
+    def _cache_lookup(self, clean_text: str) -> Tuple[Optional[str], Optional[tuple]]:
+        """Cache key and the cached (category, scores, key_points), if any"""
+        if self.cache is None:
+            return None, None
+        key = AnalysisCache.make_key(clean_text, self.model_version)
+        cached = self.cache.get(key)
+        if cached is None:
+            return key, None
+        return key, (TicketCategory(cached["category"]), dict(cached["scores"]), list(cached["key_points"]))
+
+    def _cache_store(self, key: Optional[str], analysis: TicketAnalysis):
+        """Cache the parts of an analysis that don't depend on the customer"""
+        if self.cache is None:
+            return
+        self.cache.put(key, {
+            "category": analysis.category.value,
+            "scores": dict(analysis.classifier_scores),
+            "key_points": list(analysis.key_points)
+        })
+
+    def _clean_text(self, text: str, ticket_context: Optional[TicketContext]) -> str:
+        """Preprocess once per ticket, reusing the shared context when given"""
+        if ticket_context is None:
+            # not trimmed by the processor, only the budget applies
+            return self.trimmer.budget(self._preprocess_text(text))
+        if ticket_context.clean_text is None:
+            ticket_context.clean_text = self._preprocess_text(ticket_context.analysis_text)
+        return ticket_context.clean_text
+
+    def _truncation(
+        self,
+        text: str,
+        clean_text: str,
+        ticket_context: Optional[TicketContext]
+    ) -> TruncationStats:
+        """Truncation stats of the processor's trim, or of the budget alone"""
+        chunks = len(self.trimmer.chunks(clean_text))
+        if ticket_context is not None and ticket_context.truncation is not None:
+            return replace(ticket_context.truncation, chunks=chunks)
+        original_tokens = len(text.split())
+        kept_tokens = len(clean_text.split())
+        return TruncationStats(
+            original_tokens=original_tokens,
+            kept_tokens=kept_tokens,
+            chunks=chunks,
+            truncated=kept_tokens < original_tokens
         )
 
     def _preprocess_text(self, text : str) -> str:
@@ -97,69 +285,68 @@ class TicketAnalysisAgent:
 
     def _classify_ticket(self, text : str) -> TicketCategory:
         """Classify text into TextCategory"""
-        labels = [label.value for label in TicketCategory]
-        result = classifier(text, labels)
-        
-        # threshold for model confidence
-        if result["scores"][0] > 0.7:
-            return TicketCategory(result["labels"][0])
-        
-        # fallback to keyword matching
-        return self._keyword_classification(text)
+        return self._classify_tickets([text])[0]
+
+    def _classify_tickets(self, texts: List[str]) -> List[TicketCategory]:
+        """Classify a batch of texts in one padded forward pass"""
+        return [category for category, _ in self._classify_with_scores(texts)]
+
+    def _classify_with_scores(self, texts: List[str]) -> List[Tuple[TicketCategory, Dict[str, float]]]:
+        """Category and per-category model scores for a batch of texts"""
+        if not texts:
+            return []
+        # long texts are split into chunks, all chunks go through the model together
+        chunked = [self.trimmer.chunks(text) for text in texts]
+        results = iter(self.classifier.classify([chunk for chunks in chunked for chunk in chunks]))
+
+        classified = []
+        for text, chunks in zip(texts, chunked):
+            scores = self._aggregate_scores(chunks, [next(results) for _ in chunks])
+            label, top_score = max(scores.items(), key=lambda item: item[1])
+            # threshold for model confidence
+            if top_score > self.confidence_threshold:
+                classified.append((TicketCategory(label), scores))
+            else:
+                # fallback to keyword matching
+                registry.increment("ticket_keyword_fallbacks_total")
+                classified.append((self._keyword_classification(text), scores))
+        return classified
+
+    @staticmethod
+    def _aggregate_scores(chunks: List[str], results: List[Dict[str, Any]]) -> Dict[str, float]:
+        """Per-category scores of a text, the chunk scores averaged by chunk length"""
+        if len(results) == 1:
+            return dict(zip(results[0]["labels"], results[0]["scores"]))
+        weights = [len(chunk.split()) for chunk in chunks]
+        total = sum(weights)
+        scores: Dict[str, float] = {}
+        for weight, result in zip(weights, results):
+            for label, score in zip(result["labels"], result["scores"]):
+                scores[label] = scores.get(label, 0.0) + score * weight / total
+        # ranked like the classifier output
+        return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
 
     def _keyword_classification(self, text: str) -> TicketCategory:
-        """Classify text based keyword occurance"""
-        keywords = {
-            TicketCategory.TECHNICAL: ["error", "bug", "crash", "slow"],
-            TicketCategory.BILLING: ["invoice", "charge", "payment", "fee"],
-            TicketCategory.FEATURE: ["request", "suggest", "add", "new feature"],
-            TicketCategory.ACCESS: ["login", "access", "password", "permission"]
-        }
-        
-        for category, terms in keywords.items():
-            if any(term in text for term in terms):
-                return category
-        return TicketCategory.TECHNICAL  # default
-    
+        """Classify text by the category keyword rules with the most matches"""
+        return self.rules.match(text).category
+
     def _detect_urgency(self, text: str) -> List[str]:
-        """Check how many urgency pattern are in ticket"""
-        return list(set(self.urgency_pattern.findall(text)))
+        """Distinct urgency terms in the ticket, sorted"""
+        return self.rules.match(text).urgency
 
     def _calculate_priority(
             self,
             text: str,
             urgency_indicators: List[str],
-            customer_info: Optional[dict]
+            customer_info: Optional[dict] = None
         ) -> Priority:
             """Calculate priority based on urgency, role and buisiness impact"""
-            base_score = 1.0
-            
-            # urgency score added to base
-            base_score += len(urgency_indicators) * 0.5
-            
-            # role score multiplied to base
-            role_score = max(
-                [v for k, v in self.role_weights.items() if k in text],
-                default=1.0
-                )
-            base_score *= role_score
-            
-            # business impact score multiplied to base
-            impact_score = max(
-                [v for k, v in self.impact_words.items() if k in text],
-                default=1.0
-                )
-            base_score *= impact_score
-            
-            # cap and convert to Priority enum
-            final_score = min(round(base_score), 4)
-            return Priority(final_score)
+            matches = self.rules.match(text)
+            return self.rules.priority(len(urgency_indicators), matches.roles, matches.impact)
     
     def _extract_key_points(self, text: str) -> List[str]:
-        """Keypoints extracted with yake"""
-        keywords = kw_extractor.extract_keywords(text)
-        key_points = [keyword for keyword, score in sorted(keywords, key=lambda x: x[1], reverse=True)]
-        return key_points[:10]  # return top 10 key points
+        """Most relevant key phrases, top KEYPHRASE_CONFIG["top_k"]"""
+        return self.keyphrases.extract(text)
 
     def _determine_expertise(
         self,
@@ -1 +1,9 @@
-from .TicketAnalysisAgent import TicketAnalysisAgent
\ No newline at end of file
+from .TicketAnalysisAgent import TicketAnalysisAgent
+from .classifiers import (
+    ClassifierBackend, ZeroShotBackend, DistilBertBackend, OnnxBackend,
+    RulesBackend, TfidfBackend, CascadeBackend, TierCalibration, create_backend,
+    format_ticket_text
+)
+from .keyphrases import KeyPhraseEngine, StatisticalExtractor, YakeExtractor
+from .rules import RuleEngine
+from .truncation import TicketTrimmer
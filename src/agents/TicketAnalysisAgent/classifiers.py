@@ -0,0 +1,572 @@
+from src.models import TicketCategory
+from src.config.settings import CLASSIFIER_CONFIG
+from src.utils.metrics import registry
+from src.utils.snapshot import snapshot_path
+
+from .rules import RuleEngine
+
+from typing import List, Dict, Any, Optional, Sequence, Union
+from importlib.util import find_spec
+import bisect
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+
+# <|role|>, <|subject|> and <|content|> markup around the ticket fields
+_MARKUP = re.compile(r"<\|\w+\|>")
+
+logger = logging.getLogger(__name__)
+
+
+def format_ticket_text(role: str, subject: str, content: str) -> str:
+    """Mark up role, subject and content, the text the analysis agent classifies"""
+    return f"<|role|> {role} <|role|>"\
+        + f"<|subject|> {subject} <|subject|>"\
+        + f"<|content|> {content} <|content|>"
+
+
+class ClassifierBackend:
+    """
+    Base class for category classifiers.
+
+    classify() returns one result per text in the same shape as the
+    transformers zero-shot pipeline, ranked by score:
+    {"labels": ["access", "technical", ...], "scores": [0.91, 0.05, ...]}
+    """
+    name = "base"
+    model_id = ""
+    # constructor option naming the model file or directory, None for backends without one
+    artifact_option: Optional[str] = None
+
+    @property
+    def version(self) -> str:
+        """Identifies the model, cached results are only reused for the same version"""
+        return f"{self.name}:{self.model_id}"
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @classmethod
+    def available(cls, options: Dict[str, Any]) -> bool:
+        """Whether the backend can be built from these options, checked without loading it"""
+        return True
+
+    def save(self, directory: str) -> Optional[str]:
+        """
+        Write a local copy the backend can be rebuilt from offline, returns the
+        value for its artifact_option or None when there is nothing to save
+        """
+        return None
+
+    @staticmethod
+    def _rank(scores: Dict[str, float]) -> Dict[str, Any]:
+        """Sort category scores into pipeline-style output"""
+        ranked = sorted(scores.items(), key=lambda x: x[1], reverse=True)
+        return {
+            "labels": [label for label, _ in ranked],
+            "scores": [score for _, score in ranked]
+        }
+
+
+class ZeroShotBackend(ClassifierBackend):
+    """BART-large-MNLI zero-shot classification, one NLI pass per category"""
+    name = "zero_shot"
+    artifact_option = "model"
+
+    def __init__(self, model: str = "facebook/bart-large-mnli", batch_size: int = 16):
+        from transformers import pipeline
+        self.model_id = model
+        self.batch_size = batch_size
+        self.labels = [label.value for label in TicketCategory]
+        self.pipeline = pipeline("zero-shot-classification", model=model)
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        if not texts:
+            return []
+        results = self.pipeline(
+            texts,
+            self.labels,
+            batch_size=min(len(texts), self.batch_size)
+        )
+        # the pipeline unwraps single inputs
+        if isinstance(results, dict):
+            results = [results]
+        return results
+
+    def save(self, directory: str) -> Optional[str]:
+        # model and tokenizer, weights as safetensors
+        self.pipeline.save_pretrained(directory)
+        return directory
+
+
+class DistilBertBackend(ClassifierBackend):
+    """Fine-tuned DistilBERT sequence classifier, a single forward pass per ticket"""
+    name = "distilbert"
+    artifact_option = "model_path"
+
+    def __init__(
+        self,
+        model_path: str = "notebook/ticket_classifier",
+        label_map: Optional[Dict[str, str]] = None,
+        max_length: int = 512,
+        batch_size: int = 16,
+        quantize: bool = False,
+        num_threads: Optional[int] = None
+    ):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        self.torch = torch
+        self.model_path = model_path
+        self.quantize = quantize
+        self.model_id = model_path + ("+int8" if quantize else "")
+        self.max_length = max_length
+        self.batch_size = batch_size
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_path)
+        self.model.eval()
+        if quantize:
+            # int8 weights for the linear layers, activations quantized on the fly
+            self.model = torch.ao.quantization.quantize_dynamic(
+                self.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        self.categories = self._map_labels(self.model.config.id2label, label_map)
+
+    @classmethod
+    def available(cls, options: Dict[str, Any]) -> bool:
+        return find_spec("torch") is not None and os.path.isdir(options.get("model_path", ""))
+
+    @staticmethod
+    def _map_labels(id2label: Dict[int, str], label_map: Optional[Dict[str, str]]) -> List[str]:
+        """Model labels are the raw dataset ticket types, map them onto categories"""
+        label_map = label_map or {}
+        categories = [
+            label_map.get(id2label[i], id2label[i]) for i in range(len(id2label))
+        ]
+        unknown = set(categories) - {c.value for c in TicketCategory}
+        if unknown:
+            raise ValueError(f"Unmapped classifier labels: {sorted(unknown)}")
+        return categories
+
+    def save(self, directory: str) -> Optional[str]:
+        model = self.model
+        if self.quantize:
+            # quantized modules can't be saved, store the weights it is quantized from
+            from transformers import AutoModelForSequenceClassification
+            model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+        model.save_pretrained(directory)
+        self.tokenizer.save_pretrained(directory)
+        return directory
+
+    @staticmethod
+    def _clean(text: str) -> str:
+        """Same cleaning the model was fine-tuned on, once the field markup is gone"""
+        text = " ".join(_MARKUP.sub(" ", text).split())
+        return re.sub(r'[^a-zA-Z0-9\s]', '', text.lower()).strip()
+
+    def _probabilities(self, chunk: List[str]) -> List[List[float]]:
+        """Softmax over the model labels for a chunk of cleaned texts"""
+        inputs = self.tokenizer(
+            chunk,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=self.max_length
+        )
+        with self.torch.no_grad():
+            logits = self.model(**inputs).logits
+        return self.torch.nn.functional.softmax(logits, dim=-1).tolist()
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        results = []
+        for start in range(0, len(texts), self.batch_size):
+            chunk = [self._clean(text) for text in texts[start:start + self.batch_size]]
+            for row in self._probabilities(chunk):
+                # several dataset labels can share a category (e.g. refund -> billing)
+                scores = {category.value: 0.0 for category in TicketCategory}
+                for category, prob in zip(self.categories, row):
+                    scores[category] += prob
+                results.append(self._rank(scores))
+        return results
+
+
+class OnnxBackend(DistilBertBackend):
+    """
+    The fine-tuned DistilBERT model exported to ONNX (int8 by default) and run
+    with ONNX Runtime on CPU, without loading PyTorch.
+    """
+    name = "onnx"
+
+    def __init__(
+        self,
+        model_path: str = "notebook/ticket_classifier_onnx",
+        label_map: Optional[Dict[str, str]] = None,
+        max_length: int = 512,
+        batch_size: int = 16,
+        quantized: bool = True,
+        num_threads: Optional[int] = None
+    ):
+        import numpy as np
+        import onnxruntime as ort
+        from transformers import AutoConfig, AutoTokenizer
+        self.np = np
+        self.model_path = model_path
+        path = onnx_model_file(model_path, quantized)
+        self.model_id = path
+        self.max_length = max_length
+        self.batch_size = batch_size
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # one request runs at a time per process, give it all the intra-op threads
+        options.inter_op_num_threads = 1
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_path)
+        self.categories = self._map_labels(AutoConfig.from_pretrained(model_path).id2label, label_map)
+
+    @classmethod
+    def available(cls, options: Dict[str, Any]) -> bool:
+        path = onnx_model_file(options.get("model_path", ""), options.get("quantized", True))
+        return find_spec("onnxruntime") is not None and os.path.exists(path)
+
+    def save(self, directory: str) -> Optional[str]:
+        # the export directory already holds the graph, tokenizer and config
+        shutil.copytree(self.model_path, directory, dirs_exist_ok=True)
+        return directory
+
+    def _probabilities(self, chunk: List[str]) -> List[List[float]]:
+        inputs = self.tokenizer(
+            chunk,
+            return_tensors="np",
+            padding=True,
+            truncation=True,
+            max_length=self.max_length
+        )
+        feed = {key: value.astype(self.np.int64) for key, value in inputs.items() if key in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        # numerically stable softmax
+        exp = self.np.exp(logits - logits.max(axis=-1, keepdims=True))
+        return (exp / exp.sum(axis=-1, keepdims=True)).tolist()
+
+
+class RulesBackend(ClassifierBackend):
+    """
+    The category keyword rules with a confidence: each distinct matched term
+    halves the doubt in its category, scaled by the category's share of all
+    matched terms. Two unambiguous terms give 0.75, conflicting terms less.
+    """
+    name = "rules"
+
+    def __init__(self, rules: Optional[RuleEngine] = None):
+        self.rules = rules or RuleEngine.from_config()
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        results = []
+        for matches in self.rules.match_batch(texts):
+            counts = {category: len(terms) for category, terms in matches.categories.items()}
+            total = sum(counts.values())
+            scores = {category.value: 0.0 for category in TicketCategory}
+            for category, count in counts.items():
+                scores[category] = count / total * (1 - 0.5 ** count)
+            results.append(self._rank(scores))
+        return results
+
+
+class TfidfBackend(ClassifierBackend):
+    """
+    TF-IDF and logistic regression trained on the ticket archive by
+    `python main.py train`, a sparse dot product per ticket.
+    """
+    name = "tfidf"
+    artifact_option = "model_path"
+
+    def __init__(self, model_path: str = "notebook/tfidf_classifier.joblib"):
+        import joblib
+        self.model_path = model_path
+        self.model_id = tfidf_model_id(model_path)
+        self.pipeline = joblib.load(model_path)
+        self.labels = [TicketCategory(label).value for label in self.pipeline.classes_]
+
+    @classmethod
+    def available(cls, options: Dict[str, Any]) -> bool:
+        return find_spec("sklearn") is not None and os.path.exists(options.get("model_path", ""))
+
+    def save(self, directory: str) -> Optional[str]:
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, os.path.basename(self.model_path))
+        shutil.copy2(self.model_path, path)
+        return path
+
+    @staticmethod
+    def clean(text: str) -> str:
+        """Same normalisation for training and inference"""
+        return " ".join(_MARKUP.sub(" ", text).lower().split())
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        if not texts:
+            return []
+        probabilities = self.pipeline.predict_proba([self.clean(text) for text in texts])
+        results = []
+        for row in probabilities:
+            scores = {category.value: 0.0 for category in TicketCategory}
+            scores.update(zip(self.labels, row.tolist()))
+            results.append(self._rank(scores))
+        return results
+
+
+class TierCalibration:
+    """
+    Maps a tier's raw top score to how often its top label was right at that
+    score on held-out tickets. Isotonic, so a higher score never maps lower.
+    """
+
+    def __init__(self, scores: Sequence[float], accuracy: Sequence[float]):
+        if len(scores) != len(accuracy) or not scores:
+            raise ValueError("A calibration needs as many accuracies as scores, at least one")
+        self.scores = list(scores)
+        self.accuracy = list(accuracy)
+
+    @classmethod
+    def fit(cls, scores: Sequence[float], correct: Sequence[bool], min_bin: int = 30) -> "TierCalibration":
+        """
+        Fit on bins of at least `min_bin` tickets by score, so a handful of
+        lucky high-scoring tickets can't map the top scores to certainty
+        """
+        from sklearn.isotonic import IsotonicRegression
+        pairs = sorted(zip(scores, correct))
+        bins = [pairs[start:start + min_bin] for start in range(0, len(pairs), min_bin)]
+        if len(bins) > 1 and len(bins[-1]) < min_bin:
+            bins[-2].extend(bins.pop())
+        model = IsotonicRegression(y_min=0.0, y_max=1.0, out_of_bounds="clip").fit(
+            [sum(score for score, _ in b) / len(b) for b in bins],
+            [sum(ok for _, ok in b) / len(b) for b in bins],
+            sample_weight=[len(b) for b in bins]
+        )
+        return cls(model.X_thresholds_.tolist(), model.y_thresholds_.tolist())
+
+    def __call__(self, score: float) -> float:
+        """Linear between the fitted points, clipped outside them"""
+        i = bisect.bisect_right(self.scores, score)
+        if i == 0:
+            return self.accuracy[0]
+        if i == len(self.scores):
+            return self.accuracy[-1]
+        low, high = self.scores[i - 1], self.scores[i]
+        share = (score - low) / (high - low) if high > low else 0.0
+        return self.accuracy[i - 1] + share * (self.accuracy[i] - self.accuracy[i - 1])
+
+
+def save_calibration(path: str, calibration: Dict[str, TierCalibration]):
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tiers = {name: {"scores": c.scores, "accuracy": c.accuracy} for name, c in calibration.items()}
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"tiers": tiers}, file)
+
+
+def load_calibration(path: Optional[str]) -> Dict[str, TierCalibration]:
+    """Tier name -> calibration from `python main.py train`, empty when there is no file"""
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        tiers = json.load(file)["tiers"]
+    return {name: TierCalibration(entry["scores"], entry["accuracy"]) for name, entry in tiers.items()}
+
+
+def calibration_id(path: Optional[str]) -> str:
+    """Path and modification time of the calibration file, empty when there is none"""
+    return tfidf_model_id(path) if path and os.path.exists(path) else ""
+
+
+class CascadeBackend(ClassifierBackend):
+    """
+    Cheapest tier first: each tier answers the texts whose top score reaches
+    its threshold and passes the rest to the next one, the last tier answers
+    whatever is left. Only uncertain tickets pay for the transformer.
+
+    With a calibration from `python main.py train`, a tier's threshold applies
+    to its held-out accuracy at that score ("confidence" in the result)
+    instead of the raw score, so a threshold of 0.8 means answers that were
+    right 80% of the time.
+    """
+    name = "cascade"
+
+    def __init__(
+        self,
+        tiers: List[Union[str, ClassifierBackend]],
+        thresholds: Optional[Dict[str, float]] = None,
+        calibration_path: Optional[str] = None
+    ):
+        if not tiers:
+            raise ValueError("A cascade needs at least one tier")
+        self.tiers = [build_tier(tier) if isinstance(tier, str) else tier for tier in tiers]
+        self.thresholds = thresholds or {}
+        self.calibration = load_calibration(calibration_path)
+        self.model_id = ">".join(
+            f"{tier.version}@{self.thresholds.get(tier.name)}" for tier in self.tiers
+        )
+        if self.calibration:
+            self.model_id += f"#{calibration_id(calibration_path)}"
+        self._lock = threading.Lock()
+        self._answered = {tier.name: 0 for tier in self.tiers}
+
+    def classify(self, texts: List[str]) -> List[Dict[str, Any]]:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        pending = list(range(len(texts)))
+        for position, tier in enumerate(self.tiers):
+            if not pending:
+                break
+            last = position == len(self.tiers) - 1
+            threshold = self.thresholds.get(tier.name, 1.0)
+            calibrate = self.calibration.get(tier.name)
+            escalated = []
+            for i, result in zip(pending, tier.classify([texts[i] for i in pending])):
+                confidence = calibrate(result["scores"][0]) if calibrate else result["scores"][0]
+                if last or confidence >= threshold:
+                    results[i] = dict(result, tier=tier.name, confidence=confidence)
+                else:
+                    escalated.append(i)
+            self._record(tier.name, len(pending) - len(escalated))
+            pending = escalated
+        return results
+
+    def _record(self, tier: str, answered: int):
+        with self._lock:
+            self._answered[tier] += answered
+        registry.increment("ticket_classifier_tier_total", answered, tier=tier)
+
+    def stats(self) -> Dict[str, Any]:
+        """Texts answered per tier and each tier's share of all texts"""
+        with self._lock:
+            answered = dict(self._answered)
+        total = sum(answered.values())
+        return {
+            "total": total,
+            "tiers": {
+                name: {"answered": count, "hit_rate": count / total if total else 0.0}
+                for name, count in answered.items()
+            }
+        }
+
+
+def tfidf_model_id(model_path: str) -> str:
+    """Path and modification time, so retraining invalidates cached results"""
+    mtime = int(os.path.getmtime(model_path)) if os.path.exists(model_path) else 0
+    return f"{model_path}@{mtime}"
+
+
+def cascade_tiers(tiers: Optional[List[str]] = None, warn: bool = False) -> List[str]:
+    """Configured tiers that can be built, the last one through the usual fallback"""
+    tiers = tiers or CLASSIFIER_CONFIG["cascade"]["tiers"]
+    names = []
+    for position, name in enumerate(tiers):
+        if name not in BACKENDS or name == CascadeBackend.name:
+            raise ValueError(f"Unknown cascade tier '{name}', expected one of {sorted(set(BACKENDS) - {CascadeBackend.name})}")
+        if position == len(tiers) - 1:
+            names.append(resolve_backend(name))
+        elif BACKENDS[name].available(backend_options(name)):
+            names.append(name)
+        elif warn:
+            logger.warning(f"Cascade tier '{name}' is unavailable and skipped")
+    return names
+
+
+def build_tier(name: str) -> ClassifierBackend:
+    if name == CascadeBackend.name:
+        raise ValueError("A cascade can't contain another cascade")
+    return _build(name)
+
+
+def backend_options(name: str) -> Dict[str, Any]:
+    """A backend's CLASSIFIER_CONFIG options, pointing at its warm-start snapshot when there is one"""
+    options = CLASSIFIER_CONFIG.get(name, {})
+    option = getattr(BACKENDS[name], "artifact_option", None)
+    if option is None:
+        return options
+    path = snapshot_path(f"classifier/{name}", f"{name}:{_model_id(name, options)}")
+    return dict(options, **{option: path}) if path else options
+
+
+def _build(name: str) -> ClassifierBackend:
+    options = CLASSIFIER_CONFIG.get(name, {})
+    local = backend_options(name)
+    backend = BACKENDS[name](**local)
+    if local != options:
+        # same weights as the source, so results cached for it stay valid
+        backend.model_id = _model_id(name, options)
+    return backend
+
+
+def onnx_model_file(model_path: str, quantized: bool = True) -> str:
+    """Path of the exported ONNX graph inside an export directory"""
+    return os.path.join(model_path, "model.int8.onnx" if quantized else "model.onnx")
+
+
+BACKENDS = {
+    ZeroShotBackend.name: ZeroShotBackend,
+    DistilBertBackend.name: DistilBertBackend,
+    OnnxBackend.name: OnnxBackend,
+    RulesBackend.name: RulesBackend,
+    TfidfBackend.name: TfidfBackend,
+    CascadeBackend.name: CascadeBackend
+}
+
+
+def resolve_backend(name: Optional[str] = None) -> str:
+    """Selected backend, or the configured fallback when its artifact or runtime is missing"""
+    name = name or CLASSIFIER_CONFIG["backend"]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown classifier backend '{name}', expected one of {sorted(BACKENDS)}")
+    fallback = CLASSIFIER_CONFIG.get("fallback")
+    if fallback and fallback != name and not BACKENDS[name].available(backend_options(name)):
+        return resolve_backend(fallback)
+    return name
+
+
+def backend_version(name: Optional[str] = None) -> str:
+    """Version of a configured backend without loading its model"""
+    name = resolve_backend(name)
+    options = CLASSIFIER_CONFIG.get(name, {})
+    if name == CascadeBackend.name:
+        thresholds = options.get("thresholds", {})
+        version = f"{name}:" + ">".join(
+            f"{backend_version(tier)}@{thresholds.get(tier)}" for tier in cascade_tiers(options.get("tiers"))
+        )
+        calibration = calibration_id(options.get("calibration_path"))
+        return f"{version}#{calibration}" if calibration else version
+    return f"{name}:{_model_id(name, options)}"
+
+
+def _model_id(name: str, options: Dict[str, Any]) -> str:
+    """model_id a backend built from these options will have"""
+    if name == RulesBackend.name:
+        return ""
+    if name == TfidfBackend.name:
+        return tfidf_model_id(options.get("model_path", ""))
+    if name == OnnxBackend.name:
+        return onnx_model_file(options.get("model_path", ""), options.get("quantized", True))
+    suffix = "+int8" if options.get("quantize") else ""
+    return f"{options.get('model') or options.get('model_path', '')}{suffix}"
+
+
+def create_backend(name: Optional[str] = None) -> ClassifierBackend:
+    """Build the classifier backend selected in CLASSIFIER_CONFIG"""
+    requested = name or CLASSIFIER_CONFIG["backend"]
+    name = resolve_backend(requested)
+    if name != requested:
+        logger.warning(f"Classifier backend '{requested}' is unavailable, falling back to '{name}'")
+    if name == CascadeBackend.name:
+        options = CLASSIFIER_CONFIG[name]
+        return CascadeBackend(
+            cascade_tiers(options["tiers"], warn=True),
+            options["thresholds"],
+            options.get("calibration_path")
+        )
+    return _build(name)
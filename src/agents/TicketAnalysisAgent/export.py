@@ -0,0 +1,79 @@
+from .classifiers import ClassifierBackend, onnx_model_file
+
+from typing import Any, Dict, List
+import os
+
+
+def export_onnx(
+    model_path: str,
+    output_dir: str,
+    quantize: bool = True,
+    opset: int = 17
+) -> str:
+    """
+    Export the fine-tuned DistilBERT classifier to ONNX next to its tokenizer
+    and config, plus a dynamically int8-quantized copy when `quantize` is set.
+    Returns the path of the graph OnnxBackend will load.
+    """
+    import torch
+    from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = AutoModelForSequenceClassification.from_pretrained(model_path)
+    model.eval()
+    os.makedirs(output_dir, exist_ok=True)
+
+    sample = tokenizer(["cannot access the admin dashboard"], return_tensors="pt")
+    fp32_path = onnx_model_file(output_dir, quantized=False)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"}
+            },
+            opset_version=opset
+        )
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+
+    if not quantize:
+        return fp32_path
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    int8_path = onnx_model_file(output_dir, quantized=True)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+def parity_check(
+    reference: ClassifierBackend,
+    candidate: ClassifierBackend,
+    texts: List[str]
+) -> Dict[str, Any]:
+    """Top-category agreement and largest score difference between two backends"""
+    expected = reference.classify(texts)
+    actual = candidate.classify(texts)
+
+    mismatches = []
+    max_score_diff = 0.0
+    for i, (ref, cand) in enumerate(zip(expected, actual)):
+        if ref["labels"][0] != cand["labels"][0]:
+            mismatches.append(i)
+        ref_scores = dict(zip(ref["labels"], ref["scores"]))
+        cand_scores = dict(zip(cand["labels"], cand["scores"]))
+        for label, score in ref_scores.items():
+            max_score_diff = max(max_score_diff, abs(score - cand_scores.get(label, 0.0)))
+
+    return {
+        "reference": reference.version,
+        "candidate": candidate.version,
+        "tickets": len(texts),
+        "agreement": (len(texts) - len(mismatches)) / len(texts) if texts else 1.0,
+        "max_score_diff": round(max_score_diff, 4),
+        "mismatches": mismatches
+    }
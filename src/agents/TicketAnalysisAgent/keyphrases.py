@@ -0,0 +1,157 @@
+from src.config.settings import KEYPHRASE_CONFIG
+from src.utils.model_registry import get_model
+
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+import hashlib
+import heapq
+import re
+import threading
+
+# <|role|>, <|subject|> and <|content|> markup around the ticket fields
+_MARKUP = re.compile(r"<\|\w+\|>")
+# words, and single punctuation marks which end a phrase
+_TOKEN = re.compile(r"[\w][\w'-]*|[^\w\s]")
+
+
+class KeyPhraseExtractor:
+    """Candidate phrases of a text with relevance scores, higher is more relevant"""
+
+    name = "base"
+
+    def __init__(self, max_ngram: int = 3):
+        self.max_ngram = max_ngram
+
+    def scored(self, text: str) -> Iterable[Tuple[str, float]]:
+        raise NotImplementedError
+
+
+class YakeExtractor(KeyPhraseExtractor):
+    """YAKE, through the shared keyword_extractor model"""
+
+    name = "yake"
+
+    def scored(self, text: str) -> Iterable[Tuple[str, float]]:
+        # yake scores lower for more relevant phrases
+        return [(phrase, -score) for phrase, score in get_model("keyword_extractor").extract_keywords(text)]
+
+
+class StatisticalExtractor(KeyPhraseExtractor):
+    """
+    RAKE-style scoring in one pass over the tokens: phrases are runs of
+    non-stop words, each word scores its co-occurrence degree over its
+    frequency and a phrase scores the sum of its words.
+    """
+
+    name = "statistical"
+
+    def __init__(self, max_ngram: int = 3):
+        super().__init__(max_ngram)
+        from spacy.lang.en.stop_words import STOP_WORDS
+        self.stop_words = STOP_WORDS
+
+    def scored(self, text: str) -> Iterable[Tuple[str, float]]:
+        phrases: List[Tuple[str, ...]] = []
+        run: List[str] = []
+        # the text is already lowercased and whitespace-collapsed by preprocessing
+        for token in _TOKEN.findall(_MARKUP.sub(" . ", text)):
+            if len(token) < 2 or token in self.stop_words or not token[0].isalnum():
+                phrases.extend(self._split(run))
+                run = []
+            else:
+                run.append(token)
+        phrases.extend(self._split(run))
+
+        frequency: Dict[str, int] = {}
+        degree: Dict[str, int] = {}
+        for phrase in phrases:
+            for word in phrase:
+                frequency[word] = frequency.get(word, 0) + 1
+                degree[word] = degree.get(word, 0) + len(phrase)
+
+        # each distinct phrase once, in order of first appearance
+        seen = dict.fromkeys(phrases)
+        return [
+            (" ".join(phrase), sum(degree[word] / frequency[word] for word in phrase))
+            for phrase in seen
+        ]
+
+    def _split(self, run: List[str]) -> List[Tuple[str, ...]]:
+        return [tuple(run[i:i + self.max_ngram]) for i in range(0, len(run), self.max_ngram)]
+
+
+EXTRACTORS: Dict[str, Type[KeyPhraseExtractor]] = {
+    YakeExtractor.name: YakeExtractor,
+    StatisticalExtractor.name: StatisticalExtractor
+}
+
+
+class KeyPhraseEngine:
+    """
+    Top-k key phrases per ticket, cached by a hash of the cleaned text.
+
+    Only the k best candidates are kept (heap selection), and batches compute
+    each distinct uncached text once.
+    """
+
+    def __init__(
+        self,
+        extractor: Optional[KeyPhraseExtractor] = None,
+        top_k: Optional[int] = None,
+        cache_size: Optional[int] = None
+    ):
+        self.extractor = extractor or YakeExtractor(KEYPHRASE_CONFIG["max_ngram"])
+        self.top_k = top_k or KEYPHRASE_CONFIG["top_k"]
+        self.cache_size = KEYPHRASE_CONFIG["cache_size"] if cache_size is None else cache_size
+        self._cache: "OrderedDict[bytes, List[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_config(cls) -> "KeyPhraseEngine":
+        name = KEYPHRASE_CONFIG["extractor"]
+        if name not in EXTRACTORS:
+            raise ValueError(f"Unknown key phrase extractor '{name}', expected one of {sorted(EXTRACTORS)}")
+        return cls(EXTRACTORS[name](KEYPHRASE_CONFIG["max_ngram"]))
+
+    @property
+    def version(self) -> str:
+        """Identifies the results, part of the analysis cache key"""
+        return f"{self.extractor.name}:n{self.extractor.max_ngram}:top{self.top_k}"
+
+    def extract(self, text: str) -> List[str]:
+        return self.extract_batch([text])[0]
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        """Key phrases of each text, most relevant first"""
+        keys = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts]
+        results: List[Optional[List[str]]] = [None] * len(texts)
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[i] = list(cached)
+                    self.hits += 1
+
+        computed: Dict[bytes, List[str]] = {}
+        for i, key in enumerate(keys):
+            if results[i] is not None:
+                continue
+            if key not in computed:
+                computed[key] = self._top(self.extractor.scored(texts[i]))
+            results[i] = list(computed[key])
+
+        if computed:
+            with self._lock:
+                self.misses += len(computed)
+                self._cache.update(computed)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return results
+
+    def _top(self, scored: Iterable[Tuple[str, float]]) -> List[str]:
+        # stable like sorted(), so equally scored phrases keep their order
+        return [phrase for phrase, _ in heapq.nlargest(self.top_k, scored, key=itemgetter(1))]
@@ -0,0 +1,134 @@
+from src.models import Priority, RuleMatches, TicketCategory
+from src.config.rules import TICKET_RULES
+
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import json
+import os
+import re
+
+# joins batched texts, never part of a word so terms can't match across tickets
+_SEPARATOR = "\x00"
+
+
+class RuleEngine:
+    """
+    Urgency, role, impact and category rules compiled into a single regex.
+
+    Each distinct term is one alternative of the pattern, so one scan over a
+    ticket finds every signal; match() turns the hits into priority and
+    fallback category along with the terms that produced them.
+    """
+
+    def __init__(self, rules: Dict[str, Any]):
+        self.rules = rules
+        self.urgency_weight = rules["urgency"]["weight"]
+        self.default_category = TicketCategory(rules["default_category"])
+        self.category_order = list(rules["categories"])
+
+        # term -> every (signal, label, weight) it counts towards
+        targets: Dict[str, List[Tuple[str, str, float]]] = {}
+        for term in rules["urgency"]["terms"]:
+            targets.setdefault(term.lower(), []).append(("urgency", term, self.urgency_weight))
+        for signal in ("roles", "impact"):
+            for term, weight in rules[signal].items():
+                targets.setdefault(term.lower(), []).append((signal, term, weight))
+        for category, terms in rules["categories"].items():
+            TicketCategory(category)  # fail on unknown categories at load time
+            for term in terms:
+                targets.setdefault(term.lower(), []).append(("categories", category, 1.0))
+
+        # longest first so "new feature" wins over "new" at the same position
+        terms = sorted(targets, key=lambda t: (-len(t), t))
+        self._targets = [targets[term] for term in terms]
+        self.pattern = re.compile(
+            r"(?<!\w)(?:" + "|".join(f"({self._term_pattern(term)})" for term in terms) + r")(?!\w)",
+            re.IGNORECASE
+        )
+        self.version = hashlib.sha256(json.dumps(rules, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+    @classmethod
+    def from_config(cls, path: Optional[str] = None) -> "RuleEngine":
+        """Rules from a JSON file (TICKET_RULES_PATH) or src/config/rules.py"""
+        path = path or os.getenv("TICKET_RULES_PATH")
+        if not path:
+            return cls(TICKET_RULES)
+        with open(path, "r", encoding="utf-8") as file:
+            return cls(json.load(file))
+
+    @staticmethod
+    def _term_pattern(term: str) -> str:
+        wildcard = term.endswith("*")
+        words = term.rstrip("*").split()
+        return r"\s+".join(re.escape(word) for word in words) + (r"\w*" if wildcard else "")
+
+    def match(self, text: str) -> RuleMatches:
+        """All rule signals of one ticket in a single scan"""
+        return self._score(self._hits(self.pattern.finditer(text)))
+
+    def match_batch(self, texts: List[str]) -> List[RuleMatches]:
+        """Rule signals of many tickets, scanned together in one pass"""
+        if not texts:
+            return []
+        starts = []
+        position = 0
+        for text in texts:
+            starts.append(position)
+            position += len(text) + len(_SEPARATOR)
+
+        hits: List[List[Any]] = [[] for _ in texts]
+        for match in self.pattern.finditer(_SEPARATOR.join(texts)):
+            hits[bisect_right(starts, match.start()) - 1].append(match)
+        return [self._score(self._hits(ticket_hits)) for ticket_hits in hits]
+
+    def _hits(self, matches) -> List[Tuple[str, List[Tuple[str, str, float]]]]:
+        """(matched text, targets) for every match"""
+        return [
+            (" ".join(match.group().lower().split()), self._targets[match.lastindex - 1])
+            for match in matches
+        ]
+
+    def _score(self, hits) -> RuleMatches:
+        urgency = set()
+        roles: Dict[str, float] = {}
+        impact: Dict[str, float] = {}
+        categories: Dict[str, List[str]] = {}
+        for text, targets in hits:
+            for signal, label, weight in targets:
+                if signal == "urgency":
+                    urgency.add(text)
+                elif signal == "roles":
+                    roles[text] = weight
+                elif signal == "impact":
+                    impact[text] = weight
+                else:
+                    found = categories.setdefault(label, [])
+                    if text not in found:
+                        found.append(text)
+
+        return RuleMatches(
+            urgency=sorted(urgency),
+            roles=roles,
+            impact=impact,
+            categories=categories,
+            priority=self.priority(len(urgency), roles, impact),
+            category=self._category(categories)
+        )
+
+    def priority(self, urgency_count: int, roles: Dict[str, float], impact: Dict[str, float]) -> Priority:
+        """Urgency adds to the base score, role and business impact multiply it"""
+        score = 1.0 + urgency_count * self.urgency_weight
+        score *= max(roles.values(), default=1.0)
+        score *= max(impact.values(), default=1.0)
+        # cap and convert to Priority enum
+        return Priority(min(round(score), 4))
+
+    def _category(self, categories: Dict[str, List[str]]) -> TicketCategory:
+        if not categories:
+            return self.default_category
+        best = max(
+            categories,
+            key=lambda c: (len(categories[c]), -self.category_order.index(c))
+        )
+        return TicketCategory(best)
@@ -0,0 +1,122 @@
+from src.config.settings import TICKET_TYPE_LABELS
+from src.utils.datasets import ARCHIVE_PATH, iter_archive_rows, ticket_from_row
+
+from .classifiers import (
+    ClassifierBackend, RulesBackend, TfidfBackend, TierCalibration, format_ticket_text, save_calibration
+)
+from .truncation import TicketTrimmer
+
+from typing import Any, Dict, List, Optional, Tuple
+import os
+
+
+def archive_examples(path: str = ARCHIVE_PATH, limit: Optional[int] = None) -> Tuple[List[str], List[str]]:
+    """
+    Ticket texts and their category values from the archive, trimmed and
+    marked up as the processor does before classifying
+    """
+    trimmer = TicketTrimmer.from_config()
+    texts, labels = [], []
+    for row in iter_archive_rows(path, limit):
+        ticket = ticket_from_row(row)
+        subject, content, _, _ = trimmer.trim(ticket.subject, ticket.content)
+        text = format_ticket_text(ticket.customer_info.get("role", ""), subject, content)
+        texts.append(TfidfBackend.clean(text))
+        labels.append(TICKET_TYPE_LABELS[row["Ticket Type"]])
+    return texts, labels
+
+
+def fit_calibration(backend: ClassifierBackend, texts: List[str], labels: List[str]) -> TierCalibration:
+    """Map the backend's top score to how often its top label is right"""
+    results = backend.classify(texts)
+    return TierCalibration.fit(
+        [result["scores"][0] for result in results],
+        [result["labels"][0] == label for result, label in zip(results, labels)]
+    )
+
+
+def tier_report(
+    backend: ClassifierBackend,
+    texts: List[str],
+    labels: List[str],
+    threshold: float,
+    calibration: Optional[TierCalibration] = None
+) -> Dict[str, Any]:
+    """Accuracy overall, and share and accuracy of the texts the tier would answer at `threshold`"""
+    results = backend.classify(texts)
+    correct = [result["labels"][0] == label for result, label in zip(results, labels)]
+    confidence = [
+        calibration(result["scores"][0]) if calibration else result["scores"][0] for result in results
+    ]
+    answered = [i for i, score in enumerate(confidence) if score >= threshold]
+    return {
+        "threshold": threshold,
+        "calibrated": calibration is not None,
+        "accuracy": round(sum(correct) / len(texts), 4) if texts else 0.0,
+        "coverage": round(len(answered) / len(texts), 4) if texts else 0.0,
+        "answered_accuracy": round(sum(correct[i] for i in answered) / len(answered), 4) if answered else None
+    }
+
+
+def train_tfidf(
+    output_path: str,
+    archive_path: str = ARCHIVE_PATH,
+    limit: Optional[int] = None,
+    holdout: float = 0.2,
+    thresholds: Optional[Dict[str, float]] = None,
+    calibration_path: Optional[str] = None,
+    seed: int = 0
+) -> Dict[str, Any]:
+    """
+    Fit the TF-IDF tier on the archive and save it for TfidfBackend.
+
+    Half of the held-out split calibrates the TF-IDF and keyword rules tiers
+    (saved to `calibration_path` for the cascade), the other half measures
+    how often each would answer at its cascade threshold and how accurate
+    those answers are. The model is then refit on every example before
+    saving; the calibration of the held-out model is kept for it.
+    """
+    import joblib
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.pipeline import make_pipeline
+
+    thresholds = thresholds or {}
+    texts, labels = archive_examples(archive_path, limit)
+    train_texts, test_texts, train_labels, test_labels = train_test_split(
+        texts, labels, test_size=holdout, random_state=seed, stratify=labels
+    )
+    calibration_texts, test_texts, calibration_labels, test_labels = train_test_split(
+        test_texts, test_labels, test_size=0.5, random_state=seed, stratify=test_labels
+    )
+
+    def fit(fit_texts: List[str], fit_labels: List[str]):
+        pipeline = make_pipeline(
+            TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=2, max_features=100_000),
+            LogisticRegression(max_iter=1000)
+        )
+        return pipeline.fit(fit_texts, fit_labels)
+
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    joblib.dump(fit(train_texts, train_labels), output_path)
+    tiers = {"tfidf": TfidfBackend(output_path), "rules": RulesBackend()}
+    calibration = {
+        name: fit_calibration(backend, calibration_texts, calibration_labels) for name, backend in tiers.items()
+    }
+    report = {
+        name: tier_report(backend, test_texts, test_labels, thresholds.get(name, 0.8), calibration[name])
+        for name, backend in tiers.items()
+    }
+    if calibration_path:
+        save_calibration(calibration_path, calibration)
+
+    joblib.dump(fit(texts, labels), output_path)
+    return {
+        "model_path": output_path,
+        "calibration_path": calibration_path,
+        "examples": len(texts),
+        "holdout": len(calibration_texts) + len(test_texts),
+        **report
+    }
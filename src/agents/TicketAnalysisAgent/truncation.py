@@ -0,0 +1,160 @@
+from src.models import TruncationStats
+from src.config.settings import PREPROCESS_CONFIG
+
+from typing import List, Tuple
+import re
+
+# "On Mon, 3 Jun 2024 at 10:00, Jane <jane@example.com> wrote:", possibly wrapped onto two lines
+_REPLY_INTRO = re.compile(r"^\s*on\b.{0,300}$", re.IGNORECASE)
+_WROTE = re.compile(r"\bwrote:\s*$", re.IGNORECASE)
+# Outlook and Gmail separators before quoted or forwarded mail
+_SEPARATOR = re.compile(r"^\s*-{2,}\s*(original message|forwarded message)\s*-{2,}\s*$", re.IGNORECASE)
+_HEADER_FROM = re.compile(r"^\s*from:\s", re.IGNORECASE)
+_HEADER_NEXT = re.compile(r"^\s*(sent|date|to|subject):\s", re.IGNORECASE)
+_QUOTED = re.compile(r"^\s*>")
+_SIGNATURE_DELIMITER = re.compile(r"^--\s*$")
+_SIGN_OFF = re.compile(
+    r"^\s*((best|kind|warm|many)?\s*(regards|thanks|thank you|cheers|sincerely|best wishes|best)[\s,.!]*"
+    r"|sent from my \w+.*)$",
+    re.IGNORECASE
+)
+# signature lines are names, titles, companies and contact details, not sentences
+_SIGNATURE_LINE_WORDS = 6
+_SENTENCE_END = re.compile(r"\b[a-z]{2,}[.?!]\s*$")
+
+
+class TicketTrimmer:
+    """
+    Bounds how much of a ticket the analysis reads.
+
+    Quoted replies, forwarded history and the signature are stripped from
+    the content, then the text is cut to a word budget: the subject first,
+    then the newest content (at the top once quotes are gone). The kept
+    text is classified in chunks of at most `chunk_tokens` words, so the
+    work per ticket is bounded by max_tokens / chunk_tokens model inputs.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int = 1024,
+        subject_max_tokens: int = 64,
+        chunk_tokens: int = 256,
+        strip_quoted: bool = True,
+        signature_max_lines: int = 8
+    ):
+        if chunk_tokens < 1 or max_tokens < 1:
+            raise ValueError("max_tokens and chunk_tokens must be at least 1")
+        self.max_tokens = max_tokens
+        self.subject_max_tokens = min(subject_max_tokens, max_tokens)
+        self.chunk_tokens = chunk_tokens
+        self.strip_quoted = strip_quoted
+        self.signature_max_lines = signature_max_lines
+
+    @classmethod
+    def from_config(cls) -> "TicketTrimmer":
+        return cls(
+            max_tokens=PREPROCESS_CONFIG["max_tokens"],
+            subject_max_tokens=PREPROCESS_CONFIG["subject_max_tokens"],
+            chunk_tokens=PREPROCESS_CONFIG["chunk_tokens"],
+            strip_quoted=PREPROCESS_CONFIG["strip_quoted"],
+            signature_max_lines=PREPROCESS_CONFIG["signature_max_lines"]
+        )
+
+    def trim(self, subject: str, content: str) -> Tuple[str, str, str, TruncationStats]:
+        """(subject, content, signature, stats) of a ticket, within the budget"""
+        original_tokens = len(subject.split()) + len(content.split())
+        signature = ""
+        quoted_lines = signature_lines = 0
+        if self.strip_quoted:
+            stripped, quoted_lines = self._strip_quotes(content)
+            stripped, signature, signature_lines = self._strip_signature(stripped)
+            # a bare forward ("FYI" above the original mail) keeps its history
+            if stripped.strip():
+                content = stripped
+            else:
+                quoted_lines = signature_lines = 0
+                signature = ""
+
+        subject_words = subject.split()
+        content_words = content.split()
+        content_budget = self.max_tokens - min(len(subject_words), self.subject_max_tokens)
+        truncated = len(subject_words) > self.subject_max_tokens or len(content_words) > content_budget
+        if len(subject_words) > self.subject_max_tokens:
+            subject_words = subject_words[:self.subject_max_tokens]
+            subject = " ".join(subject_words)
+        if len(content_words) > content_budget:
+            content_words = content_words[:content_budget]
+            content = " ".join(content_words)
+
+        kept_tokens = len(subject_words) + len(content_words)
+        stats = TruncationStats(
+            original_tokens=original_tokens,
+            kept_tokens=kept_tokens,
+            quoted_lines_removed=quoted_lines,
+            signature_lines_removed=signature_lines,
+            chunks=self.chunk_count(kept_tokens),
+            truncated=truncated
+        )
+        return subject, content, signature, stats
+
+    def budget(self, text: str) -> str:
+        """Text cut to max_tokens words, for text that did not go through trim()"""
+        words = text.split(" ")
+        if len(words) <= self.max_tokens:
+            return text
+        return " ".join(words[:self.max_tokens])
+
+    def chunks(self, text: str) -> List[str]:
+        """Consecutive pieces of at most chunk_tokens words, classified separately"""
+        words = text.split()
+        if len(words) <= self.chunk_tokens:
+            return [text]
+        return [
+            " ".join(words[start:start + self.chunk_tokens])
+            for start in range(0, len(words), self.chunk_tokens)
+        ]
+
+    def chunk_count(self, tokens: int) -> int:
+        return max(1, -(-tokens // self.chunk_tokens))
+
+    def _strip_quotes(self, content: str) -> Tuple[str, int]:
+        """Content above the first reply header, without '>' lines"""
+        lines = content.splitlines()
+        kept = []
+        for i, line in enumerate(lines):
+            if self._starts_history(lines, i):
+                return "\n".join(kept), len(lines) - len(kept)
+            if not _QUOTED.match(line):
+                kept.append(line)
+        return "\n".join(kept), len(lines) - len(kept)
+
+    @staticmethod
+    def _starts_history(lines: List[str], i: int) -> bool:
+        line = lines[i]
+        if _SEPARATOR.match(line):
+            return True
+        if _REPLY_INTRO.match(line):
+            if _WROTE.search(line):
+                return True
+            return i + 1 < len(lines) and _WROTE.search(lines[i + 1]) is not None and len(lines[i + 1]) < 100
+        if _HEADER_FROM.match(line):
+            return any(_HEADER_NEXT.match(following) for following in lines[i + 1:i + 4])
+        return False
+
+    def _strip_signature(self, content: str) -> Tuple[str, str, int]:
+        """Content without its trailing signature, the signature and its line count"""
+        lines = content.rstrip().splitlines()
+        start = None
+        # the last delimiter or sign-off, an earlier "Thanks!" can be followed by the request itself
+        for i in range(len(lines) - 1, max(0, len(lines) - self.signature_max_lines) - 1, -1):
+            if _SIGNATURE_DELIMITER.match(lines[i]) or _SIGN_OFF.match(lines[i]):
+                start = i
+                break
+        # a sign-off on the first line is the whole message, not a signature
+        if not start or not all(self._signature_line(line) for line in lines[start + 1:]):
+            return content, "", 0
+        return "\n".join(lines[:start]), "\n".join(lines[start:]), len(lines) - start
+
+    @staticmethod
+    def _signature_line(line: str) -> bool:
+        return len(line.split()) <= _SIGNATURE_LINE_WORDS and not _SENTENCE_END.search(line)
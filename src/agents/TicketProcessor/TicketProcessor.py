@@ -1,30 +1,91 @@
-from src.models import SupportTicket, TicketResolution, TicketAnalysis
+from src.models import ResponseSuggestion, SupportTicket, TicketResolution, TicketAnalysis, TicketContext
+from src.config.settings import NLP_CONFIG, SIMILARITY_CONFIG, WORKER_CONFIG
 
-from src.agents.TicketAnalysisAgent import TicketAnalysisAgent
+from src.agents.TicketAnalysisAgent import TicketAnalysisAgent, TicketTrimmer, format_ticket_text
 from src.agents.ResponseAgent import ResponseAgent
+from src.utils.history_store import CustomerHistoryStore, create_history_store
+from src.utils.metrics import collect_timings, record_resolution, registry, span
+from src.utils.model_registry import get_model, warmup
+from src.utils.similarity_index import SimilarityIndex, create_similarity_index
+from src.utils.template_registry import TemplateRegistry
+
+from .resilience import CircuitBreaker, StagePolicy, StageTimeout
+from .scheduler import PriorityScheduler
 
 import logging
 import asyncio
-import spacy
-from typing import List, Dict, Any
+import threading
+import time
+from typing import List, Dict, Any, Optional
 
 # configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-nlp = spacy.load("en_core_web_sm")
 
 class TicketProcessor:
-    def __init__(self, max_retries: int = 3):
+    def __init__(
+        self,
+        max_retries: int = 3,
+        history_store: Optional[CustomerHistoryStore] = None,
+        similarity_index: Optional[SimilarityIndex] = None,
+        preload: Optional[List[str]] = None
+    ):
         self.analysis_agent = TicketAnalysisAgent()
         self.response_agent = ResponseAgent()
+        # bounded per-customer history, HISTORY_CONFIG backend unless given
+        self.history_store = history_store or create_history_store()
+        # embeddings of processed tickets, None unless SIMILARITY_CONFIG enables it
+        self.similarity_index = similarity_index if similarity_index is not None else create_similarity_index()
         self.context = {
-            "customer_history" : {},
             "system_state": {
                 "last_processed": None,
-                "consecutive_failures": 0
+                "consecutive_failures": 0,
+                "circuit": CircuitBreaker.CLOSED
             }
             }
         self.max_retries = max_retries
+        # per-stage timeouts, transient errors retried up to max_retries times
+        self.stages = {
+            stage: StagePolicy.from_config(stage, max_retries)
+            for stage in ("ner", "analysis", "response")
+        }
+        # opens on consecutive analysis failures, tickets then take the rules and template fast path;
+        # counts them in system_state["consecutive_failures"]
+        self.breaker = CircuitBreaker.from_config("analysis", self.context["system_state"])
+        # models loaded by warmup(), before the first ticket so no stage timeout covers a model load
+        self.preload = WORKER_CONFIG["preload"] if preload is None else preload
+        self._warm = False
+        self._warm_lock = threading.Lock()
+        # strips quotes and signatures and bounds what the analysis reads
+        self.trimmer = TicketTrimmer.from_config()
+        # rule-based pre-triage, orders batches by estimated priority
+        self.scheduler = PriorityScheduler(rules=self.analysis_agent.rules)
+        # compiled response templates, loaded on first use
+        self.template_registry = None
+
+    def warmup(self) -> Dict[str, float]:
+        """Load the preload models once, returns load time per model"""
+        timings = {}
+        with self._warm_lock:
+            if self._warm:
+                return timings
+            for name in self.preload:
+                if name == "sentence_encoder" and self.similarity_index is None:
+                    continue
+                try:
+                    timings.update(warmup([name]))
+                except Exception as e:
+                    # the stage using it fails and takes its fallback instead
+                    logger.warning(f"Could not preload model '{name}': {str(e)}")
+            self._warm = True
+        if timings:
+            logger.info(f"Preloaded {', '.join(f'{n} ({t:.2f}s)' for n, t in timings.items())}")
+        return timings
+
+    async def _ensure_warm(self):
+        # a processor nobody warmed up loads its models before the first ticket's timeouts start
+        if not self._warm:
+            await asyncio.to_thread(self.warmup)
 
     async def process_ticket(
         self,
@@ -42,62 +103,406 @@ class TicketProcessor:
            - API failures
            - Response quality issues
         """
-        resolution = TicketResolution(
+        await self._ensure_warm()
+        start = time.perf_counter()
+        resolution = self._new_resolution(ticket)
+
+        with collect_timings(resolution.timings):
+            try:
+                # update context
+                self._update_context(ticket)
+
+                # parse the ticket once for both agents
+                with span("ner"):
+                    ticket_context = (await self._parse_tickets([ticket]))[0]
+                if self.similarity_index is not None:
+                    with span("embed"):
+                        await asyncio.to_thread(self._embed_tickets, [ticket], [ticket_context])
+
+                # analysis generation, reused from a near-identical recent ticket if any
+                await self._analyse(resolution, ticket, ticket_context)
+
+                # response generation
+                await self._complete_resolution(resolution, ticket, ticket_context)
+
+            except Exception as e:
+                self._fail_resolution(resolution, ticket, e)
+
+        self._finish_resolution(resolution, start)
+        return resolution
+
+    async def process_batch(
+        self,
+        tickets: List[SupportTicket],
+        concurrency: int = 4
+    ) -> List[TicketResolution]:
+        """
+        Process many tickets as a pipeline of parsing, analysis and response
+        stages: contents are parsed in nlp.pipe batches while up to
+        `concurrency` tickets are analysed and up to `concurrency` analysed
+        tickets get their responses. Tickets enter the pipeline highest
+        rule-triaged priority first; resolutions come back in input order and
+        a failing ticket only fails its own resolution.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        await self._ensure_warm()
+
+        resolutions: List[TicketResolution] = [None] * len(tickets)
+        starts = [0.0] * len(tickets)
+        parse_times = [0.0] * len(tickets)
+        embed_times = [0.0] * len(tickets)
+        # bounded so no stage can run arbitrarily far ahead of the next
+        parsed = asyncio.Queue(maxsize=concurrency)
+        analysed = asyncio.Queue(maxsize=concurrency)
+        pipe_batch_size = NLP_CONFIG["pipe_batch_size"]
+        order = self.scheduler.order(tickets)
+
+        async def parse_producer():
+            for start in range(0, len(tickets), pipe_batch_size):
+                indices = order[start:start + pipe_batch_size]
+                parse_start = time.perf_counter()
+                try:
+                    contexts = await self._parse_tickets([tickets[i] for i in indices])
+                    embed_start = time.perf_counter()
+                    await asyncio.to_thread(self._embed_tickets, [tickets[i] for i in indices], contexts)
+                    embed_share = (time.perf_counter() - embed_start) / len(indices)
+                except Exception as e:
+                    for i in indices:
+                        starts[i] = time.perf_counter()
+                        resolutions[i] = self._new_resolution(tickets[i])
+                        self._fail_resolution(resolutions[i], tickets[i], e)
+                        self._finish_resolution(resolutions[i], starts[i])
+                    continue
+                # each ticket gets its share of the nlp.pipe and encoder batches
+                share = (embed_start - parse_start) / len(indices)
+                for i, ticket_context in zip(indices, contexts):
+                    parse_times[i] = share
+                    embed_times[i] = embed_share
+                    await parsed.put((i, ticket_context))
+
+        async def analysis_worker():
+            while True:
+                item = await parsed.get()
+                if item is None:
+                    return
+                i, ticket_context = item
+                starts[i] = time.perf_counter()
+                resolutions[i] = self._new_resolution(tickets[i])
+                resolutions[i].timings["ner"] = parse_times[i]
+                if self.similarity_index is not None:
+                    resolutions[i].timings["embed"] = embed_times[i]
+                with collect_timings(resolutions[i].timings):
+                    try:
+                        self._update_context(tickets[i])
+                        await self._analyse(resolutions[i], tickets[i], ticket_context)
+                    except Exception as e:
+                        self._fail_resolution(resolutions[i], tickets[i], e)
+                        self._finish_resolution(resolutions[i], starts[i])
+                        continue
+                await analysed.put((i, ticket_context))
+
+        async def response_worker():
+            while True:
+                item = await analysed.get()
+                if item is None:
+                    return
+                i, ticket_context = item
+                with collect_timings(resolutions[i].timings):
+                    try:
+                        await self._complete_resolution(resolutions[i], tickets[i], ticket_context)
+                    except Exception as e:
+                        self._fail_resolution(resolutions[i], tickets[i], e)
+                self._finish_resolution(resolutions[i], starts[i])
+
+        analysers = [asyncio.create_task(analysis_worker()) for _ in range(concurrency)]
+        responders = [asyncio.create_task(response_worker()) for _ in range(concurrency)]
+        try:
+            await parse_producer()
+            for _ in analysers:
+                await parsed.put(None)
+            await asyncio.gather(*analysers)
+            for _ in responders:
+                await analysed.put(None)
+            await asyncio.gather(*responders)
+        finally:
+            for task in analysers + responders:
+                task.cancel()
+
+        return resolutions
+
+    def _new_resolution(self, ticket: SupportTicket) -> TicketResolution:
+        """Resolution that stays failed unless processing completes"""
+        return TicketResolution(
             ticket_id=ticket.id,
             response_text="",
             status="failed",
             error=None,
             analysis=None,
             response=None,
-            context_snapshot=self.context.copy()
+            context_snapshot=self._snapshot_context(ticket)
         )
 
+    def _snapshot_context(self, ticket: SupportTicket) -> Dict[str, Any]:
+        """Context as seen by this ticket, sharing the stored history entries"""
+        customer_id = ticket.customer_info.get("customer_id")
+        return {
+            "customer_history": {
+                customer_id: self.history_store.snapshot(customer_id)
+            } if customer_id else {},
+            "history_version": self.history_store.version,
+            "system_state": dict(self.context["system_state"])
+        }
+
+    async def _complete_resolution(
+        self,
+        resolution: TicketResolution,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ):
+        """Generate the response for an analysed ticket and finalize it"""
+        response = self._duplicate_response(resolution, ticket, ticket_context)
+        if response is None:
+            response = await self._respond(resolution, ticket, ticket_context)
+        resolution.response = response
+
+        # finalize
+        resolution.response_text = response.response_text
+        resolution.status = "needs_approval" if response.requires_approval else "completed"
+        self._update_system_state(success=True)
+        self._index_resolution(resolution, ticket, ticket_context)
+
+    async def _parse_tickets(self, tickets: List[SupportTicket]) -> List[TicketContext]:
+        """Contexts of the tickets, without person names when NER fails or times out"""
         try:
-            # update context
-            self._update_context(ticket)
+            return await self.stages["ner"].run(
+                lambda: asyncio.to_thread(self._build_ticket_contexts, tickets)
+            )
+        except Exception as e:
+            # only the name extraction is lost, analysis and response run as usual
+            logger.warning(f"NER failed for {len(tickets)} tickets, continuing without names: {str(e)}")
+            registry.increment("ticket_ner_failures_total", reason=self._failure_reason("ner", e))
+            return self._build_ticket_contexts(tickets, parse=False)
 
-            # analysis generation
-            analysis = await self._generate_analysis(ticket)
-            resolution.analysis = analysis
+    async def _analyse(
+        self,
+        resolution: TicketResolution,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ):
+        """
+        Full analysis while the circuit breaker is closed; the rules-only fast
+        path when it is open or the analysis fails or times out
+        """
+        if self._reuse_duplicate(resolution, ticket, ticket_context):
+            return
+        if self.breaker.allow():
+            try:
+                resolution.analysis = await self.stages["analysis"].run(
+                    lambda: self._generate_analysis(ticket, ticket_context)
+                )
+                self.breaker.record_success()
+                return
+            except Exception as e:
+                self.breaker.record_failure()
+                logger.warning(f"Analysis failed for {ticket.id}, using the rules only: {str(e)}")
+                self._degrade(resolution, self._failure_reason("analysis", e))
+        else:
+            self._degrade(resolution, "circuit_open")
+        resolution.analysis = await asyncio.to_thread(
+            self.analysis_agent.analyze_rules_only,
+            ticket_context.analysis_text,
+            self._get_customer_history(ticket),
+            ticket_context
+        )
 
-            # response generation
-            response = await self._generate_response(analysis, ticket)
-            resolution.response = response
+    async def _respond(
+        self,
+        resolution: TicketResolution,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ) -> ResponseSuggestion:
+        """Scored response, or the template alone on the fast path or when generation fails"""
+        if not resolution.degraded:
+            try:
+                return await self.stages["response"].run(
+                    lambda: self._generate_response(resolution.analysis, ticket, ticket_context)
+                )
+            except Exception as e:
+                logger.warning(f"Response generation failed for {ticket.id}, using the template only: {str(e)}")
+                self._degrade(resolution, self._failure_reason("response", e))
+        return await asyncio.to_thread(
+            self.response_agent.template_response,
+            resolution.analysis,
+            self._load_templates(),
+            self._get_response_context(ticket, ticket_context)
+        )
 
-            # finalize
-            resolution.response_text = response.response_text
-            resolution.status = "needs_approval" if response.requires_approval else "completed"
-            self._update_system_state(success=True)
+    def _degrade(self, resolution: TicketResolution, reason: str):
+        resolution.degraded = True
+        registry.increment("ticket_degraded_total", reason=reason)
 
-        except Exception as e:
-            logger.error(f"Processing failed for {ticket.id}: {str(e)}")
-            resolution.error = str(e)
-            self._update_system_state(success=False)
-            return resolution
+    @staticmethod
+    def _failure_reason(stage: str, error: Exception) -> str:
+        return f"{stage}_timeout" if isinstance(error, StageTimeout) else f"{stage}_failed"
 
-        return resolution
+    def _fail_resolution(self, resolution: TicketResolution, ticket: SupportTicket, error: Exception):
+        logger.error(f"Processing failed for {ticket.id}: {str(error)}")
+        resolution.error = str(error)
+        self._update_system_state(success=False)
+
+    def _finish_resolution(self, resolution: TicketResolution, start: float):
+        """Record total and per-stage latency and outcome counters"""
+        resolution.processing_time = time.perf_counter() - start
+        record_resolution(resolution, registry)
         
     def _update_context(self, ticket: SupportTicket):
         """Maintain customer history and system state"""
         customer_id = ticket.customer_info.get("customer_id")
         if customer_id:
-            self.context["customer_history"].setdefault(customer_id, [])
-            self.context["customer_history"][customer_id].append({
-                "timestamp": asyncio.get_event_loop().time(),
+            # wall-clock time so entries are comparable across worker processes
+            self.history_store.append(customer_id, {
+                "timestamp": time.time(),
                 "ticket_id": ticket.id,
                 "subject": ticket.subject
             })
 
-    async def _generate_analysis(self, ticket: SupportTicket) -> TicketAnalysis:
+    def _format_ticket(
+        self,
+        ticket: SupportTicket,
+        subject: Optional[str] = None,
+        content: Optional[str] = None
+    ) -> str:
+        """Mark up role, subject and content for the analysis agent"""
+        return format_ticket_text(
+            ticket.customer_info.get('role', ''),
+            ticket.subject if subject is None else subject,
+            ticket.content if content is None else content
+        )
+
+    def _build_ticket_contexts(self, tickets: List[SupportTicket], parse: bool = True) -> List[TicketContext]:
+        """
+        Trim tickets to the token budget and parse them in a single nlp.pipe
+        pass (NER only), or skip parsing when `parse` is False
+        """
+        trimmed = [self.trimmer.trim(ticket.subject, ticket.content) for ticket in tickets]
+        if parse:
+            # the signature stays in the NER input, it is where customers give their name
+            docs = get_model("spacy_nlp").pipe(
+                [f"{content}\n{signature}" if signature else content for _, content, signature, _ in trimmed],
+                batch_size=NLP_CONFIG["pipe_batch_size"]
+            )
+        else:
+            docs = [None] * len(tickets)
+        return [
+            TicketContext(
+                ticket_id=ticket.id,
+                analysis_text=self._format_ticket(ticket, subject, content),
+                person_names=[ent.text for ent in doc.ents if ent.label_ == 'PERSON'] if doc is not None else [],
+                doc=doc,
+                content=content,
+                truncation=stats
+            )
+            for ticket, (subject, content, _, stats), doc in zip(tickets, trimmed, docs)
+        ]
+
+    def _similarity_text(self, ticket: SupportTicket, ticket_context: TicketContext) -> str:
+        # quotes and signatures left out, they differ between otherwise identical tickets
+        content = ticket.content if ticket_context.content is None else ticket_context.content
+        return f"{ticket.subject}\n{content}"
+
+    def _embed_tickets(self, tickets: List[SupportTicket], contexts: List[TicketContext]):
+        """Sentence embeddings for the similarity index, in one encoder batch"""
+        if self.similarity_index is None:
+            return
+        try:
+            embeddings = get_model("sentence_encoder").encode(
+                [self._similarity_text(ticket, ticket_context) for ticket, ticket_context in zip(tickets, contexts)],
+                batch_size=SIMILARITY_CONFIG["batch_size"],
+                convert_to_numpy=True
+            )
+        except Exception as e:
+            # the index only saves work, tickets are processed in full without it
+            logger.warning(f"Embedding failed, skipping the similarity index: {str(e)}")
+            return
+        for ticket_context, embedding in zip(contexts, embeddings):
+            ticket_context.embedding = embedding
+
+    def _reuse_duplicate(
+        self,
+        resolution: TicketResolution,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ) -> bool:
+        """Take the analysis of a near-identical ticket processed within the duplicate window"""
+        if self.similarity_index is None or ticket_context.embedding is None:
+            return False
+        with span("duplicate_search"):
+            matches = self.similarity_index.search(
+                ticket_context.embedding,
+                k=1,
+                min_score=SIMILARITY_CONFIG["duplicate_threshold"],
+                since=time.time() - SIMILARITY_CONFIG["duplicate_window_seconds"]
+            )
+        # the role is part of the priority rules, so it has to match as well
+        if not matches or matches[0][2].get("role") != ticket.customer_info.get("role", ""):
+            return False
+        ticket_id, _, entry = matches[0]
+        resolution.analysis = entry["analysis"]
+        resolution.duplicate_of = ticket_id
+        registry.increment("ticket_duplicates_reused_total")
+        return True
+
+    def _duplicate_response(
+        self,
+        resolution: TicketResolution,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ) -> Optional[ResponseSuggestion]:
+        """The duplicate's response, when it was personalised for the same customer and names"""
+        if resolution.duplicate_of is None:
+            return None
+        entry = self.similarity_index.get(resolution.duplicate_of)
+        if entry is None or entry["customer_info"] != self._extract_customer_info(ticket, ticket_context):
+            return None
+        return entry["response"]
+
+    def _index_resolution(
+        self,
+        resolution: TicketResolution,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ):
+        """Make a finished ticket available for duplicate reuse and history search"""
+        # a fast-path analysis must not be reused as if it came from the classifier
+        if self.similarity_index is None or ticket_context.embedding is None or resolution.degraded:
+            return
+        self.similarity_index.add(
+            ticket.id,
+            ticket_context.embedding,
+            entry={
+                "timestamp": time.time(),
+                "ticket_id": ticket.id,
+                "subject": ticket.subject,
+                "role": ticket.customer_info.get("role", ""),
+                "customer_info": self._extract_customer_info(ticket, ticket_context),
+                "analysis": resolution.analysis,
+                "response": resolution.response
+            },
+            group=ticket.customer_info.get("customer_id") or None
+        )
+
+    async def _generate_analysis(
+        self,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ) -> TicketAnalysis:
         """Analyse Ticket"""
         try:
-            ticket_text = f"<|role|> {ticket.customer_info.get('role', '')} <|role|>"\
-                        + f"<|subject|> {ticket.subject} <|subject|>"\
-                        + f"<|content|> {ticket.content} <|content|>"
-            
             return await self.analysis_agent.analyze_ticket(
-                ticket_text,
-                self._get_customer_history(ticket)
+                ticket_context.analysis_text,
+                self._get_customer_history(ticket),
+                ticket_context=ticket_context
             )
         except Exception as e:
             logger.warning(f"Analysis retry failed: {str(e)}")
@@ -107,68 +512,84 @@ class TicketProcessor:
         """Retrieve relevant customer context"""
         customer_id = ticket.customer_info.get("customer_id", "")
         return {
-            "previous_tickets": self.context["customer_history"].get(customer_id, []),
+            "previous_tickets": self.history_store.get(customer_id) if customer_id else [],
             "customer_profile": ticket.customer_info
         }
 
     async def _generate_response(
         self,
         analysis: TicketAnalysis,
-        ticket: SupportTicket
+        ticket: SupportTicket,
+        ticket_context: TicketContext
     ) -> Any:
         """Generate response with fallback"""
         try:
             return await self.response_agent.generate_response(
                 analysis,
                 self._load_templates(),
-                self._get_response_context(ticket)
+                self._get_response_context(ticket, ticket_context)
             )
         except Exception as e:
             logger.error(f"Response generation failed: {str(e)}")
             raise
 
-    def _load_templates(self, path: str = "./src/config/templates.py") -> Dict[str, str]:
-        """Load templates from a Python module"""
-        try:
-            from importlib.util import spec_from_file_location, module_from_spec
-            spec = spec_from_file_location("templates", path)
-            module = module_from_spec(spec)
-            spec.loader.exec_module(module)
-            return module.RESPONSE_TEMPLATES
-        except Exception as e:
-            raise RuntimeError(f"Failed to load templates: {str(e)}")
+    def _load_templates(self) -> Dict[str, str]:
+        """Templates from the registry, reloaded only when the file changes"""
+        if self.template_registry is None:
+            self.template_registry = TemplateRegistry()
+        return self.template_registry.templates
         
-    def _get_response_context(self, ticket: SupportTicket) -> Dict[str, Any]:
+    def _get_response_context(
+        self,
+        ticket: SupportTicket,
+        ticket_context: TicketContext
+    ) -> Dict[str, Any]:
         """Build response context"""
         return {
-            "customer_info": self._extract_customer_info(ticket),
+            "customer_info": self._extract_customer_info(ticket, ticket_context),
             "system_status": self.context["system_state"],
-            "previous_responses": self._get_previous_responses(ticket)
+            "previous_responses": self._get_previous_responses(ticket, ticket_context),
+            "ticket_context": ticket_context
         }
     
-    def _extract_customer_info(self, ticket: SupportTicket) -> Dict[str, str]:
+    def _extract_customer_info(self, ticket: SupportTicket, ticket_context: TicketContext) -> Dict[str, str]:
         return {
             "customer_id" : ticket.customer_info.get("customer_id", 0),
-            "customer_name" : self._extract_customer_name(ticket)
+            "customer_name" : self._extract_customer_name(ticket_context)
         }
     
-    def _extract_customer_name(self, ticket: SupportTicket) -> str:
-        # process the text with spaCy
-        doc = nlp(ticket.content)
-
-        # extract person names using Named Entity Recognition (NER)
-        customer_names = [ent.text for ent in doc.ents if ent.label_ == 'PERSON']
-        return ', '.join(customer_names)
+    def _extract_customer_name(self, ticket_context: TicketContext) -> str:
+        # person names found by the shared NER pass
+        return ', '.join(ticket_context.person_names)
     
-    def _get_previous_responses(self, ticket: SupportTicket) -> List[dict]:
-        """Retrieve historical responses for context"""
+    def _get_previous_responses(
+        self,
+        ticket: SupportTicket,
+        ticket_context: Optional[TicketContext] = None
+    ) -> List[dict]:
+        """Retrieve historical responses for context, most similar first when embedded"""
         customer_id = ticket.customer_info.get("customer_id", 0)
-        return self.context["customer_history"].get(customer_id, [])[-3:] # last 3 tickets
+        if not customer_id:
+            return []
+        if self.similarity_index is not None and ticket_context is not None and ticket_context.embedding is not None:
+            matches = self.similarity_index.search(
+                ticket_context.embedding,
+                k=SIMILARITY_CONFIG["history_k"],
+                group=customer_id
+            )
+            if matches:
+                return [
+                    {
+                        "timestamp": entry["timestamp"],
+                        "ticket_id": entry["ticket_id"],
+                        "subject": entry["subject"],
+                        "similarity": score
+                    }
+                    for _, score, entry in matches
+                ]
+        return self.history_store.get(customer_id, limit=3) # last 3 tickets
         
     def _update_system_state(self, success: bool):
-        """Track system health metrics"""
+        """Track system health metrics, consecutive analysis failures are counted by the breaker"""
         if success:
-            self.context["system_state"]["consecutive_failures"] = 0
-            self.context["system_state"]["last_processed"] = asyncio.get_event_loop().time()
-        else:
-            self.context["system_state"]["consecutive_failures"] += 1
\ No newline at end of file
+            self.context["system_state"]["last_processed"] = asyncio.get_event_loop().time()
\ No newline at end of file
@@ -1 +1,4 @@
-from .TicketProcessor import TicketProcessor
\ No newline at end of file
+from .TicketProcessor import TicketProcessor
+from .pool import WorkerPool
+from .resilience import CircuitBreaker, StagePolicy, StageTimeout
+from .runner import TicketRunner, QueueFull
@@ -0,0 +1,317 @@
+from src.models import SupportTicket, TicketResolution
+from src.config.settings import SIMILARITY_CONFIG, WORKER_CONFIG
+from src.utils.metrics import record_resolution, registry
+from src.utils.model_registry import warmup
+
+from .TicketProcessor import TicketProcessor
+from .scheduler import PriorityScheduler
+
+import asyncio
+import gc
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import zlib
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Task:
+    ticket: SupportTicket
+    future: Future
+    worker: int
+    attempts: int = 0
+
+
+def _worker_main(
+    index: int,
+    tasks: Any,
+    results: Any,
+    processor_factory: Callable[[], Any],
+    concurrency: int,
+    threads: int
+):
+    """Worker process: run up to `concurrency` tickets at a time until a None task arrives"""
+    # the parent handles Ctrl-C and drains the workers
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    if "torch" in sys.modules and threads:
+        # share the cores between workers instead of every worker using all of them
+        sys.modules["torch"].set_num_threads(threads)
+
+    # counters and summaries recorded here are shipped to the parent's registry
+    registry.track_deltas()
+    processor = processor_factory()
+
+    async def handle(task_id: int, ticket: SupportTicket, slots: asyncio.Semaphore):
+        try:
+            resolution = await processor.process_ticket(ticket)
+            # sent first, so the parent has the ticket's metrics when its future resolves
+            results.put(("metrics", task_id, registry.drain()))
+            results.put(("done", task_id, resolution))
+        except Exception as e:
+            # process_ticket reports its own failures, this guards the worker itself
+            results.put(("error", task_id, str(e)))
+        finally:
+            slots.release()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(concurrency)
+        running = set()
+        while True:
+            # only take a ticket off the queue once there is room for it
+            await slots.acquire()
+            item = await loop.run_in_executor(None, tasks.get)
+            if item is None:
+                break
+            task = asyncio.create_task(handle(*item, slots))
+            running.add(task)
+            task.add_done_callback(running.discard)
+        await asyncio.gather(*running)
+        results.put(("metrics", None, registry.drain()))
+
+    asyncio.run(run())
+
+
+class WorkerPool:
+    """
+    Runs tickets through N worker processes, each with its own TicketProcessor.
+
+    With the "fork" start method models are loaded once in the parent and the
+    heap is frozen before forking, so workers share the model weights
+    copy-on-write instead of each holding a private copy. Tickets of the same
+    customer always go to the same worker, which keeps per-customer ordering
+    and in-memory history consistent; other tickets go to the least busy
+    worker. Crashed workers are replaced and their unfinished tickets retried;
+    replacements start through forkserver (or spawn) rather than being forked
+    from the pool's threads, and load their own models. Metrics the workers
+    record are merged into this process's registry.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        processor_factory: Callable[[], Any] = TicketProcessor,
+        start_method: Optional[str] = None,
+        preload: Optional[List[str]] = None,
+        max_attempts: Optional[int] = None
+    ):
+        self.workers = workers or WORKER_CONFIG["workers"] or os.cpu_count() or 1
+        self.concurrency = concurrency or WORKER_CONFIG["concurrency"]
+        self.processor_factory = processor_factory
+        self.start_method = start_method or WORKER_CONFIG["start_method"]
+        self.preload = WORKER_CONFIG["preload"] if preload is None else preload
+        self.max_attempts = max_attempts or WORKER_CONFIG["max_attempts"]
+        self.restarts = 0
+        # orders batch submissions, workers take tickets first come first served
+        self.scheduler = PriorityScheduler()
+
+        self._context = multiprocessing.get_context(self.start_method)
+        # forking a replacement from the monitor thread could copy locks other threads hold
+        self._restart_context = (
+            multiprocessing.get_context(
+                "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            )
+            if self.start_method == "fork" else self._context
+        )
+        self._processes: List[Any] = [None] * self.workers
+        self._queues: List[Any] = [None] * self.workers
+        self._results = None
+        self._tasks: Dict[int, _Task] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._closing = False
+        self._stopped = threading.Event()
+        self._monitor = None
+
+    def start(self) -> "WorkerPool":
+        if self._monitor is not None:
+            return self
+        if self.start_method == "fork":
+            self._preload()
+        # shared with replacements too, so created in their context (forked workers just inherit it)
+        self._results = self._restart_context.Queue()
+        for index in range(self.workers):
+            self._start_worker(index, self._context)
+        self._monitor = threading.Thread(target=self._monitor_loop, name="worker-pool", daemon=True)
+        self._monitor.start()
+        return self
+
+    def _preload(self):
+        """Load models before forking so every worker shares them"""
+        from src.agents.TicketAnalysisAgent.classifiers import resolve_backend
+        names = [
+            name for name in self.preload
+            if not (name == "classifier" and resolve_backend() == "onnx")
+            and not (name == "sentence_encoder" and not SIMILARITY_CONFIG["enabled"])
+        ]
+        if not names:
+            return
+        timings = warmup(names)
+        logger.info(f"Preloaded {', '.join(f'{n} ({t:.2f}s)' for n, t in timings.items())}")
+
+    def _start_worker(self, index: int, context: Any):
+        if context.get_start_method() == "fork":
+            # keep the garbage collector from touching (and so copying) inherited objects
+            gc.collect()
+            gc.freeze()
+        self._queues[index] = context.Queue()
+        process = context.Process(
+            target=_worker_main,
+            args=(
+                index,
+                self._queues[index],
+                self._results,
+                self.processor_factory,
+                self.concurrency,
+                max(1, (os.cpu_count() or 1) // self.workers)
+            ),
+            name=f"ticket-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        self._processes[index] = process
+
+    def submit(self, ticket: SupportTicket) -> Future:
+        """Queue a ticket, the future resolves to its TicketResolution"""
+        if self._monitor is None:
+            self.start()
+        future = Future()
+        with self._lock:
+            if self._closing:
+                raise RuntimeError("Worker pool is shutting down")
+            task_id = self._next_id
+            self._next_id += 1
+            worker = self._route(ticket)
+            self._tasks[task_id] = _Task(ticket, future, worker)
+            self._queues[worker].put((task_id, ticket))
+        return future
+
+    async def process_ticket(self, ticket: SupportTicket) -> TicketResolution:
+        return await asyncio.wrap_future(self.submit(ticket))
+
+    async def process_batch(self, tickets: List[SupportTicket], concurrency: Optional[int] = None) -> List[TicketResolution]:
+        """Resolutions in input order, concurrency is set per worker by the pool"""
+        futures = [None] * len(tickets)
+        # highest rule-triaged priority is queued first
+        for i in self.scheduler.order(tickets):
+            futures[i] = asyncio.wrap_future(self.submit(tickets[i]))
+        return list(await asyncio.gather(*futures))
+
+    def _route(self, ticket: SupportTicket) -> int:
+        customer_id = ticket.customer_info.get("customer_id")
+        if customer_id:
+            return zlib.crc32(str(customer_id).encode("utf-8")) % self.workers
+        load = [0] * self.workers
+        for task in self._tasks.values():
+            load[task.worker] += 1
+        return load.index(min(load))
+
+    def _monitor_loop(self):
+        """Deliver results and replace workers that died"""
+        while not self._stopped.is_set():
+            # is_alive() is a non-blocking waitpid, cheap enough to check every time
+            self._check_workers()
+            try:
+                kind, task_id, payload = self._results.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            if kind == "metrics":
+                registry.merge(payload)
+                continue
+            with self._lock:
+                task = self._tasks.pop(task_id, None)
+                if not self._tasks:
+                    self._idle.notify_all()
+            if task is None:
+                continue
+            if kind == "done":
+                # the worker recorded it, its metrics were merged above
+                resolution = payload
+            else:
+                resolution = self._failed(task.ticket, payload)
+                record_resolution(resolution)
+            task.future.set_result(resolution)
+        # the workers' final metrics, sent as they exit
+        while True:
+            try:
+                kind, _, payload = self._results.get_nowait()
+            except queue.Empty:
+                return
+            if kind == "metrics":
+                registry.merge(payload)
+
+    def _check_workers(self):
+        for index, process in enumerate(self._processes):
+            if process.is_alive() or self._stopped.is_set():
+                continue
+            with self._lock:
+                if self._closing and not any(t.worker == index for t in self._tasks.values()):
+                    continue
+                logger.error(f"Worker {index} exited with code {process.exitcode}, restarting")
+                self.restarts += 1
+                # a fresh queue so tickets still queued for the old worker aren't run twice
+                self._start_worker(index, self._restart_context)
+                failed = []
+                for task_id, task in list(self._tasks.items()):
+                    if task.worker != index:
+                        continue
+                    task.attempts += 1
+                    if task.attempts >= self.max_attempts:
+                        failed.append(self._tasks.pop(task_id))
+                    else:
+                        self._queues[index].put((task_id, task.ticket))
+                if not self._tasks:
+                    self._idle.notify_all()
+            for task in failed:
+                resolution = self._failed(task.ticket, f"Worker crashed {task.attempts} times processing the ticket")
+                record_resolution(resolution)
+                task.future.set_result(resolution)
+
+    @staticmethod
+    def _failed(ticket: SupportTicket, error: str) -> TicketResolution:
+        logger.error(f"Processing failed for {ticket.id}: {error}")
+        return TicketResolution(
+            ticket_id=ticket.id,
+            response_text="",
+            status="failed",
+            error=error,
+            analysis=None,
+            response=None,
+            context_snapshot={}
+        )
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop taking tickets, wait for in-flight ones, then stop the workers"""
+        with self._lock:
+            if self._closing:
+                return
+            self._closing = True
+            if self._monitor is None:
+                return
+            self._idle.wait_for(lambda: not self._tasks, timeout)
+            abandoned = list(self._tasks.values())
+            self._tasks.clear()
+
+        for worker_queue in self._queues:
+            worker_queue.put(None)
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._stopped.set()
+        self._monitor.join()
+        for task in abandoned:
+            task.future.set_result(self._failed(task.ticket, "Worker pool shut down before the ticket finished"))
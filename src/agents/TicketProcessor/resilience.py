@@ -0,0 +1,176 @@
+from src.config.settings import RESILIENCE_CONFIG
+from src.utils.metrics import registry
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# errors worth another attempt, a stage's own timeout is not one of them
+TRANSIENT_ERRORS: Tuple[Type[BaseException], ...] = (ConnectionError, TimeoutError)
+
+
+class StageTimeout(Exception):
+    """Raised when a pipeline stage takes longer than its timeout"""
+
+    def __init__(self, stage: str, timeout: float):
+        super().__init__(f"Stage '{stage}' timed out after {timeout}s")
+        self.stage = stage
+        self.timeout = timeout
+
+
+class StagePolicy:
+    """
+    Timeout and retries for one pipeline stage.
+
+    Each attempt gets `timeout` seconds. Transient errors are retried up to
+    `max_retries` times with exponential backoff and jitter; a timeout is
+    not retried, since another attempt at an overloaded stage only adds to
+    the pile-up.
+    """
+
+    def __init__(
+        self,
+        stage: str,
+        timeout: Optional[float] = None,
+        max_retries: int = 0,
+        backoff: float = 0.2,
+        max_backoff: float = 2.0
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries can't be negative")
+        self.stage = stage
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def from_config(cls, stage: str, max_retries: int) -> "StagePolicy":
+        return cls(
+            stage,
+            timeout=RESILIENCE_CONFIG["timeouts"].get(stage),
+            max_retries=max_retries,
+            backoff=RESILIENCE_CONFIG["backoff_seconds"],
+            max_backoff=RESILIENCE_CONFIG["max_backoff_seconds"]
+        )
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """Await call() under the policy, a fresh coroutine per attempt"""
+        attempt = 0
+        while True:
+            try:
+                return await self._attempt(call)
+            except TRANSIENT_ERRORS:
+                if attempt >= self.max_retries:
+                    raise
+            attempt += 1
+            registry.increment("ticket_stage_retries_total", stage=self.stage)
+            # full jitter keeps retrying tickets from hitting the stage in lockstep
+            await asyncio.sleep(random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1))))
+
+    async def _attempt(self, call: Callable[[], Awaitable[T]]) -> T:
+        task = asyncio.ensure_future(call())
+        # unlike wait_for, tells our timeout apart from a TimeoutError raised by the call
+        try:
+            done, _ = await asyncio.wait({task}, timeout=self.timeout)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        if not done:
+            task.cancel()
+            registry.increment("ticket_stage_timeouts_total", stage=self.stage)
+            raise StageTimeout(self.stage, self.timeout)
+        return task.result()
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures and stays open for
+    `reset_seconds`, during which callers take their fallback. Then one
+    trial call is let through: success closes the breaker, failure opens it
+    again. The failure count and state live in `system_state`
+    ("consecutive_failures", "circuit"), so the processor's system state is
+    what drives the breaker.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        system_state: Optional[Dict[str, Any]] = None
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.system_state = {} if system_state is None else system_state
+        self.system_state.setdefault("consecutive_failures", 0)
+        self.system_state["circuit"] = self.CLOSED
+        self._state = self.CLOSED
+        self._changed_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, name: str, system_state: Optional[Dict[str, Any]] = None) -> "CircuitBreaker":
+        return cls(
+            name,
+            failure_threshold=RESILIENCE_CONFIG["failure_threshold"],
+            reset_seconds=RESILIENCE_CONFIG["reset_seconds"],
+            system_state=system_state
+        )
+
+    @property
+    def consecutive_failures(self) -> int:
+        return self.system_state["consecutive_failures"]
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may go through now, False means take the fallback"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+            # also re-admits a trial whose caller never reported back
+            if time.monotonic() - self._changed_at >= self.reset_seconds:
+                self._set(self.HALF_OPEN)
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.system_state["consecutive_failures"] = 0
+            if self._state != self.CLOSED:
+                self._set(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.system_state["consecutive_failures"] += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._set(self.OPEN)
+
+    def _set(self, state: str):
+        # called with the lock held
+        if state != self._state:
+            logger.warning(f"Circuit '{self.name}' {self._state} -> {state} after {self.consecutive_failures} consecutive failures")
+            registry.increment("ticket_circuit_transitions_total", circuit=self.name, state=state)
+        self._state = state
+        self.system_state["circuit"] = state
+        self._changed_at = time.monotonic()
@@ -0,0 +1,198 @@
+from src.models import SupportTicket, TicketResolution
+from src.config.settings import INGEST_CONFIG, WORKER_CONFIG
+from src.utils.metrics import registry
+from src.utils.resolution_store import InMemoryResolutionStore, ResolutionStore
+
+from .TicketProcessor import TicketProcessor
+from .pool import WorkerPool
+from .scheduler import PriorityScheduler
+
+import asyncio
+import concurrent.futures
+import logging
+import math
+import threading
+import time
+from dataclasses import asdict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """Raised when accepting more tickets would exceed the runner's max_pending"""
+
+    def __init__(self, pending: int, retry_after: int):
+        super().__init__(f"{pending} tickets pending, retry in {retry_after}s")
+        self.pending = pending
+        self.retry_after = retry_after
+
+
+class TicketRunner:
+    """
+    Long-lived TicketProcessor running on a background event loop. Given a
+    WorkerPool, tickets are dispatched to its worker processes instead.
+
+    At most `max_pending` tickets are accepted but unresolved at a time, of
+    which `concurrency` are processed at once, picked by the PriorityScheduler;
+    submissions beyond that raise QueueFull so callers can back off.
+    """
+
+    def __init__(
+        self,
+        processor: Optional[TicketProcessor] = None,
+        pool: Optional[WorkerPool] = None,
+        store: Optional[ResolutionStore] = None,
+        max_pending: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        scheduler: Optional[PriorityScheduler] = None
+    ):
+        self.pool = pool
+        # the pool has the same process_ticket coroutine
+        self.processor = processor or pool or TicketProcessor()
+        if isinstance(self.processor, TicketProcessor):
+            # models load before the first ticket, not inside its stage timeouts
+            self.processor.warmup()
+        self.store = store or InMemoryResolutionStore()
+        self.max_pending = max_pending or INGEST_CONFIG["max_pending"]
+        self.concurrency = (
+            concurrency
+            or INGEST_CONFIG["concurrency"]
+            or (pool.workers * pool.concurrency if pool else WORKER_CONFIG["concurrency"])
+        )
+        self.loop = asyncio.new_event_loop()
+        self.scheduler = scheduler or PriorityScheduler(self.concurrency)
+        # ticket_id -> future of its resolution dict, while unresolved
+        self._futures: Dict[str, concurrent.futures.Future] = {}
+        self._service_time: Optional[float] = None
+        self._on_shutdown: List[Callable[[], Awaitable[Any]]] = []
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run_loop,
+            name="ticket-runner",
+            daemon=True
+        )
+        self._thread.start()
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+
+    @property
+    def pending(self) -> int:
+        """Tickets accepted but not resolved yet"""
+        with self._lock:
+            return len(self._futures)
+
+    def submit(self, ticket: SupportTicket) -> str:
+        """Queue a ticket for processing and return its id immediately"""
+        self.enqueue([ticket])
+        return ticket.id
+
+    def enqueue(self, tickets: List[SupportTicket]) -> List[concurrent.futures.Future]:
+        """
+        Queue tickets for processing, all or none of them. The futures resolve
+        to resolution dicts. Raises QueueFull when there is no room for all of
+        them and ValueError for ids that are already pending.
+        """
+        ids = [ticket.id for ticket in tickets]
+        if len(set(ids)) != len(ids):
+            raise ValueError("Duplicate ticket ids in one submission")
+        with self._lock:
+            pending = len(self._futures)
+            if pending + len(tickets) > self.max_pending:
+                registry.increment("ticket_ingest_rejected_total", len(tickets))
+                raise QueueFull(pending, self._retry_after(pending))
+            busy = [ticket_id for ticket_id in ids if ticket_id in self._futures]
+            if busy:
+                raise ValueError(f"Tickets already pending: {', '.join(busy)}")
+
+            futures = []
+            for ticket in tickets:
+                self.store.add(asdict(ticket), asdict(self._pending_resolution(ticket)))
+                future = asyncio.run_coroutine_threadsafe(self._process(ticket), self.loop)
+                self._futures[ticket.id] = future
+                futures.append(future)
+        return futures
+
+    @staticmethod
+    def _pending_resolution(ticket: SupportTicket) -> TicketResolution:
+        return TicketResolution(
+            ticket_id=ticket.id,
+            response_text="",
+            status="pending",
+            error=None,
+            analysis=None,
+            response=None,
+            context_snapshot={}
+        )
+
+    def _retry_after(self, pending: int) -> int:
+        """Seconds until the backlog has drained enough to take new tickets"""
+        if self._service_time is None:
+            return 1
+        return max(1, min(60, math.ceil(pending * self._service_time / self.concurrency)))
+
+    async def _process(self, ticket: SupportTicket) -> Dict[str, Any]:
+        async with self.scheduler.slot(ticket):
+            began = time.perf_counter()
+            try:
+                resolution = asdict(await self.processor.process_ticket(ticket))
+            except Exception as e:
+                # process_ticket reports its own failures, this guards the runner itself
+                logger.error(f"Runner failed for {ticket.id}: {str(e)}")
+                resolution = dict(self.store.get(ticket.id), status="failed", error=str(e))
+            elapsed = time.perf_counter() - began
+
+        self.store.update(resolution)
+        with self._lock:
+            # moving average of the time a ticket holds a slot, for Retry-After
+            if self._service_time is None:
+                self._service_time = elapsed
+            else:
+                self._service_time += 0.2 * (elapsed - self._service_time)
+            self._futures.pop(ticket.id, None)
+        return resolution
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """Current resolution dict for a ticket, None if unknown"""
+        return self.store.get(ticket_id)
+
+    def ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """The ticket as submitted, None if unknown"""
+        return self.store.ticket(ticket_id)
+
+    def results(self) -> List[Dict[str, Any]]:
+        """All tickets in submission order"""
+        return self.store.results()
+
+    def on_shutdown(self, callback: Callable[[], Awaitable[Any]]):
+        """Coroutine function run on the loop before it stops, e.g. to close a server"""
+        self._on_shutdown.append(callback)
+
+    def shutdown(self, timeout: Optional[float] = None):
+        """Stop the background loop once queued tickets are done"""
+        if self.loop.is_closed() or not self._thread.is_alive():
+            return
+
+        async def close():
+            for callback in self._on_shutdown:
+                try:
+                    await callback()
+                except Exception as e:
+                    logger.error(f"Shutdown callback failed: {str(e)}")
+
+        with self._lock:
+            futures = list(self._futures.values())
+        try:
+            concurrent.futures.wait(futures, timeout)
+            asyncio.run_coroutine_threadsafe(close(), self.loop).result(timeout)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout)
+            if self.pool is not None:
+                self.pool.shutdown(timeout)
+            self.store.close()
@@ -0,0 +1,4 @@
+from .TicketAnalysisAgent import TicketAnalysisAgent
+from .ResponseAgent import ResponseAgent
+from .TicketProcessor import TicketProcessor
+from src.utils.model_registry import warmup
\ No newline at end of file
@@ -0,0 +1,36 @@
+# Terms are matched case-insensitively on word boundaries ("cto" never matches
+# inside "director"), multi-word terms match across any whitespace and a
+# trailing * also matches longer words ("crash*" -> crashes, crashed).
+# Set TICKET_RULES_PATH to a JSON file with the same structure to change the
+# rules without a code change.
+TICKET_RULES = {
+    "urgency": {
+        # each distinct term found adds `weight` to the base priority score of 1
+        "weight": 0.5,
+        "terms": [
+            "asap", "urgent*", "immediately", "critical", "emergency", "emmergency",
+            "right away", "severe", "403"
+        ]
+    },
+    # the highest matching role and impact weights multiply the score
+    "roles": {
+        "ceo": 2.0, "cfo": 2.0, "cto": 2.0,
+        "director": 1.7, "manager": 1.3
+    },
+    "impact": {
+        "payroll": 2.0,
+        "revenue": 1.8,
+        "sales": 1.5,
+        "demo": 1.5,
+        "client*": 1.3
+    },
+    # keyword fallback when the classifier is unsure, the category with most
+    # matches wins and ties go to the category listed first
+    "categories": {
+        "technical": ["error*", "bug*", "crash*", "slow*"],
+        "billing": ["invoice*", "charge*", "payment*", "fee", "fees"],
+        "feature": ["request*", "suggest*", "add", "new feature*"],
+        "access": ["login*", "log in", "access*", "password*", "permission*"]
+    },
+    "default_category": "technical"
+}
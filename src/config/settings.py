@@ -0,0 +1,218 @@
+import os
+
+BATCHING_CONFIG = {
+    # largest number of tickets classified in a single forward pass
+    "max_batch_size": 16,
+    # how long to wait for more tickets before running a partial batch
+    "max_wait_ms": 5.0
+}
+
+# dataset ticket types -> TicketCategory values
+TICKET_TYPE_LABELS = {
+    "Technical issue": "technical",
+    "Billing inquiry": "billing",
+    "Refund request": "billing",
+    "Product inquiry": "feature",
+    "Cancellation request": "access"
+}
+
+CLASSIFIER_CONFIG = {
+    # "zero_shot", "distilbert", "onnx", "tfidf", "rules" or "cascade"
+    "backend": os.getenv("TICKET_CLASSIFIER_BACKEND", "zero_shot"),
+    # used when the selected backend's model file or runtime is missing
+    "fallback": "zero_shot",
+    # below this top score the keyword rules decide the category
+    "confidence_threshold": 0.7,
+    "zero_shot": {
+        "model": "facebook/bart-large-mnli",
+        "batch_size": BATCHING_CONFIG["max_batch_size"]
+    },
+    "distilbert": {
+        # output of notebook/finetune_distilbert_category.ipynb
+        "model_path": os.getenv("TICKET_CLASSIFIER_PATH", "notebook/ticket_classifier"),
+        "max_length": 512,
+        "batch_size": BATCHING_CONFIG["max_batch_size"],
+        "label_map": TICKET_TYPE_LABELS,
+        # dynamic int8 quantization of the linear layers
+        "quantize": os.getenv("TICKET_CLASSIFIER_QUANTIZE", "0") == "1",
+        # intra-op threads, None keeps the library default (all cores)
+        "num_threads": int(os.getenv("TICKET_CLASSIFIER_THREADS", "0")) or None
+    },
+    "tfidf": {
+        # output of `python main.py train`
+        "model_path": os.getenv("TICKET_TFIDF_PATH", "notebook/tfidf_classifier.joblib")
+    },
+    "cascade": {
+        # cheapest first, each tier answers the tickets it is confident about and
+        # escalates the rest; unavailable tiers are skipped, the last answers all.
+        # rules is left out: on the archive's held-out split its answers are mostly
+        # wrong, add it back once `main.py train` reports its answered accuracy above
+        # its threshold
+        "tiers": os.getenv("TICKET_CASCADE_TIERS", "tfidf,zero_shot").split(","),
+        # held-out accuracy (or raw top score when uncalibrated) a tier needs to
+        # answer, keep them above confidence_threshold
+        "thresholds": {
+            "rules": float(os.getenv("TICKET_RULES_THRESHOLD", "0.75")),
+            "tfidf": float(os.getenv("TICKET_TFIDF_THRESHOLD", "0.8"))
+        },
+        # per-tier score -> held-out accuracy maps written by `python main.py train`
+        "calibration_path": os.getenv("TICKET_CASCADE_CALIBRATION", "notebook/cascade_calibration.json")
+    },
+    "onnx": {
+        # output of `python main.py export-classifier`
+        "model_path": os.getenv("TICKET_ONNX_PATH", "notebook/ticket_classifier_onnx"),
+        # use model.int8.onnx rather than the fp32 model.onnx
+        "quantized": True,
+        "max_length": 512,
+        "batch_size": BATCHING_CONFIG["max_batch_size"],
+        "label_map": TICKET_TYPE_LABELS,
+        "num_threads": int(os.getenv("TICKET_CLASSIFIER_THREADS", "0")) or None
+    }
+}
+
+NLP_CONFIG = {
+    "model": "en_core_web_sm",
+    # only NER is used, skip loading everything else. The NER of the v3
+    # pipelines embeds tokens itself rather than listening to tok2vec,
+    # so the shared tok2vec pass would only feed the excluded components
+    "exclude": ["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "senter"],
+    # tickets per nlp.pipe call when processing batches
+    "pipe_batch_size": 32
+}
+
+PREPROCESS_CONFIG = {
+    # drop quoted replies, forwarded history and signatures from ticket content
+    "strip_quoted": True,
+    # trailing lines searched for a sign-off that starts the signature
+    "signature_max_lines": 8,
+    # words analysed per ticket, subject first and then the newest content
+    "max_tokens": int(os.getenv("TICKET_MAX_TOKENS", "1024")),
+    "subject_max_tokens": 64,
+    # words per classifier input, stays under the 512-token model limit
+    "chunk_tokens": 256
+}
+
+KEYPHRASE_CONFIG = {
+    # "yake", or "statistical" (RAKE-style word co-occurrence, much cheaper on long threads)
+    "extractor": os.getenv("TICKET_KEYPHRASE_EXTRACTOR", "yake"),
+    # key points kept per ticket
+    "top_k": 10,
+    # longest candidate phrase, in words
+    "max_ngram": 3,
+    # results kept per process, keyed by a hash of the cleaned text
+    "cache_size": 10_000
+}
+
+HISTORY_CONFIG = {
+    # "memory" (per process) or "sqlite" (shared between worker processes)
+    "backend": os.getenv("TICKET_HISTORY_BACKEND", "memory"),
+    "path": os.getenv("TICKET_HISTORY_PATH", "data/customer_history.db"),
+    # tickets kept per customer
+    "max_entries": 50,
+    # customers kept by the in-memory store, least recently active evicted first
+    "max_customers": 10_000,
+    # entries older than this are dropped, None keeps them until evicted
+    "ttl_seconds": 30 * 24 * 3600
+}
+
+RESOLUTION_STORE_CONFIG = {
+    # "sqlite" (kept across restarts, shared by app workers) or "memory"
+    "backend": os.getenv("TICKET_RESOLUTION_BACKEND", "sqlite"),
+    "path": os.getenv("TICKET_RESOLUTION_PATH", "data/resolutions.db"),
+    # buffered writes committed in one transaction
+    "batch_size": 200,
+    # longest a write waits for its batch, in seconds
+    "flush_interval": 0.05,
+    # tickets per page of the UI listing
+    "page_size": 50
+}
+
+ANALYSIS_CACHE_CONFIG = {
+    "enabled": True,
+    # results kept in memory per process
+    "max_entries": 10_000,
+    # optional SQLite file shared by workers and kept across restarts
+    "path": os.getenv("TICKET_ANALYSIS_CACHE_PATH"),
+    "max_disk_entries": 100_000,
+    # bump to invalidate cached results after rule or keyword extraction changes
+    "version": "1"
+}
+
+SIMILARITY_CONFIG = {
+    # embedding index over processed tickets for duplicate reuse and relevant
+    # history, needs sentence-transformers
+    "enabled": os.getenv("TICKET_SIMILARITY_INDEX", "0") == "1",
+    "model": os.getenv("TICKET_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+    "batch_size": 32,
+    # tickets kept per process, the oldest are overwritten first
+    "capacity": 50_000,
+    # where the memory-mapped float16 vectors live, None uses the system temp dir
+    "directory": os.getenv("TICKET_SIMILARITY_DIR"),
+    # cosine similarity from which a ticket reuses an earlier ticket's analysis
+    "duplicate_threshold": 0.95,
+    # only tickets processed this recently are reused, e.g. during one incident
+    "duplicate_window_seconds": 3600,
+    # history entries passed to the response agent, most similar first
+    "history_k": 3
+}
+
+SNAPSHOT_CONFIG = {
+    # directory written by `python main.py snapshot`, models found in it are
+    # loaded from there instead of their source
+    "path": os.getenv("TICKET_SNAPSHOT_DIR"),
+    # no Hugging Face Hub requests once a snapshot is in use
+    "offline": os.getenv("TICKET_SNAPSHOT_OFFLINE", "1") == "1"
+}
+
+WORKER_CONFIG = {
+    # worker processes, 0 processes tickets in the calling process
+    "workers": int(os.getenv("TICKET_WORKERS", "0")),
+    # tickets each worker has in flight at once
+    "concurrency": 4,
+    # "fork" loads models once before forking so workers share their memory,
+    # "spawn" / "forkserver" load them in every worker
+    "start_method": os.getenv("TICKET_WORKER_START_METHOD", "fork"),
+    # models loaded before forking (onnxruntime sessions are not fork-safe
+    # and are always loaded per worker)
+    "preload": ["spacy_nlp", "keyword_extractor", "classifier", "sentence_encoder"],
+    # a ticket that takes down this many workers is failed instead of retried
+    "max_attempts": 2
+}
+
+RESILIENCE_CONFIG = {
+    # seconds per attempt of each pipeline stage, None waits indefinitely
+    "timeouts": {
+        "ner": float(os.getenv("TICKET_NER_TIMEOUT", "5")),
+        "analysis": float(os.getenv("TICKET_ANALYSIS_TIMEOUT", "10")),
+        "response": float(os.getenv("TICKET_RESPONSE_TIMEOUT", "5"))
+    },
+    # first retry of a transient error waits up to this long, doubling per retry
+    "backoff_seconds": 0.2,
+    "max_backoff_seconds": 2.0,
+    # consecutive analysis failures or timeouts that open the circuit breaker,
+    # sending tickets down the rules and template fast path
+    "failure_threshold": int(os.getenv("TICKET_BREAKER_THRESHOLD", "5")),
+    # how long the breaker stays open before one ticket tries the classifier again
+    "reset_seconds": float(os.getenv("TICKET_BREAKER_RESET_SECONDS", "30"))
+}
+
+SCHEDULER_CONFIG = {
+    # waiting this long counts as one priority level, so old tickets can't starve
+    "aging_seconds": float(os.getenv("TICKET_AGING_SECONDS", "30")),
+    # rule priority multiplier per customer plan
+    "plan_weights": {
+        "enterprise": 1.5
+    }
+}
+
+INGEST_CONFIG = {
+    # tickets accepted but not yet resolved, further submissions get 429
+    "max_pending": int(os.getenv("TICKET_MAX_PENDING", "1000")),
+    # tickets processed at once by the runner, 0 sizes it from WORKER_CONFIG
+    "concurrency": int(os.getenv("TICKET_RUNNER_CONCURRENCY", "0")),
+    # JSON API served next to the Flask UI, disabled when no port is set
+    "api_host": os.getenv("TICKET_API_HOST", "127.0.0.1"),
+    "api_port": int(os.getenv("TICKET_API_PORT", "0")),
+    # largest accepted request body
+    "max_body_bytes": 10 * 1024 * 1024
+}
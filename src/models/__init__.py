@@ -1 +1 @@
-from .ticket_models import TicketCategory, Priority, TicketAnalysis, TicketResolution, ResponseSuggestion, SupportTicket
\ No newline at end of file
+from .ticket_models import TicketCategory, Priority, TicketAnalysis, TicketResolution, ResponseSuggestion, SupportTicket, TicketContext, RuleMatches, ResponseScore, TruncationStats
@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 class TicketCategory(Enum):
     TECHNICAL = "technical"
@@ -28,6 +28,9 @@ class TicketAnalysis:
     key_points : List[str]
     required_expertise : List[str]
     suggested_response_type : str
+    classifier_scores : Dict[str, float] = field(default_factory=dict)
+    matched_terms : Dict[str, List[str]] = field(default_factory=dict)  # rule terms behind priority and fallback category
+    truncation : Optional["TruncationStats"] = None  # what preprocessing removed to fit the token budget
 
 @dataclass
 class ResponseSuggestion:
@@ -36,6 +39,13 @@ class ResponseSuggestion:
     requires_approval : bool
     suggested_actions : List[str]
 
+@dataclass
+class ResponseScore:
+    """Text statistics behind a response's confidence"""
+    readability: float  # Flesch reading ease, as textstat computes it
+    polarity: float  # TextBlob (pattern) sentiment polarity
+    incremental: bool = False  # scored from the template's precomputed statistics
+
 @dataclass
 class TicketResolution:
     ticket_id: str
@@ -44,4 +54,40 @@ class TicketResolution:
     error: Optional[str]
     analysis: Optional[Any]
     response: Optional[Any]
-    context_snapshot: Dict[str, Any]
\ No newline at end of file
+    context_snapshot: Dict[str, Any]
+    processing_time: Optional[float] = None  # seconds from pickup to completion
+    timings: Dict[str, float] = field(default_factory=dict)  # seconds per pipeline stage
+    duplicate_of: Optional[str] = None  # earlier ticket whose analysis was reused
+    degraded: bool = False  # resolved on the rules-only, template-only fast path
+
+@dataclass
+class RuleMatches:
+    """Rule terms found in one ticket and the scores derived from them"""
+    urgency: List[str]  # distinct urgency terms, sorted
+    roles: Dict[str, float]  # matched role term -> weight
+    impact: Dict[str, float]  # matched impact term -> weight
+    categories: Dict[str, List[str]]  # category value -> matched terms
+    priority: Priority
+    category: TicketCategory  # keyword category, used when the classifier is unsure
+
+@dataclass
+class TruncationStats:
+    """How much of a ticket was analysed, tokens are whitespace-separated words"""
+    original_tokens: int
+    kept_tokens: int
+    quoted_lines_removed: int = 0  # quoted replies and forwarded history
+    signature_lines_removed: int = 0
+    chunks: int = 1  # classifier inputs the kept text was split into
+    truncated: bool = False  # content was cut to the token budget
+
+@dataclass
+class TicketContext:
+    """Ticket text parsed once and shared by both agents"""
+    ticket_id: str
+    analysis_text: str  # role, subject and content markup for the analysis agent
+    person_names: List[str]
+    doc: Optional[Any] = None  # spaCy Doc of the content (NER only)
+    clean_text: Optional[str] = None  # filled in by the analysis agent
+    content: Optional[str] = None  # content without quoted replies and signature, within the token budget
+    truncation: Optional[TruncationStats] = None
+    embedding: Optional[Any] = None  # sentence embedding, when the similarity index is enabled
\ No newline at end of file
@@ -0,0 +1,148 @@
+from src.config.settings import ANALYSIS_CACHE_CONFIG
+from src.utils.metrics import registry
+
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of model-derived analysis results.
+
+    Keys hash the preprocessed ticket text together with the model version,
+    so resubmitted or duplicate tickets skip classification and keyword
+    extraction, and swapping models never serves stale results. Entries live
+    in a bounded LRU and, when a path is given, in a bounded SQLite file that
+    survives restarts and can be shared by worker processes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        path: Optional[str] = None,
+        max_disk_entries: int = 100_000
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._disk_writes = 0
+
+        self._conn = None
+        if path:
+            if os.path.dirname(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS analysis_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    accessed REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_analysis_cache_accessed
+                    ON analysis_cache (accessed);
+            """)
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(clean_text: str, model_version: str) -> str:
+        return hashlib.sha256(f"{model_version}\0{clean_text}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                registry.increment("ticket_analysis_cache_hits_total", layer="memory")
+                return value
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT value FROM analysis_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE analysis_cache SET accessed = ? WHERE key = ?", (time.time(), key)
+                        )
+                    self._remember(key, value)
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                    registry.increment("ticket_analysis_cache_hits_total", layer="disk")
+                    return value
+
+            self._stats["misses"] += 1
+            registry.increment("ticket_analysis_cache_misses_total")
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._remember(key, value)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO analysis_cache (key, value, accessed) VALUES (?, ?, ?)",
+                        (key, json.dumps(value), time.time())
+                    )
+                self._disk_writes += 1
+                # trimming scans the index, so only do it every so often
+                if self._disk_writes % 1000 == 0:
+                    self._trim_disk()
+
+    def _trim_disk(self):
+        """Drop the least recently used rows beyond max_disk_entries"""
+        with self._conn:
+            self._conn.execute(
+                """
+                DELETE FROM analysis_cache WHERE key IN (
+                    SELECT key FROM analysis_cache ORDER BY accessed DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_disk_entries,)
+            )
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+            registry.increment("ticket_analysis_cache_evictions_total")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters, current size and hit rate"""
+        with self._lock:
+            stats = dict(self._stats, size=len(self._memory))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def close(self):
+        if self._conn is not None:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+
+def create_analysis_cache() -> Optional[AnalysisCache]:
+    """Cache configured in ANALYSIS_CACHE_CONFIG, None when disabled"""
+    if not ANALYSIS_CACHE_CONFIG["enabled"]:
+        return None
+    return AnalysisCache(
+        max_entries=ANALYSIS_CACHE_CONFIG["max_entries"],
+        path=ANALYSIS_CACHE_CONFIG["path"],
+        max_disk_entries=ANALYSIS_CACHE_CONFIG["max_disk_entries"]
+    )
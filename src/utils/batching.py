@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class MicroBatcher:
+    """Collect concurrent requests for a short window and run them as one batch"""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0,
+        executor: Optional[Executor] = None
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._executor = executor
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def executor(self) -> Executor:
+        # a single worker keeps batches serialized so they don't fight over CPU cores
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="microbatch")
+        return self._executor
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result from the next batch"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # pending work from a previous (closed) loop can never complete
+            self._loop = loop
+            self._pending = []
+            self._timer = None
+
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    def _flush(self):
+        """Hand the pending items over to a batch run"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self._loop.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Run the batch function off the event loop and resolve the futures"""
+        # callers that timed out or went away while the batch filled up
+        batch = [(item, future) for item, future in batch if not future.cancelled()]
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        try:
+            results = await self._loop.run_in_executor(self.executor, self.batch_fn, items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
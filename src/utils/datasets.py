@@ -0,0 +1,43 @@
+from src.models import SupportTicket
+
+import csv
+import io
+import os
+import zipfile
+from itertools import islice
+from typing import Any, Dict, Iterator, Optional
+
+ARCHIVE_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "tests", "data", "raw", "archive.zip"
+)
+
+
+def iter_archive_rows(path: str = ARCHIVE_PATH, limit: Optional[int] = None) -> Iterator[Dict[str, str]]:
+    """Rows of the customer support tickets CSV, read straight out of the zip"""
+    with zipfile.ZipFile(path) as archive:
+        name = next(n for n in archive.namelist() if n.endswith(".csv"))
+        with archive.open(name) as raw:
+            reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+            yield from islice(reader, limit)
+
+
+def ticket_from_row(row: Dict[str, Any]) -> SupportTicket:
+    """SupportTicket for an archive row, with the product placeholder filled in"""
+    product = row.get("Product Purchased", "")
+    return SupportTicket(
+        id=f"ARC-{row['Ticket ID']}",
+        subject=row["Ticket Subject"],
+        content=row["Ticket Description"].replace("{product_purchased}", product),
+        customer_info={
+            "customer_id": row.get("Customer Email", ""),
+            "customer_name": row.get("Customer Name", ""),
+            "product": product,
+            "channel": row.get("Ticket Channel", "")
+        }
+    )
+
+
+def iter_archive_tickets(path: str = ARCHIVE_PATH, limit: Optional[int] = None) -> Iterator[SupportTicket]:
+    """Stream archive rows as SupportTickets without extracting the archive"""
+    for row in iter_archive_rows(path, limit):
+        yield ticket_from_row(row)
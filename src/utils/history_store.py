@@ -0,0 +1,201 @@
+from src.config.settings import HISTORY_CONFIG
+
+from collections import OrderedDict, deque
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+
+class CustomerHistoryStore:
+    """
+    Recent tickets per customer, oldest first, capped at max_entries each.
+
+    Entries are {"timestamp", "ticket_id", "subject"} dicts and are never
+    mutated once stored, so snapshots can share them instead of copying.
+    """
+
+    def __init__(self, max_entries: int = 50, ttl_seconds: Optional[float] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+
+    def append(self, customer_id: Any, entry: Dict[str, Any]):
+        raise NotImplementedError
+
+    def get(self, customer_id: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Most recent `limit` entries (all kept entries by default), oldest first"""
+        raise NotImplementedError
+
+    @property
+    def version(self) -> int:
+        """Increases with every append, identifies the state a snapshot was taken at"""
+        raise NotImplementedError
+
+    def snapshot(self, customer_id: Any) -> Tuple[Dict[str, Any], ...]:
+        """Immutable view of a customer's history that shares the stored entries"""
+        return tuple(self.get(customer_id))
+
+    def close(self):
+        pass
+
+    def _cutoff(self) -> Optional[float]:
+        return time.time() - self.ttl_seconds if self.ttl_seconds else None
+
+
+class InMemoryHistoryStore(CustomerHistoryStore):
+    """Per-process store, least recently active customers are evicted first"""
+
+    def __init__(
+        self,
+        max_entries: int = 50,
+        max_customers: int = 10_000,
+        ttl_seconds: Optional[float] = None
+    ):
+        super().__init__(max_entries, ttl_seconds)
+        self.max_customers = max_customers
+        self._history: "OrderedDict[str, Deque[Dict[str, Any]]]" = OrderedDict()
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def append(self, customer_id: Any, entry: Dict[str, Any]):
+        customer_id = str(customer_id)
+        with self._lock:
+            entries = self._history.get(customer_id)
+            if entries is None:
+                entries = self._history[customer_id] = deque(maxlen=self.max_entries)
+            self._history.move_to_end(customer_id)
+            entries.append(entry)
+            self._version += 1
+
+            while len(self._history) > self.max_customers:
+                self._history.popitem(last=False)
+
+    def get(self, customer_id: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        customer_id = str(customer_id)
+        with self._lock:
+            entries = self._history.get(customer_id)
+            if not entries:
+                return []
+
+            cutoff = self._cutoff()
+            if cutoff is not None:
+                # entries are in time order, expired ones are at the front
+                while entries and entries[0]["timestamp"] < cutoff:
+                    entries.popleft()
+                if not entries:
+                    del self._history[customer_id]
+                    return []
+
+            result = list(entries)
+        return result[-limit:] if limit else result
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+
+class SQLiteHistoryStore(CustomerHistoryStore):
+    """
+    SQLite-backed store that several worker processes can share.
+
+    Each process opens its own connection in WAL mode so readers don't block
+    the writer; rows are indexed on (customer_id, timestamp).
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = 50,
+        ttl_seconds: Optional[float] = None
+    ):
+        super().__init__(max_entries, ttl_seconds)
+        self.path = path
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS customer_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                customer_id TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                ticket_id TEXT,
+                subject TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_history_customer_time
+                ON customer_history (customer_id, timestamp);
+            CREATE INDEX IF NOT EXISTS idx_history_time
+                ON customer_history (timestamp);
+        """)
+        self._conn.commit()
+
+    def append(self, customer_id: Any, entry: Dict[str, Any]):
+        customer_id = str(customer_id)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO customer_history (customer_id, timestamp, ticket_id, subject) VALUES (?, ?, ?, ?)",
+                (customer_id, entry["timestamp"], entry.get("ticket_id"), entry.get("subject"))
+            )
+            # keep only the newest max_entries rows for this customer
+            self._conn.execute(
+                """
+                DELETE FROM customer_history
+                WHERE customer_id = ? AND id NOT IN (
+                    SELECT id FROM customer_history WHERE customer_id = ?
+                    ORDER BY timestamp DESC, id DESC LIMIT ?
+                )
+                """,
+                (customer_id, customer_id, self.max_entries)
+            )
+            cutoff = self._cutoff()
+            if cutoff is not None:
+                self._conn.execute("DELETE FROM customer_history WHERE timestamp < ?", (cutoff,))
+
+    def get(self, customer_id: Any, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        cutoff = self._cutoff()
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT timestamp, ticket_id, subject FROM customer_history
+                WHERE customer_id = ? AND timestamp >= ?
+                ORDER BY timestamp DESC, id DESC LIMIT ?
+                """,
+                (str(customer_id), cutoff if cutoff is not None else float("-inf"), limit or self.max_entries)
+            ).fetchall()
+        return [
+            {"timestamp": timestamp, "ticket_id": ticket_id, "subject": subject}
+            for timestamp, ticket_id, subject in reversed(rows)
+        ]
+
+    @property
+    def version(self) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT MAX(id) FROM customer_history").fetchone()
+        return row[0] or 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def create_history_store() -> CustomerHistoryStore:
+    """Build the store selected in HISTORY_CONFIG"""
+    backend = HISTORY_CONFIG["backend"]
+    if backend == "memory":
+        return InMemoryHistoryStore(
+            max_entries=HISTORY_CONFIG["max_entries"],
+            max_customers=HISTORY_CONFIG["max_customers"],
+            ttl_seconds=HISTORY_CONFIG["ttl_seconds"]
+        )
+    if backend == "sqlite":
+        return SQLiteHistoryStore(
+            HISTORY_CONFIG["path"],
+            max_entries=HISTORY_CONFIG["max_entries"],
+            ttl_seconds=HISTORY_CONFIG["ttl_seconds"]
+        )
+    raise ValueError(f"Unknown history backend '{backend}', expected 'memory' or 'sqlite'")
@@ -0,0 +1,244 @@
+from collections import deque
+from contextlib import contextmanager
+import contextvars
+import math
+import threading
+import time
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100) of unsorted values, 0.0 when empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+# stage timings of the ticket being processed, asyncio tasks and
+# asyncio.to_thread copy the context so spans land on the right ticket
+_current_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "ticket_timings", default=None
+)
+
+
+@contextmanager
+def collect_timings(timings: Dict[str, float]) -> Iterator[Dict[str, float]]:
+    """Record every span opened inside the block into `timings`"""
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time a pipeline stage, repeated spans of the same stage add up"""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+def record_timing(stage: str, seconds: float):
+    """Add an already measured duration to the current ticket's timings"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """
+    Process-wide latency summaries and counters.
+
+    Summaries keep the most recent `window` observations per series and
+    report p50/p95/p99 over them, plus a running sum and count. Everything is
+    rendered in the Prometheus text exposition format.
+
+    A worker process calls track_deltas() once, then ships drain() results
+    to the parent, which merge()s them into its own registry.
+    """
+
+    QUANTILES = (50, 95, 99)
+
+    def __init__(self, window: int = 10_000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[Tuple[str, LabelKey], Deque[float]] = {}
+        self._sums: Dict[Tuple[str, LabelKey], Tuple[float, int]] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._help: Dict[str, Tuple[str, str]] = {}
+        # counter values at the last drain and observations since, None until track_deltas()
+        self._drained: Optional[Dict[Tuple[str, LabelKey], float]] = None
+        self._undrained: Dict[Tuple[str, LabelKey], List[float]] = {}
+
+    def describe(self, name: str, kind: str, text: str):
+        """Register the TYPE and HELP lines of a metric"""
+        self._help[name] = (kind, text)
+
+    def observe(self, name: str, value: float, **labels: str):
+        key = (name, self._label_key(labels))
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(value)
+            total, count = self._sums.get(key, (0.0, 0))
+            self._sums[key] = (total + value, count + 1)
+            if self._drained is not None:
+                self._undrained.setdefault(key, []).append(value)
+
+    def increment(self, name: str, amount: float = 1, **labels: str):
+        key = (name, self._label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def counter(self, name: str, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get((name, self._label_key(labels)), 0)
+
+    def quantiles(self, name: str, **labels: str) -> Dict[str, float]:
+        """{"p50": ..., "p95": ..., "p99": ...} over the current window"""
+        with self._lock:
+            samples = list(self._samples.get((name, self._label_key(labels)), ()))
+        return {f"p{q}": percentile(samples, q) for q in self.QUANTILES}
+
+    def track_deltas(self):
+        """Start recording what drain() returns, from the current values on"""
+        with self._lock:
+            # a forked worker inherits the parent's values, those are not its own
+            self._drained = dict(self._counters)
+            self._undrained = {}
+
+    def drain(self) -> Dict[str, Any]:
+        """Counter increments and observations since the previous drain (or track_deltas)"""
+        with self._lock:
+            if self._drained is None:
+                raise RuntimeError("track_deltas() must be called before drain()")
+            counters = {
+                key: value - self._drained.get(key, 0)
+                for key, value in self._counters.items()
+                if value != self._drained.get(key, 0)
+            }
+            observations = self._undrained
+            self._drained = dict(self._counters)
+            self._undrained = {}
+        return {"counters": counters, "observations": observations}
+
+    def merge(self, delta: Dict[str, Any]):
+        """Add a drain() result from another process"""
+        with self._lock:
+            for key, amount in delta["counters"].items():
+                self._counters[key] = self._counters.get(key, 0) + amount
+            for key, values in delta["observations"].items():
+                samples = self._samples.get(key)
+                if samples is None:
+                    samples = self._samples[key] = deque(maxlen=self.window)
+                samples.extend(values)
+                total, count = self._sums.get(key, (0.0, 0))
+                self._sums[key] = (total + sum(values), count + len(values))
+                if self._drained is not None:
+                    self._undrained.setdefault(key, []).extend(values)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._sums.clear()
+            self._counters.clear()
+
+    def render_prometheus(self) -> str:
+        """All series in the Prometheus text format (version 0.0.4)"""
+        with self._lock:
+            samples = {key: sorted(values) for key, values in self._samples.items()}
+            sums = dict(self._sums)
+            counters = dict(self._counters)
+
+        lines = []
+        for name in sorted({name for name, _ in samples}):
+            self._header(lines, name, "summary")
+            for (series, labels), ordered in sorted(samples.items()):
+                if series != name:
+                    continue
+                for q in self.QUANTILES:
+                    quantile_labels = labels + (("quantile", str(q / 100)),)
+                    lines.append(f"{name}{self._format_labels(quantile_labels)} {percentile(ordered, q)}")
+                total, count = sums[(series, labels)]
+                lines.append(f"{name}_sum{self._format_labels(labels)} {total}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+
+        for name in sorted({name for name, _ in counters}):
+            self._header(lines, name, "counter")
+            for (series, labels), value in sorted(counters.items()):
+                if series == name:
+                    lines.append(f"{name}{self._format_labels(labels)} {value}")
+        return "\n".join(lines) + "\n"
+
+    def _header(self, lines, name: str, default_kind: str):
+        kind, text = self._help.get(name, (default_kind, ""))
+        if text:
+            lines.append(f"# HELP {name} {text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    @staticmethod
+    def _label_key(labels: Dict[str, str]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    @staticmethod
+    def _format_labels(labels: LabelKey) -> str:
+        if not labels:
+            return ""
+        pairs = []
+        for key, value in labels:
+            value = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+            pairs.append(f'{key}="{value}"')
+        return "{" + ",".join(pairs) + "}"
+
+
+# shared by every processor in the process, served at /metrics
+registry = MetricsRegistry()
+registry.describe("ticket_stage_seconds", "summary", "Time spent per ticket in each pipeline stage")
+registry.describe("ticket_processing_seconds", "summary", "Time from pickup to resolution per ticket")
+registry.describe("tickets_processed_total", "counter", "Resolutions by final status")
+registry.describe("ticket_failures_total", "counter", "Tickets whose processing failed")
+registry.describe("ticket_needs_approval_total", "counter", "Responses held for human approval")
+registry.describe("ticket_keyword_fallbacks_total", "counter",
+                  "Classifications below the confidence threshold decided by keyword rules")
+registry.describe("ticket_ingest_rejected_total", "counter", "Submissions refused because the queue was full")
+registry.describe("ticket_queue_wait_seconds", "summary", "Time tickets waited for a processing slot, by triaged priority")
+registry.describe("ticket_classifier_tier_total", "counter", "Texts classified by each cascade tier")
+registry.describe("ticket_analysis_cache_hits_total", "counter", "Analysis cache hits, by layer (memory or disk)")
+registry.describe("ticket_analysis_cache_misses_total", "counter", "Analysis cache lookups that had to classify")
+registry.describe("ticket_analysis_cache_evictions_total", "counter", "Entries dropped from the in-memory analysis cache")
+registry.describe("ticket_duplicates_reused_total", "counter",
+                  "Tickets that reused the analysis of a near-identical recent ticket")
+registry.describe("ticket_degraded_total", "counter",
+                  "Tickets resolved on the rules and template fast path, by reason")
+registry.describe("ticket_ner_failures_total", "counter",
+                  "Ticket batches parsed without person names because NER failed, by reason")
+registry.describe("ticket_stage_timeouts_total", "counter", "Pipeline stage attempts that hit their timeout")
+registry.describe("ticket_stage_retries_total", "counter", "Pipeline stage retries after transient errors")
+registry.describe("ticket_circuit_transitions_total", "counter", "Circuit breaker state changes, by new state")
+
+
+def record_resolution(resolution: Any, metrics: Optional[MetricsRegistry] = None):
+    """Record a finished resolution's total and per-stage latency and its outcome"""
+    metrics = metrics or registry
+    if resolution.processing_time is not None:
+        metrics.observe("ticket_processing_seconds", resolution.processing_time)
+    for stage, seconds in resolution.timings.items():
+        metrics.observe("ticket_stage_seconds", seconds, stage=stage)
+    metrics.increment("tickets_processed_total", status=resolution.status)
+    if resolution.status == "failed":
+        metrics.increment("ticket_failures_total")
+    elif resolution.status == "needs_approval":
+        metrics.increment("ticket_needs_approval_total")
@@ -0,0 +1,98 @@
+# process-wide registry of heavy models: factories are registered up front and
+# only built on first use, so each model loads at most once per process
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_factories: Dict[str, Callable[[], Any]] = {}
+_models: Dict[str, Any] = {}
+_locks: Dict[str, threading.Lock] = {}
+_registry_lock = threading.Lock()
+
+
+def register_model(name: str, factory: Callable[[], Any], replace: bool = False):
+    """Register how to build a model; replace=True also drops a loaded instance"""
+    with _registry_lock:
+        if name in _factories and not replace:
+            raise ValueError(f"Model '{name}' is already registered")
+        _factories[name] = factory
+        _locks.setdefault(name, threading.Lock())
+        if replace:
+            _models.pop(name, None)
+
+
+def get_model(name: str) -> Any:
+    """Return the model, loading it on first use"""
+    if name in _models:
+        return _models[name]
+    if name not in _factories:
+        raise KeyError(f"Unknown model '{name}', expected one of {sorted(_factories)}")
+
+    # one lock per model so concurrent first calls load it only once
+    with _locks[name]:
+        if name not in _models:
+            start = time.perf_counter()
+            _models[name] = _factories[name]()
+            logger.info(f"Loaded model '{name}' in {time.perf_counter() - start:.2f}s")
+    return _models[name]
+
+
+def is_loaded(name: str) -> bool:
+    return name in _models
+
+
+def warmup(names: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """Load models ahead of the first request, returns load time per model"""
+    timings = {}
+    for name in names or list(_factories):
+        start = time.perf_counter()
+        get_model(name)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def unload(name: Optional[str] = None):
+    """Drop loaded instances so the next get_model rebuilds them"""
+    with _registry_lock:
+        if name is None:
+            _models.clear()
+        else:
+            _models.pop(name, None)
+
+
+def _load_spacy():
+    import spacy
+    from src.config.settings import NLP_CONFIG
+    from src.utils.snapshot import snapshot_path, spacy_version
+    path = snapshot_path("spacy_nlp", spacy_version())
+    if path:
+        # the snapshot only holds the components that are kept
+        return spacy.load(path)
+    return spacy.load(NLP_CONFIG["model"], exclude=NLP_CONFIG["exclude"])
+
+
+def _load_keyword_extractor():
+    import yake
+    return yake.KeywordExtractor()
+
+
+def _load_classifier():
+    from src.agents.TicketAnalysisAgent.classifiers import create_backend
+    return create_backend()
+
+
+def _load_sentence_encoder():
+    from sentence_transformers import SentenceTransformer
+    from src.config.settings import SIMILARITY_CONFIG
+    from src.utils.snapshot import encoder_version, snapshot_path
+    path = snapshot_path("sentence_encoder", encoder_version())
+    return SentenceTransformer(path or SIMILARITY_CONFIG["model"], device="cpu")
+
+
+register_model("spacy_nlp", _load_spacy)
+register_model("keyword_extractor", _load_keyword_extractor)
+register_model("classifier", _load_classifier)
+register_model("sentence_encoder", _load_sentence_encoder)
@@ -0,0 +1,422 @@
+from src.config.settings import RESOLUTION_STORE_CONFIG
+from src.models import Priority, TicketCategory
+from src.utils.serialization import to_jsonable
+
+from collections import OrderedDict
+from enum import Enum
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+
+class ResolutionStore:
+    """
+    Submitted tickets and their resolution dicts, indexed by ticket id.
+
+    Resolutions start out "pending" and are replaced once processing finishes;
+    results() lists them in submission order. query() filters by status,
+    priority, category, customer and submission time, newest first.
+    """
+
+    def add(self, ticket: Dict[str, Any], resolution: Dict[str, Any]):
+        """Store a newly submitted ticket with its pending resolution"""
+        raise NotImplementedError
+
+    def update(self, resolution: Dict[str, Any]):
+        """Replace the resolution of a known ticket"""
+        raise NotImplementedError
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """Resolution dict of a ticket, None if unknown"""
+        raise NotImplementedError
+
+    def ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """The ticket as it was submitted, None if unknown"""
+        raise NotImplementedError
+
+    def results(self) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        priority: Union[Priority, str, int, None] = None,
+        category: Union[TicketCategory, str, None] = None,
+        customer_id: Optional[str] = None,
+        since: Optional[float] = None,
+        limit: int = 50,
+        offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """One page of matching resolutions, most recently submitted first"""
+        raise NotImplementedError
+
+    def count(self, **filters: Any) -> int:
+        """Number of resolutions query() would page through"""
+        raise NotImplementedError
+
+    def export(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        """{"ticket", "resolution"} of every match in submission order, streamed"""
+        raise NotImplementedError
+
+    def __contains__(self, ticket_id: str) -> bool:
+        return self.get(ticket_id) is not None
+
+    def close(self):
+        pass
+
+
+def _normalize_filters(
+    status: Optional[str] = None,
+    priority: Union[Priority, str, int, None] = None,
+    category: Union[TicketCategory, str, None] = None,
+    customer_id: Optional[str] = None,
+    since: Optional[float] = None
+) -> Dict[str, Any]:
+    """Filters as stored: priority by value, category by name"""
+    if isinstance(priority, str):
+        priority = int(priority) if priority.isdigit() else Priority[priority.upper()]
+    if isinstance(priority, Priority):
+        priority = priority.value
+    if isinstance(category, str):
+        category = category.upper()
+    if isinstance(category, TicketCategory):
+        category = category.name
+    return {
+        "status": status,
+        "priority": priority,
+        "category": category,
+        "customer_id": None if customer_id is None else str(customer_id),
+        "since": since
+    }
+
+
+def _indexed_fields(ticket: Optional[Dict[str, Any]], resolution: Dict[str, Any]) -> Dict[str, Any]:
+    """The queryable columns of a ticket and its resolution"""
+    analysis = resolution.get("analysis") or {}
+    priority = analysis.get("priority")
+    category = analysis.get("category")
+    fields = {
+        "status": resolution.get("status"),
+        "priority": _normalize_filters(priority=priority)["priority"] if priority is not None else None,
+        "category": category.name if isinstance(category, Enum) else category
+    }
+    if ticket is not None:
+        customer_id = (ticket.get("customer_info") or {}).get("customer_id")
+        fields["customer_id"] = str(customer_id) if customer_id not in (None, "") else None
+    return fields
+
+
+class InMemoryResolutionStore(ResolutionStore):
+    """Per-process store, lookups are a dict access and queries a scan"""
+
+    def __init__(self):
+        self._tickets: Dict[str, Dict[str, Any]] = {}
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._submitted: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, ticket: Dict[str, Any], resolution: Dict[str, Any]):
+        with self._lock:
+            self._tickets[ticket["id"]] = ticket
+            self._results[ticket["id"]] = resolution
+            self._submitted[ticket["id"]] = time.time()
+            # a resubmitted id moves to the end like a new ticket
+            self._results.move_to_end(ticket["id"])
+
+    def update(self, resolution: Dict[str, Any]):
+        with self._lock:
+            if resolution["ticket_id"] in self._results:
+                self._results[resolution["ticket_id"]] = resolution
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._results.get(ticket_id)
+
+    def ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._tickets.get(ticket_id)
+
+    def results(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._results.values())
+
+    def query(self, limit: int = 50, offset: int = 0, **filters: Any) -> List[Dict[str, Any]]:
+        return list(reversed(self._matches(**filters)))[offset:offset + limit]
+
+    def count(self, **filters: Any) -> int:
+        return len(self._matches(**filters))
+
+    def export(self, **filters: Any) -> Iterator[Dict[str, Any]]:
+        for resolution in self._matches(**filters):
+            yield {"ticket": self.ticket(resolution["ticket_id"]), "resolution": resolution}
+
+    def _matches(self, **filters: Any) -> List[Dict[str, Any]]:
+        wanted = _normalize_filters(**filters)
+        since = wanted.pop("since")
+        with self._lock:
+            items = [
+                (ticket_id, resolution, self._tickets[ticket_id], self._submitted[ticket_id])
+                for ticket_id, resolution in self._results.items()
+            ]
+        matches = []
+        for ticket_id, resolution, ticket, submitted in items:
+            if since is not None and submitted < since:
+                continue
+            fields = _indexed_fields(ticket, resolution)
+            if all(value is None or fields.get(key) == value for key, value in wanted.items()):
+                matches.append(resolution)
+        return matches
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+
+class SQLiteResolutionStore(ResolutionStore):
+    """
+    SQLite-backed store that survives restarts and can be shared by app
+    workers.
+
+    The database runs in WAL mode and rows are indexed by ticket id, status
+    with priority, category, customer and submission time, so queries such
+    as "needs_approval CRITICAL tickets of the last hour" are index range
+    scans. Writes are buffered and committed by a background thread in
+    batches of up to `batch_size`, at least every `flush_interval` seconds;
+    reads see buffered writes immediately.
+    """
+
+    def __init__(self, path: str, batch_size: int = 200, flush_interval: float = 0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS resolutions (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticket_id TEXT NOT NULL UNIQUE,
+                submitted_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                status TEXT NOT NULL,
+                priority INTEGER,
+                category TEXT,
+                customer_id TEXT,
+                ticket TEXT NOT NULL,
+                resolution TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_resolutions_status
+                ON resolutions (status, priority, submitted_at);
+            CREATE INDEX IF NOT EXISTS idx_resolutions_priority
+                ON resolutions (priority, submitted_at);
+            CREATE INDEX IF NOT EXISTS idx_resolutions_category
+                ON resolutions (category, submitted_at);
+            CREATE INDEX IF NOT EXISTS idx_resolutions_customer
+                ON resolutions (customer_id, submitted_at);
+            CREATE INDEX IF NOT EXISTS idx_resolutions_submitted
+                ON resolutions (submitted_at);
+        """)
+        self._conn.commit()
+
+        # ticket_id -> buffered write, and the batch being committed
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._flushing: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._db_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="resolution-store", daemon=True)
+        self._writer.start()
+
+    def add(self, ticket: Dict[str, Any], resolution: Dict[str, Any]):
+        ticket, resolution = to_jsonable(ticket), to_jsonable(resolution)
+        now = time.time()
+        with self._wake:
+            self._pending[ticket["id"]] = dict(
+                _indexed_fields(ticket, resolution),
+                insert=True,
+                ticket=ticket,
+                resolution=resolution,
+                submitted_at=now,
+                updated_at=now
+            )
+            self._pending.move_to_end(ticket["id"])
+            self._notify()
+
+    def update(self, resolution: Dict[str, Any]):
+        resolution = to_jsonable(resolution)
+        fields = _indexed_fields(None, resolution)
+        with self._wake:
+            write = self._pending.setdefault(resolution["ticket_id"], {"insert": False})
+            write.update(fields, resolution=resolution, updated_at=time.time())
+            self._notify()
+
+    def get(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        buffered = self._buffered(ticket_id)
+        if buffered is not None:
+            return buffered["resolution"]
+        row = self._fetchone("SELECT resolution FROM resolutions WHERE ticket_id = ?", (ticket_id,))
+        return json.loads(row[0]) if row else None
+
+    def ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for writes in (self._pending, self._flushing):
+                if ticket_id in writes and writes[ticket_id]["insert"]:
+                    return writes[ticket_id]["ticket"]
+        row = self._fetchone("SELECT ticket FROM resolutions WHERE ticket_id = ?", (ticket_id,))
+        return json.loads(row[0]) if row else None
+
+    def results(self) -> List[Dict[str, Any]]:
+        return [row["resolution"] for row in self.export()]
+
+    def query(self, limit: int = 50, offset: int = 0, **filters: Any) -> List[Dict[str, Any]]:
+        self.flush()
+        where, params = self._where(**filters)
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"SELECT resolution FROM resolutions{where} "
+                "ORDER BY submitted_at DESC, seq DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [json.loads(resolution) for resolution, in rows]
+
+    def count(self, **filters: Any) -> int:
+        self.flush()
+        where, params = self._where(**filters)
+        return self._fetchone(f"SELECT COUNT(*) FROM resolutions{where}", tuple(params))[0]
+
+    def export(self, page_size: int = 1000, **filters: Any) -> Iterator[Dict[str, Any]]:
+        self.flush()
+        where, params = self._where(**filters)
+        where = f"{where} AND seq > ?" if where else " WHERE seq > ?"
+        last = 0
+        while True:
+            # keyset pages, so the lock is never held while the caller consumes rows
+            with self._db_lock:
+                rows = self._conn.execute(
+                    f"SELECT seq, ticket, resolution FROM resolutions{where} ORDER BY seq LIMIT ?",
+                    params + [last, page_size]
+                ).fetchall()
+            for seq, ticket, resolution in rows:
+                yield {"ticket": json.loads(ticket), "resolution": json.loads(resolution)}
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    def explain(self, **filters: Any) -> List[str]:
+        """SQLite's plan for a query() with these filters"""
+        where, params = self._where(**filters)
+        with self._db_lock:
+            rows = self._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT resolution FROM resolutions{where} "
+                "ORDER BY submitted_at DESC, seq DESC LIMIT 50",
+                params
+            ).fetchall()
+        return [row[-1] for row in rows]
+
+    def flush(self):
+        """Commit every buffered write"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending:
+                    return
+                self._flushing, self._pending = self._pending, OrderedDict()
+            writes = self._flushing
+            inserts = [
+                (ticket_id, w["submitted_at"], w["updated_at"], w["status"], w["priority"], w["category"],
+                 w.get("customer_id"), json.dumps(w["ticket"]), json.dumps(w["resolution"]))
+                for ticket_id, w in writes.items() if w["insert"]
+            ]
+            updates = [
+                (w["updated_at"], w["status"], w["priority"], w["category"], json.dumps(w["resolution"]), ticket_id)
+                for ticket_id, w in writes.items() if not w["insert"]
+            ]
+            try:
+                with self._db_lock, self._conn:
+                    # replacing gives a resubmitted id a new seq, like a new ticket
+                    self._conn.executemany(
+                        """
+                        INSERT OR REPLACE INTO resolutions (ticket_id, submitted_at, updated_at, status,
+                            priority, category, customer_id, ticket, resolution)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        """,
+                        inserts
+                    )
+                    self._conn.executemany(
+                        """
+                        UPDATE resolutions SET updated_at = ?, status = ?, priority = ?, category = ?, resolution = ?
+                        WHERE ticket_id = ?
+                        """,
+                        updates
+                    )
+            finally:
+                with self._lock:
+                    self._flushing = {}
+
+    def close(self):
+        with self._wake:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+        self._writer.join()
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    def _notify(self):
+        # called with the lock held; a full batch is written right away
+        if len(self._pending) == 1 or len(self._pending) >= self.batch_size:
+            self._wake.notify()
+
+    def _write_loop(self):
+        while True:
+            with self._wake:
+                self._wake.wait_for(lambda: self._pending or self._closed)
+                if self._closed:
+                    return
+                # let more writes join the batch, unless it is already full
+                self._wake.wait_for(
+                    lambda: len(self._pending) >= self.batch_size or self._closed,
+                    timeout=self.flush_interval
+                )
+            self.flush()
+
+    def _buffered(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._pending.get(ticket_id) or self._flushing.get(ticket_id)
+
+    def _fetchone(self, sql: str, params: Tuple[Any, ...]) -> Optional[Tuple[Any, ...]]:
+        with self._db_lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    @staticmethod
+    def _where(**filters: Any) -> Tuple[str, List[Any]]:
+        wanted = _normalize_filters(**filters)
+        since = wanted.pop("since")
+        clauses = [f"{column} = ?" for column, value in wanted.items() if value is not None]
+        params = [value for value in wanted.values() if value is not None]
+        if since is not None:
+            clauses.append("submitted_at >= ?")
+            params.append(since)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def create_resolution_store() -> ResolutionStore:
+    """Build the store selected in RESOLUTION_STORE_CONFIG"""
+    backend = RESOLUTION_STORE_CONFIG["backend"]
+    if backend == "memory":
+        return InMemoryResolutionStore()
+    if backend == "sqlite":
+        return SQLiteResolutionStore(
+            RESOLUTION_STORE_CONFIG["path"],
+            batch_size=RESOLUTION_STORE_CONFIG["batch_size"],
+            flush_interval=RESOLUTION_STORE_CONFIG["flush_interval"]
+        )
+    raise ValueError(f"Unknown resolution store backend '{backend}', expected 'memory' or 'sqlite'")
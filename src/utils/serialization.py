@@ -0,0 +1,16 @@
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+from typing import Any
+
+
+def to_jsonable(obj: Any) -> Any:
+    """Convert dataclasses and enums (by name) into JSON-serializable values"""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        obj = asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.name
+    if isinstance(obj, dict):
+        return {str(k): to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set)):
+        return [to_jsonable(v) for v in obj]
+    return obj
@@ -0,0 +1,175 @@
+from src.config.settings import SIMILARITY_CONFIG
+
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class SimilarityIndex:
+    """
+    Cosine-similarity search over embeddings of processed tickets.
+
+    Vectors are normalised and kept as float16 in a fixed-size memory-mapped
+    array used as a ring buffer: 2 bytes per dimension per ticket, off the
+    Python heap, oldest tickets overwritten once `capacity` is reached. Search
+    is a blocked float32 matrix-vector product and an argpartition top-k, and
+    can be restricted to a group (customer) or to recent entries.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 50_000,
+        directory: Optional[str] = None,
+        block_rows: int = 8192
+    ):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.directory = directory
+        self.block_rows = block_rows
+        # allocated on the first add, once the embedding size is known
+        self._vectors: Optional[np.memmap] = None
+        self._file = None
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._keys: List[Optional[str]] = [None] * capacity
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._groups: List[Optional[str]] = [None] * capacity
+        self._slots: Dict[str, int] = {}
+        self._members: Dict[str, Set[int]] = {}
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> Optional[int]:
+        return None if self._vectors is None else self._vectors.shape[1]
+
+    def add(
+        self,
+        key: str,
+        vector: np.ndarray,
+        entry: Optional[Dict[str, Any]] = None,
+        group: Optional[Any] = None,
+        timestamp: Optional[float] = None
+    ):
+        """Index a vector under `key`, replacing an earlier one with the same key"""
+        vector = self._normalize(vector)
+        group = None if group is None else str(group)
+        with self._lock:
+            if self._vectors is None:
+                self._allocate(vector.shape[0])
+            elif vector.shape[0] != self.dim:
+                raise ValueError(f"Expected a vector of size {self.dim}, got {vector.shape[0]}")
+
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._next
+                self._next = (self._next + 1) % self.capacity
+                self._size = min(self._size + 1, self.capacity)
+            self._evict(slot)
+
+            self._vectors[slot] = vector
+            self._timestamps[slot] = time.time() if timestamp is None else timestamp
+            self._keys[slot] = key
+            self._entries[slot] = entry or {}
+            self._groups[slot] = group
+            self._slots[key] = slot
+            if group is not None:
+                self._members.setdefault(group, set()).add(slot)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            slot = self._slots.get(key)
+            return None if slot is None else self._entries[slot]
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 1,
+        min_score: float = -1.0,
+        group: Optional[Any] = None,
+        since: Optional[float] = None
+    ) -> List[Tuple[str, float, Dict[str, Any]]]:
+        """(key, cosine similarity, entry) of the k nearest entries, most similar first"""
+        query = self._normalize(vector).astype(np.float32)
+        with self._lock:
+            if self._vectors is None or k < 1:
+                return []
+            if query.shape[0] != self.dim:
+                raise ValueError(f"Expected a vector of size {self.dim}, got {query.shape[0]}")
+
+            if group is None:
+                rows = np.arange(self._size)
+                scores = self._scores(query)
+            else:
+                rows = np.fromiter(self._members.get(str(group), ()), dtype=np.int64)
+                scores = self._vectors[rows].astype(np.float32) @ query
+            if since is not None:
+                scores[self._timestamps[rows] < since] = -np.inf
+            if not len(scores):
+                return []
+
+            if k < len(scores):
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [
+                (self._keys[rows[i]], float(scores[i]), self._entries[rows[i]])
+                for i in top
+                if scores[i] >= min_score
+            ]
+
+    def close(self):
+        with self._lock:
+            self._vectors = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _allocate(self, dim: int):
+        # anonymous file, so worker processes never share or clobber each other's index
+        self._file = tempfile.TemporaryFile(prefix="ticket-embeddings-", dir=self.directory)
+        self._vectors = np.memmap(self._file, dtype=np.float16, mode="w+", shape=(self.capacity, dim))
+
+    def _evict(self, slot: int):
+        old_key = self._keys[slot]
+        if old_key is None:
+            return
+        self._slots.pop(old_key, None)
+        old_group = self._groups[slot]
+        if old_group is not None:
+            members = self._members[old_group]
+            members.discard(slot)
+            if not members:
+                del self._members[old_group]
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        # float16 has no BLAS kernels, convert a block at a time instead of the whole index
+        scores = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, self.block_rows):
+            stop = min(start + self.block_rows, self._size)
+            scores[start:stop] = self._vectors[start:stop].astype(np.float32) @ query
+        return scores
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+
+def create_similarity_index() -> Optional[SimilarityIndex]:
+    """Index configured in SIMILARITY_CONFIG, None when disabled"""
+    if not SIMILARITY_CONFIG["enabled"]:
+        return None
+    return SimilarityIndex(
+        capacity=SIMILARITY_CONFIG["capacity"],
+        directory=SIMILARITY_CONFIG["directory"]
+    )
@@ -0,0 +1,154 @@
+"""
+Warm-start snapshot: local copies of the heavy models, written once by
+`python main.py snapshot` so later processes load them from disk without
+touching the network.
+
+    <snapshot>/
+        manifest.json          component -> path and the configuration it was built from
+        spacy_nlp/             the trimmed (NER only) pipeline from nlp.to_disk
+        classifier/<backend>/  transformers weights as safetensors, memory-mapped on load
+        sentence_encoder/
+
+A component is only used while its configuration matches the manifest, so a
+changed model falls back to loading from the source instead of a stale copy.
+"""
+from src.config.settings import NLP_CONFIG, SIMILARITY_CONFIG, SNAPSHOT_CONFIG
+
+from typing import Any, Dict, List, Optional, Set
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = "manifest.json"
+COMPONENTS = ["spacy_nlp", "classifier", "sentence_encoder"]
+
+# snapshot directory -> manifest, read once per process
+_manifests: Dict[str, Optional[Dict[str, Any]]] = {}
+# stale components, warned about once
+_stale: Set[str] = set()
+_lock = threading.Lock()
+
+
+def spacy_version() -> str:
+    """Identifies the spaCy pipeline NLP_CONFIG asks for"""
+    return f"{NLP_CONFIG['model']}:exclude={','.join(sorted(NLP_CONFIG['exclude']))}"
+
+
+def encoder_version() -> str:
+    return SIMILARITY_CONFIG["model"]
+
+
+def load_manifest(directory: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """Manifest of a snapshot (the configured one by default), None when there is none"""
+    directory = directory or SNAPSHOT_CONFIG["path"]
+    if not directory:
+        return None
+    with _lock:
+        if directory not in _manifests:
+            path = os.path.join(directory, MANIFEST_FILE)
+            try:
+                with open(path, "r", encoding="utf-8") as file:
+                    _manifests[directory] = json.load(file)
+            except (OSError, ValueError) as e:
+                logger.warning(f"No usable warm-start snapshot in {directory}: {str(e)}")
+                _manifests[directory] = None
+        return _manifests[directory]
+
+
+def snapshot_path(component: str, version: str) -> Optional[str]:
+    """Where the configured snapshot keeps `component`, None when it has no copy of this version"""
+    manifest = load_manifest()
+    if manifest is None:
+        return None
+    entry = manifest["components"].get(component)
+    if entry is None:
+        return None
+    if entry["version"] != version:
+        if component not in _stale:
+            _stale.add(component)
+            logger.warning(f"Snapshot of '{component}' is for {entry['version']}, loading {version} from the source")
+        return None
+    if SNAPSHOT_CONFIG["offline"]:
+        go_offline()
+    return os.path.join(SNAPSHOT_CONFIG["path"], entry["path"])
+
+
+def go_offline():
+    """Keep transformers and the Hugging Face Hub client from making requests"""
+    os.environ.setdefault("HF_HUB_OFFLINE", "1")
+    os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+
+def create_snapshot(directory: str, components: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Load the configured models and write them to `directory`, replacing an
+    earlier snapshot there. Returns the manifest with write time and size
+    per component.
+    """
+    from src.agents.TicketAnalysisAgent.classifiers import CascadeBackend
+    from src.utils.model_registry import get_model
+
+    unknown = set(components or []) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"Unknown snapshot components {sorted(unknown)}, expected some of {COMPONENTS}")
+    components = components or COMPONENTS
+
+    # written next to the target and swapped in once complete
+    partial = directory.rstrip(os.sep) + ".partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+    entries: Dict[str, Dict[str, Any]] = {}
+
+    def record(name: str, path: str, version: str, start: float):
+        entries[name] = {
+            "path": os.path.relpath(path, partial),
+            "version": version,
+            "seconds": round(time.perf_counter() - start, 3),
+            "bytes": _size(path)
+        }
+
+    if "spacy_nlp" in components:
+        start = time.perf_counter()
+        path = os.path.join(partial, "spacy_nlp")
+        get_model("spacy_nlp").to_disk(path)
+        record("spacy_nlp", path, spacy_version(), start)
+
+    if "classifier" in components:
+        backend = get_model("classifier")
+        tiers = backend.tiers if isinstance(backend, CascadeBackend) else [backend]
+        for tier in tiers:
+            start = time.perf_counter()
+            path = tier.save(os.path.join(partial, "classifier", tier.name))
+            # rules and other backends without a model file have nothing to save
+            if path is not None:
+                record(f"classifier/{tier.name}", path, tier.version, start)
+
+    if "sentence_encoder" in components and SIMILARITY_CONFIG["enabled"]:
+        start = time.perf_counter()
+        path = os.path.join(partial, "sentence_encoder")
+        get_model("sentence_encoder").save(path)
+        record("sentence_encoder", path, encoder_version(), start)
+
+    manifest = {"created": time.time(), "components": entries}
+    with open(os.path.join(partial, MANIFEST_FILE), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2)
+
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(partial, directory)
+    with _lock:
+        _manifests.pop(directory, None)
+    return manifest
+
+
+def _size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
@@ -0,0 +1,86 @@
+from functools import lru_cache
+from importlib.util import spec_from_file_location, module_from_spec
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+from jinja2 import Template
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TEMPLATES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "config",
+    "templates.py"
+)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> Template:
+    """Compile a template string once and reuse it for identical sources"""
+    return Template(source)
+
+
+class TemplateRegistry:
+    """
+    RESPONSE_TEMPLATES loaded once and reloaded when the file changes. Every
+    template is compiled on load through compile_template, the cache the
+    response agent renders from, so a broken template fails the load
+    """
+
+    def __init__(self, path: str = DEFAULT_TEMPLATES_PATH, check_interval: float = 1.0):
+        self.path = path
+        # how often (seconds) the file's mtime is checked for edits
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._templates: Dict[str, str] = {}
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self.reloads = 0
+        self._load()
+
+    def _load(self):
+        """Execute the templates module and compile every entry"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+            spec = spec_from_file_location("templates", self.path)
+            module = module_from_spec(spec)
+            spec.loader.exec_module(module)
+            templates = dict(module.RESPONSE_TEMPLATES)
+            for source in templates.values():
+                compile_template(source)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load templates: {str(e)}")
+
+        self._templates, self._mtime = templates, mtime
+        self._last_check = time.monotonic()
+        self.reloads += 1
+
+    def _refresh(self):
+        """Reload if the file changed, keeping the current templates on failure"""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            if now - self._last_check < self.check_interval:
+                return
+            self._last_check = now
+            try:
+                changed = os.stat(self.path).st_mtime != self._mtime
+            except OSError as e:
+                logger.warning(f"Cannot stat templates file: {str(e)}")
+                return
+            if changed:
+                try:
+                    self._load()
+                    logger.info(f"Reloaded response templates from {self.path}")
+                except RuntimeError as e:
+                    logger.error(f"Keeping previous templates: {str(e)}")
+
+    @property
+    def templates(self) -> Dict[str, str]:
+        """Template sources by key"""
+        self._refresh()
+        return self._templates
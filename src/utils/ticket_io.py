@@ -0,0 +1,125 @@
+from src.models import SupportTicket
+
+import json
+from typing import Any, Dict, IO, Iterator
+
+_WHITESPACE = " \t\r\n"
+
+
+def iter_json_array(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array without reading it all into memory"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+    started = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    while True:
+        # skip whitespace and separators
+        while position < len(buffer) and buffer[position] in _WHITESPACE + ("," if started else ""):
+            position += 1
+        if position >= len(buffer):
+            if eof or not fill():
+                if not started:
+                    return
+                raise ValueError("Unexpected end of JSON array")
+            continue
+
+        if not started:
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array")
+            started = True
+            position += 1
+            continue
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # the element may continue in the next chunk
+            if eof or not fill():
+                raise
+            continue
+        # a number can be cut off at a chunk boundary and still parse
+        if end >= len(buffer) and not eof and fill():
+            continue
+        position = end
+        yield item
+
+
+def iter_jsonl(stream: IO[str]) -> Iterator[Any]:
+    """Yield one JSON value per non-empty line"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {line_number}: {str(e)}")
+
+
+def iter_records(stream: IO[str], fmt: str = "auto") -> Iterator[Any]:
+    """Records from a JSON array or JSONL stream, detected from the first character"""
+    if fmt == "auto":
+        head = ""
+        while True:
+            char = stream.read(1)
+            if not char or char not in _WHITESPACE:
+                head = char
+                break
+        fmt = "json" if head == "[" else "jsonl"
+        stream = _Prefixed(head, stream)
+    return iter_json_array(stream) if fmt == "json" else iter_jsonl(stream)
+
+
+def ticket_from_record(record: Dict[str, Any]) -> SupportTicket:
+    """Validate a raw record and build a SupportTicket"""
+    if not isinstance(record, dict):
+        raise ValueError("Ticket record must be a JSON object")
+    missing = [key for key in ("id", "subject", "content") if key not in record]
+    if missing:
+        raise ValueError(f"Ticket record is missing {', '.join(missing)}")
+    return SupportTicket(
+        id=str(record["id"]),
+        subject=str(record["subject"]),
+        content=str(record["content"]),
+        customer_info=dict(record.get("customer_info") or {})
+    )
+
+
+class _Prefixed:
+    """Text stream with a few already-consumed characters pushed back in front"""
+
+    def __init__(self, prefix: str, stream: IO[str]):
+        self._prefix = prefix
+        self._stream = stream
+
+    def read(self, size: int = -1) -> str:
+        prefix, self._prefix = self._prefix, ""
+        if size is not None and 0 <= size <= len(prefix):
+            self._prefix = prefix[size:]
+            return prefix[:size]
+        rest = self._stream.read(-1 if size is None or size < 0 else size - len(prefix))
+        return prefix + rest
+
+    def __iter__(self):
+        prefix, self._prefix = self._prefix, ""
+        first = True
+        for line in self._stream:
+            if first:
+                line, first = prefix + line, False
+            yield line
+        if first and prefix:
+            yield prefix
@@ -0,0 +1,99 @@
+"""
+Compare classifier backends on the sample ticket set.
+
+    python -m tests.benchmarks.bench_classifiers --backends zero_shot distilbert
+    python -m tests.benchmarks.bench_classifiers --backends distilbert onnx --threads 1 2 4 --parity distilbert
+"""
+import argparse
+import json
+import time
+from statistics import mean, median
+
+from src.agents.TicketAnalysisAgent import TicketAnalysisAgent, create_backend
+from src.agents.TicketAnalysisAgent.export import parity_check
+from src.config.settings import CLASSIFIER_CONFIG
+from src.models import TicketCategory
+
+SAMPLE_PATH = "tests/data/test_template/ticket_sample.json"
+LABELS_PATH = "tests/data/test_template/ticket_labels.json"
+
+
+def load_labelled_tickets():
+    """Sample tickets formatted like TicketProcessor and their expected category"""
+    with open(SAMPLE_PATH, "r") as file:
+        tickets = json.load(file)
+    with open(LABELS_PATH, "r") as file:
+        labels = json.load(file)
+
+    texts = [
+        f"<|role|> {t['customer_info'].get('role', '')} <|role|>"
+        + f"<|subject|> {t['subject']} <|subject|>"
+        + f"<|content|> {t['content']} <|content|>"
+        for t in tickets
+    ]
+    return texts, [TicketCategory(label["category"]) for label in labels]
+
+
+def bench_backend(name, texts, expected, threads=None):
+    """Load time, per-ticket and batched latency and accuracy for one backend"""
+    if threads and "num_threads" in CLASSIFIER_CONFIG.get(name, {}):
+        CLASSIFIER_CONFIG[name]["num_threads"] = threads
+    start = time.perf_counter()
+    agent = TicketAnalysisAgent(classifier=create_backend(name))
+    load_time = time.perf_counter() - start
+
+    clean_texts = [agent._preprocess_text(text) for text in texts]
+    # warm up so lazy initialisation is not counted as latency
+    agent._classify_tickets(clean_texts[:1])
+
+    latencies = []
+    predictions = []
+    for text in clean_texts:
+        start = time.perf_counter()
+        predictions.append(agent._classify_ticket(text))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    agent._classify_tickets(clean_texts)
+    batch_time = time.perf_counter() - start
+
+    correct = sum(p == e for p, e in zip(predictions, expected))
+    return {
+        "backend": name,
+        # differs from the name when the backend fell back
+        "version": agent.classifier.version,
+        "threads": threads,
+        "load_s": round(load_time, 3),
+        "mean_ms": round(mean(latencies) * 1000, 2),
+        "median_ms": round(median(latencies) * 1000, 2),
+        "batched_ms_per_ticket": round(batch_time / len(clean_texts) * 1000, 2),
+        "accuracy": round(correct / len(expected), 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["zero_shot", "distilbert"])
+    parser.add_argument("--threads", type=int, nargs="+", default=[None],
+                        help="Intra-op thread counts to try for backends that support them")
+    parser.add_argument("--parity", metavar="REFERENCE",
+                        help="Also compare each backend's predictions with this backend")
+    args = parser.parse_args()
+
+    texts, expected = load_labelled_tickets()
+    for name in args.backends:
+        for threads in args.threads:
+            try:
+                print(json.dumps(bench_backend(name, texts, expected, threads)))
+            except Exception as e:
+                print(json.dumps({"backend": name, "threads": threads, "error": str(e)}))
+
+    if args.parity:
+        reference = create_backend(args.parity)
+        for name in args.backends:
+            if name != args.parity:
+                print(json.dumps(dict(parity_check(reference, create_backend(name), texts), backend=name)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+End-to-end benchmark over the bundled ticket archive.
+
+Each component (TicketAnalysisAgent, ResponseAgent, TicketProcessor) runs in
+its own interpreter so cold start and peak RSS are measured in isolation.
+Tickets are streamed from tests/data/raw/archive.zip without extracting it.
+
+    python -m tests.benchmarks.bench_pipeline --output bench.json
+    python -m tests.benchmarks.bench_pipeline --offline --concurrency 1 4 16
+    python -m tests.benchmarks.bench_pipeline --components processor --workers 1 2 4
+
+--offline swaps the classifier, spaCy and YAKE for stubs so only the non-ML
+overhead (scheduling, templating, scoring, bookkeeping) is measured.
+
+Tickets the processor resolved on the rules and template fast path are
+reported as `degraded`. Like failures, they are left out of tickets_per_s,
+which counts only tickets that went through the full pipeline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from itertools import islice
+from types import SimpleNamespace
+
+from src.utils.metrics import percentile
+
+COMPONENTS = ["analysis", "response", "processor"]
+
+# archive ticket types and priorities -> analysis fields for the response agent
+PRIORITIES = {"Low": 1, "Medium": 2, "High": 3, "Critical": 4}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KiB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def summarize(latencies):
+    return {f"p{q}_ms": round(percentile(latencies, q) * 1000, 2) for q in (50, 95, 99)}
+
+
+def throughput(tickets, failures, degraded, elapsed):
+    """Counts of a run, tickets_per_s over the ones fully processed"""
+    succeeded = tickets - failures - degraded
+    return {
+        "tickets": tickets,
+        "failures": failures,
+        "degraded": degraded,
+        "elapsed_s": round(elapsed, 3),
+        "tickets_per_s": round(succeeded / elapsed, 2) if elapsed else 0.0
+    }
+
+
+def install_stub_models():
+    """Register cheap stand-ins for every model in the registry"""
+    from src.agents.TicketAnalysisAgent import ClassifierBackend
+    from src.models import TicketCategory
+    from src.utils.model_registry import register_model
+
+    class StubClassifier(ClassifierBackend):
+        name = "stub"
+        model_id = "offline"
+        labels = [category.value for category in TicketCategory]
+
+        def classify(self, texts):
+            # deterministic, roughly a quarter falls below the confidence threshold
+            results = []
+            for text in texts:
+                top = self.labels[len(text) % len(self.labels)]
+                confidence = 0.5 if len(text) % 4 == 0 else 0.9
+                rest = (1 - confidence) / (len(self.labels) - 1)
+                results.append(self._rank({
+                    label: confidence if label == top else rest for label in self.labels
+                }))
+            return results
+
+    class StubNlp:
+        def pipe(self, texts, batch_size=None):
+            for _ in texts:
+                yield SimpleNamespace(ents=[])
+
+        def __call__(self, text):
+            return SimpleNamespace(ents=[])
+
+    class StubKeywordExtractor:
+        def extract_keywords(self, text):
+            words = sorted(set(text.split()), key=len, reverse=True)[:20]
+            return [(word, 1 / len(word)) for word in words]
+
+    register_model("classifier", StubClassifier, replace=True)
+    register_model("spacy_nlp", StubNlp, replace=True)
+    register_model("keyword_extractor", StubKeywordExtractor, replace=True)
+
+
+def archive_rows(args, count):
+    from src.utils.datasets import iter_archive_rows
+    return list(iter_archive_rows(args.archive, count))
+
+
+def analysis_for_row(row):
+    """Analysis taken from the archive's own labels, so responses don't need the classifier"""
+    from src.config.settings import CLASSIFIER_CONFIG
+    from src.models import TicketAnalysis, TicketCategory, Priority
+
+    category = TicketCategory(
+        CLASSIFIER_CONFIG["distilbert"]["label_map"].get(row["Ticket Type"], "technical")
+    )
+    priority = Priority(PRIORITIES.get(row["Ticket Priority"], 2))
+    return TicketAnalysis(
+        category=category,
+        priority=priority,
+        key_points=row["Ticket Subject"].lower().split()[:3],
+        required_expertise=["general"],
+        suggested_response_type=category.value
+    )
+
+
+def build_component(name):
+    """Component under test and an async callable that handles one archive row"""
+    if name == "analysis":
+        from src.agents import TicketAnalysisAgent
+        from src.utils.datasets import ticket_from_row
+        agent = TicketAnalysisAgent()
+
+        async def handle(row):
+            ticket = ticket_from_row(row)
+            return await agent.analyze_ticket(
+                f"<|subject|> {ticket.subject} <|subject|><|content|> {ticket.content} <|content|>"
+            )
+        return agent, handle
+
+    if name == "response":
+        from src.agents import ResponseAgent
+        from src.utils.template_registry import TemplateRegistry
+        agent = ResponseAgent()
+        templates = TemplateRegistry()
+
+        async def handle(row):
+            return await agent.generate_response(
+                analysis_for_row(row),
+                templates.templates,
+                {"customer_info": {"customer_name": row["Customer Name"]}}
+            )
+        return agent, handle
+
+    if name == "processor":
+        from src.agents import TicketProcessor
+        from src.utils.datasets import ticket_from_row
+        processor = TicketProcessor()
+        processor.warmup()
+
+        async def handle(row):
+            resolution = await processor.process_ticket(ticket_from_row(row))
+            if resolution.status == "failed":
+                raise RuntimeError(resolution.error)
+            return resolution
+        return processor, handle
+
+    raise ValueError(f"Unknown component '{name}', expected one of {COMPONENTS}")
+
+
+async def run_concurrent(component, handle, rows, concurrency, name):
+    """Handle every row with at most `concurrency` in flight, returns (failures, degraded)"""
+    if name == "processor":
+        from src.utils.datasets import ticket_from_row
+        resolutions = await component.process_batch(
+            [ticket_from_row(row) for row in rows], concurrency=concurrency
+        )
+        return outcomes(resolutions)
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(row):
+        async with semaphore:
+            await handle(row)
+
+    results = await asyncio.gather(*(bounded(row) for row in rows), return_exceptions=True)
+    return sum(isinstance(r, Exception) for r in results), 0
+
+
+def outcomes(resolutions):
+    """(failed, degraded) counts of processor resolutions, a degraded ticket is not a failure"""
+    failed = sum(r.status == "failed" for r in resolutions)
+    return failed, sum(r.degraded and r.status != "failed" for r in resolutions)
+
+
+async def bench_pool(rows, workers, concurrency):
+    """Throughput of a WorkerPool forked from this (already warm) process"""
+    from src.agents.TicketProcessor import WorkerPool
+    from src.utils.datasets import ticket_from_row
+
+    began = time.perf_counter()
+    pool = WorkerPool(workers=workers, concurrency=concurrency).start()
+    started = time.perf_counter() - began
+    try:
+        # first ticket per worker pays for its lazy setup
+        await pool.process_batch([ticket_from_row(row) for row in rows[:workers]])
+        began = time.perf_counter()
+        resolutions = await pool.process_batch([ticket_from_row(row) for row in rows])
+        elapsed = time.perf_counter() - began
+    finally:
+        pool.shutdown(timeout=30)
+    return {
+        "workers": workers,
+        "start_s": round(started, 3),
+        **throughput(len(rows), *outcomes(resolutions), elapsed)
+    }
+
+
+def measure(args):
+    """Runs inside the component's own interpreter, returns its results"""
+    start = time.perf_counter()
+    if args.offline:
+        install_stub_models()
+    if not args.with_cache:
+        from src.config.settings import ANALYSIS_CACHE_CONFIG
+        ANALYSIS_CACHE_CONFIG["enabled"] = False
+    component, handle = build_component(args.component)
+    construct_s = time.perf_counter() - start
+
+    rows = archive_rows(args, max(args.warm_tickets, args.batch_tickets) + 1)
+    result = {"component": args.component}
+
+    async def run():
+        # cold start covers imports, construction and lazy model loading
+        first = time.perf_counter()
+        try:
+            first_result = await handle(rows[0])
+            result["first_error"] = None
+            result["first_degraded"] = getattr(first_result, "degraded", False)
+        except Exception as e:
+            result["first_error"] = str(e)
+        result["cold_start_s"] = round(time.perf_counter() - start, 3)
+        result["construct_s"] = round(construct_s, 3)
+        result["first_ticket_s"] = round(time.perf_counter() - first, 3)
+        result["rss_after_start_mb"] = peak_rss_mb()
+
+        latencies, failures, degraded = [], 0, 0
+        for row in islice(rows, 1, args.warm_tickets + 1):
+            began = time.perf_counter()
+            try:
+                # only processor resolutions can be degraded
+                degraded += getattr(await handle(row), "degraded", False)
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - began)
+        result["warm"] = {
+            "tickets": len(latencies), "failures": failures, "degraded": degraded, **summarize(latencies)
+        }
+
+        result["throughput"] = []
+        batch = rows[1:args.batch_tickets + 1]
+        for concurrency in args.concurrency:
+            began = time.perf_counter()
+            failures, degraded = await run_concurrent(component, handle, batch, concurrency, args.component)
+            elapsed = time.perf_counter() - began
+            result["throughput"].append(
+                {"concurrency": concurrency, **throughput(len(batch), failures, degraded, elapsed)}
+            )
+
+        if args.component == "processor" and args.workers:
+            result["workers"] = [await bench_pool(batch, workers, max(args.concurrency)) for workers in args.workers]
+
+    asyncio.run(run())
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def run_component(name, args):
+    """Benchmark one component in a fresh interpreter"""
+    command = [
+        sys.executable, "-m", "tests.benchmarks.bench_pipeline",
+        "--component", name,
+        "--archive", args.archive,
+        "--warm-tickets", str(args.warm_tickets),
+        "--batch-tickets", str(args.batch_tickets),
+        "--concurrency", *map(str, args.concurrency)
+    ]
+    if args.workers:
+        command += ["--workers", *map(str, args.workers)]
+    if args.offline:
+        command.append("--offline")
+    if args.with_cache:
+        command.append("--with-cache")
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    output = subprocess.run(command, cwd=project_root, capture_output=True, text=True)
+    if output.returncode != 0:
+        return {"component": name, "error": output.stderr.strip().splitlines()[-1:]}
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def main():
+    from src.utils.datasets import ARCHIVE_PATH
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--components", nargs="+", choices=COMPONENTS, default=COMPONENTS)
+    parser.add_argument("--archive", default=os.path.normpath(ARCHIVE_PATH))
+    parser.add_argument("--offline", action="store_true", help="Stub out all models")
+    parser.add_argument("--with-cache", action="store_true", help="Keep the analysis cache enabled")
+    parser.add_argument("--warm-tickets", type=int, default=100, help="Sequential tickets for warm latency")
+    parser.add_argument("--batch-tickets", type=int, default=200, help="Tickets per throughput run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--workers", type=int, nargs="*", default=[],
+                        help="Also measure TicketProcessor throughput through a WorkerPool of each size")
+    parser.add_argument("--output", "-o", help="Write results here instead of stdout")
+    parser.add_argument("--component", choices=COMPONENTS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.component:
+        # child process, report a single component
+        print(json.dumps(measure(args)))
+        return
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "offline": args.offline,
+        "analysis_cache": args.with_cache,
+        "results": [run_component(name, args) for name in args.components]
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Cold start of a worker process, with and without a warm-start snapshot.
+
+Each run is a fresh interpreter that imports the processor, loads the
+preloaded models and processes one ticket, timing every step. With
+--no-network outgoing connections raise, so a run that still needs the
+network fails instead of silently downloading.
+
+    python main.py snapshot -o data/snapshot
+    python -m tests.benchmarks.bench_startup --snapshot data/snapshot --runs 5 --no-network
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from statistics import median
+
+SAMPLE_TICKET = {
+    "id": "TKT-STARTUP",
+    "subject": "Cannot export reports",
+    "content": "The export to CSV fails with a timeout since this morning.",
+    "customer_info": {"customer_id": "C1", "role": "Admin", "plan": "Enterprise"}
+}
+
+
+def block_network():
+    import socket
+
+    def refuse(*args, **kwargs):
+        raise OSError("network access during startup")
+
+    socket.socket.connect = refuse
+    socket.create_connection = refuse
+
+
+def child(args):
+    """One cold start, timings printed as JSON"""
+    began = time.perf_counter()
+    if args.no_network:
+        block_network()
+
+    import asyncio
+    from src.agents.TicketProcessor import TicketProcessor
+    from src.models import SupportTicket
+    imported = time.perf_counter()
+
+    processor = TicketProcessor()
+    models = processor.warmup()
+    loaded = time.perf_counter()
+
+    resolution = asyncio.run(processor.process_ticket(SupportTicket(**SAMPLE_TICKET)))
+    done = time.perf_counter()
+    print(json.dumps({
+        "import_s": round(imported - began, 3),
+        "models_s": {name: round(seconds, 3) for name, seconds in models.items()},
+        "load_s": round(loaded - imported, 3),
+        "first_ticket_s": round(done - loaded, 3),
+        "total_s": round(done - began, 3),
+        "status": resolution.status,
+        "error": resolution.error
+    }))
+
+
+def run(snapshot, args):
+    """Median and worst timings over args.runs fresh interpreters"""
+    env = dict(os.environ)
+    env.pop("TICKET_SNAPSHOT_DIR", None)
+    if snapshot:
+        env["TICKET_SNAPSHOT_DIR"] = snapshot
+    command = [sys.executable, "-m", "tests.benchmarks.bench_startup", "--child"]
+    if args.no_network and snapshot:
+        command.append("--no-network")
+
+    project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run(command, cwd=project_root, env=env, capture_output=True, text=True)
+        if output.returncode != 0:
+            raise RuntimeError(f"Startup run failed:\n{output.stderr}")
+        results.append(json.loads(output.stdout.strip().splitlines()[-1]))
+
+    def stat(key):
+        values = [result[key] for result in results]
+        return {"median": round(median(values), 3), "max": max(values)}
+
+    return {
+        "snapshot": snapshot,
+        "runs": args.runs,
+        "import_s": stat("import_s"),
+        "load_s": stat("load_s"),
+        "first_ticket_s": stat("first_ticket_s"),
+        "total_s": stat("total_s"),
+        "models_s": results[-1]["models_s"],
+        "status": results[-1]["status"],
+        "error": results[-1]["error"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--snapshot", help="Snapshot directory to compare against loading from the source")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--no-network", action="store_true",
+                        help="Fail snapshot runs that open a network connection")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args)
+        return
+
+    report = [run(None, args)]
+    if args.snapshot:
+        report.append(run(args.snapshot, args))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Template render throughput before and after the compiled template registry.
+
+    python -m tests.benchmarks.bench_templates --renders 2000
+"""
+import argparse
+import json
+import time
+from importlib.util import spec_from_file_location, module_from_spec
+
+from jinja2 import Template
+
+from src.utils.template_registry import TemplateRegistry, compile_template, DEFAULT_TEMPLATES_PATH
+
+VARIABLES = {
+    "name": "John Smith",
+    "priority": "high",
+    "key_points": "admin dashboard, 403 error, payroll",
+    "expertise": "security",
+    "issue_type": "access",
+    "eta": "Within 2 to 3 days.",
+    "feedback_channel": "email"
+}
+
+
+def render_uncached(key):
+    """Previous behaviour: exec templates.py and compile the template per ticket"""
+    spec = spec_from_file_location("templates", DEFAULT_TEMPLATES_PATH)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return Template(module.RESPONSE_TEMPLATES[key]).render(**VARIABLES)
+
+
+def render_cached(registry, key):
+    """Registry lookup and the shared compiled template"""
+    return compile_template(registry.templates[key]).render(**VARIABLES)
+
+
+def throughput(render, renders):
+    start = time.perf_counter()
+    for _ in range(renders):
+        render()
+    return renders / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=2000)
+    parser.add_argument("--template", default="access")
+    args = parser.parse_args()
+
+    registry = TemplateRegistry()
+    assert render_uncached(args.template) == render_cached(registry, args.template)
+
+    before = throughput(lambda: render_uncached(args.template), args.renders)
+    after = throughput(lambda: render_cached(registry, args.template), args.renders)
+    print(json.dumps({
+        "template": args.template,
+        "renders": args.renders,
+        "before_renders_per_s": round(before, 1),
+        "after_renders_per_s": round(after, 1),
+        "speedup": round(after / before, 1)
+    }))
+
+
+if __name__ == "__main__":
+    main()
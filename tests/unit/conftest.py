@@ -0,0 +1,20 @@
+import pytest
+from src.utils import model_registry
+from tests.unit.helpers import StubNlp
+
+@pytest.fixture
+def stub_nlp(monkeypatch):
+    nlp = StubNlp()
+    monkeypatch.setitem(model_registry._models, "spacy_nlp", nlp)
+    return nlp
+
+@pytest.fixture
+def closing():
+    """Registers stores to close when the test ends"""
+    opened = []
+    def register(store):
+        opened.append(store)
+        return store
+    yield register
+    for store in opened:
+        store.close()
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+from src.agents.TicketProcessor import TicketProcessor
+from src.models import (
+    SupportTicket, TicketAnalysis, TicketCategory, TicketResolution, Priority, ResponseSuggestion
+)
+
+def make_ticket(ticket_id="TKT-001", subject="Login problems", content="Cant login", **customer_info):
+    return SupportTicket(id=ticket_id, subject=subject, content=content, customer_info=customer_info)
+
+def make_analysis(category=TicketCategory.ACCESS, priority=Priority.LOW, key_points=("login",),
+                  required_expertise=("iam",), suggested_response_type=None):
+    return TicketAnalysis(
+        category=category,
+        priority=priority,
+        key_points=list(key_points),
+        required_expertise=list(required_expertise),
+        suggested_response_type=suggested_response_type or category.value
+    )
+
+def make_resolution(ticket_id, status="completed", response_text="done", analysis=None):
+    return TicketResolution(
+        ticket_id=ticket_id,
+        response_text=response_text,
+        status=status,
+        error=None,
+        analysis=analysis,
+        response=None,
+        context_snapshot={}
+    )
+
+# processor stand-in, "slow" tickets take longer than the rest and "boom" raises
+class SlowProcessor:
+    async def process_ticket(self, ticket):
+        await asyncio.sleep(0.2 if ticket.subject == "slow" else 0.05)
+        if ticket.subject == "boom":
+            raise RuntimeError("processor crashed")
+        return make_resolution(ticket.id, response_text=f"re: {ticket.subject}")
+
+# analysis stand-in that tracks how many tickets it handles at once
+class StubAnalysisAgent:
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+
+    async def analyze_ticket(self, ticket_content, customer_history=None, ticket_context=None):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if "explode" in ticket_content:
+            raise RuntimeError("classifier failed")
+        return make_analysis()
+
+    def analyze_rules_only(self, ticket_content, customer_history=None, ticket_context=None):
+        return make_analysis(TicketCategory.TECHNICAL, key_points=(), required_expertise=("support",))
+
+class StubResponseAgent:
+    async def generate_response(self, ticket_analysis, response_templates, context):
+        await asyncio.sleep(0.01)
+        return ResponseSuggestion(
+            response_text=f"Hello {context['customer_info']['customer_id']}",
+            confidence_score=0.9,
+            requires_approval=False,
+            suggested_actions=[]
+        )
+
+    def template_response(self, ticket_analysis, response_templates, context):
+        return ResponseSuggestion(
+            response_text=f"Template {context['customer_info']['customer_id']}",
+            confidence_score=0.7,
+            requires_approval=False,
+            suggested_actions=[]
+        )
+
+# spaCy stand-in that finds "Jane Doe" and counts how it was called
+class StubNlp:
+    def __init__(self):
+        self.pipe_calls = []
+
+    def pipe(self, texts, batch_size=None):
+        texts = list(texts)
+        self.pipe_calls.append(len(texts))
+        for text in texts:
+            ents = [SimpleNamespace(text="Jane Doe", label_="PERSON")] if "Jane Doe" in text else []
+            yield SimpleNamespace(ents=ents)
+
+def make_processor(preload=(), **kwargs):
+    """TicketProcessor with the stub agents, no models are loaded up front unless listed"""
+    processor = TicketProcessor(preload=list(preload), **kwargs)
+    processor.analysis_agent = StubAnalysisAgent()
+    processor.response_agent = StubResponseAgent()
+    return processor
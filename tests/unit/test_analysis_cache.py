@@ -0,0 +1,117 @@
+import asyncio
+from src.agents.TicketAnalysisAgent import TicketAnalysisAgent, ClassifierBackend
+from src.models import TicketCategory, Priority
+from src.utils.analysis_cache import AnalysisCache
+
+# backend that counts how many texts reach the model
+class CountingBackend(ClassifierBackend):
+    name = "counting"
+    model_id = "v1"
+
+    def __init__(self):
+        self.classified = 0
+
+    def classify(self, texts):
+        self.classified += len(texts)
+        return [self._rank({"access": 0.9, "technical": 0.1}) for _ in texts]
+
+def make_agent(cache=None):
+    agent = TicketAnalysisAgent(classifier=CountingBackend(), cache=cache or AnalysisCache(max_entries=10))
+    agent.key_point_calls = 0
+    def fake_key_points(text):
+        agent.key_point_calls += 1
+        return ["admin dashboard"]
+    agent._extract_key_points = fake_key_points
+    return agent
+
+def test_resubmitted_ticket_skips_model():
+    # arrange
+    agent = make_agent()
+    # act
+    first = asyncio.run(agent.analyze_ticket("Cannot access the admin dashboard ASAP"))
+    second = asyncio.run(agent.analyze_ticket("cannot   access the admin\ndashboard asap"))
+    # assert
+    assert agent.classifier.classified == 1
+    assert agent.key_point_calls == 1
+    assert second == first
+    assert agent.cache.stats()["hits"] == 1
+
+def test_priority_is_recomputed_on_hit():
+    # arrange
+    agent = make_agent()
+    first = asyncio.run(agent.analyze_ticket("cannot access the dashboard asap"))
+    agent.rules.urgency_weight = 2.0
+    # act
+    result = asyncio.run(agent.analyze_ticket("cannot access the dashboard asap"))
+    # assert
+    assert agent.classifier.classified == 1
+    assert first.priority == Priority.MEDIUM
+    assert result.priority == Priority.HIGH
+
+def test_batch_only_classifies_misses():
+    # arrange
+    agent = make_agent()
+    asyncio.run(agent.analyze_ticket("login broken"))
+    # act
+    results = asyncio.run(agent.analyze_tickets(["login broken", "invoice wrong", "invoice wrong"]))
+    # assert
+    assert agent.classifier.classified == 3
+    assert [r.category for r in results] == [TicketCategory.ACCESS] * 3
+    assert results[0].classifier_scores == {"access": 0.9, "technical": 0.1}
+
+def test_model_change_invalidates_entries():
+    # arrange
+    cache = AnalysisCache(max_entries=10)
+    agent = make_agent(cache)
+    asyncio.run(agent.analyze_ticket("login broken"))
+    # act
+    agent.classifier.model_id = "v2"
+    asyncio.run(agent.analyze_ticket("login broken"))
+    # assert
+    assert agent.classifier.classified == 2
+
+def test_lru_eviction():
+    # arrange
+    cache = AnalysisCache(max_entries=2)
+    # act
+    for key in ["a", "b", "c"]:
+        cache.put(key, {"category": "access"})
+    # assert
+    assert cache.get("a") is None
+    assert cache.get("c") == {"category": "access"}
+    assert cache.stats()["evictions"] == 1
+
+def test_disk_backend_survives_restart(tmp_path):
+    # arrange
+    path = str(tmp_path / "cache.db")
+    cache = AnalysisCache(path=path)
+    cache.put("key", {"category": "billing", "scores": {}, "key_points": []})
+    cache.close()
+    # act
+    reopened = AnalysisCache(path=path)
+    # assert
+    assert reopened.get("key")["category"] == "billing"
+    assert reopened.stats()["disk_hits"] == 1
+    reopened.close()
+
+def test_hits_and_misses_reach_the_metrics_registry(monkeypatch, tmp_path):
+    # arrange
+    import importlib
+    from src.utils.metrics import MetricsRegistry
+    metrics = MetricsRegistry()
+    monkeypatch.setattr(importlib.import_module("src.utils.analysis_cache"), "registry", metrics)
+    path = str(tmp_path / "cache.db")
+    cache = AnalysisCache(max_entries=1, path=path)
+    # act
+    cache.get("a")
+    cache.put("a", {"category": "access"})
+    cache.put("b", {"category": "billing"})
+    cache.get("b")
+    cache.get("a")
+    # assert
+    assert metrics.counter("ticket_analysis_cache_misses_total") == 1
+    assert metrics.counter("ticket_analysis_cache_hits_total", layer="memory") == 1
+    assert metrics.counter("ticket_analysis_cache_hits_total", layer="disk") == 1
+    assert metrics.counter("ticket_analysis_cache_evictions_total") >= 1
+    assert 'ticket_analysis_cache_hits_total{layer="disk"} 1' in metrics.render_prometheus()
+    cache.close()
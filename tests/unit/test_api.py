@@ -0,0 +1,87 @@
+import asyncio
+import itertools
+import json
+import socket
+import time
+import pytest
+from src.agents.TicketProcessor import TicketRunner
+from tests.unit.helpers import SlowProcessor
+
+aiohttp = pytest.importorskip("aiohttp")
+from web.api import start_api
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+@pytest.fixture
+def api():
+    runner = TicketRunner(processor=SlowProcessor(), max_pending=3)
+    counter = itertools.count(1)
+    port = free_port()
+    start_api(runner, lambda: f"API-{next(counter)}", host="127.0.0.1", port=port)
+    yield runner, f"http://127.0.0.1:{port}"
+    runner.shutdown(timeout=5)
+
+def request(method, url, body=None):
+    """(status, headers, parsed body or NDJSON lines) of one request"""
+    async def send():
+        async with aiohttp.ClientSession() as session:
+            async with session.request(method, url, json=body) as response:
+                text = await response.text()
+                if response.content_type == "application/x-ndjson":
+                    return response.status, response.headers, [json.loads(l) for l in text.splitlines()]
+                return response.status, response.headers, json.loads(text)
+    return asyncio.run(send())
+
+def test_single_ticket_is_accepted_and_looked_up(api):
+    # arrange
+    _, url = api
+    # act
+    status, _, body = request("POST", f"{url}/api/tickets", {"subject": "Login", "content": "Cant login"})
+    # assert
+    assert status == 202
+    assert body == {"ticket_id": "API-1", "status": "pending", "status_url": "/api/tickets/API-1"}
+    for _ in range(100):
+        status, _, result = request("GET", f"{url}{body['status_url']}")
+        if result["status"] != "pending":
+            break
+        time.sleep(0.01)
+    assert status == 200 and result["response_text"] == "re: Login"
+
+def test_bulk_stream_returns_results_in_completion_order(api):
+    # arrange
+    _, url = api
+    tickets = [
+        {"id": "B-1", "subject": "slow", "content": "x"},
+        {"id": "B-2", "subject": "fast", "content": "x"}
+    ]
+    # act
+    status, headers, lines = request("POST", f"{url}/api/tickets/stream", tickets)
+    # assert
+    assert status == 200
+    assert [line["ticket_id"] for line in lines] == ["B-2", "B-1"]
+    assert all(line["status"] == "completed" for line in lines)
+
+def test_full_queue_returns_429_with_retry_after(api):
+    # arrange
+    _, url = api
+    tickets = [{"subject": "slow", "content": "x"} for _ in range(3)]
+    request("POST", f"{url}/api/tickets", tickets)
+    # act
+    status, headers, body = request("POST", f"{url}/api/tickets", {"subject": "more", "content": "x"})
+    # assert
+    assert status == 429
+    assert int(headers["Retry-After"]) >= 1
+    assert "pending" in body["error"]
+
+def test_invalid_tickets_are_rejected(api):
+    # arrange
+    _, url = api
+    # act
+    missing = request("POST", f"{url}/api/tickets", [{"subject": "no content"}])
+    unknown = request("GET", f"{url}/api/tickets/nope")
+    # assert
+    assert missing[0] == 400 and missing[2]["error"].startswith("Ticket 0:")
+    assert unknown[0] == 404
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from src.utils.batching import MicroBatcher
+
+# batch function that records the size of every batch it runs
+def make_recorder():
+    batches = []
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+    return batches, batch_fn
+
+def test_concurrent_requests_share_a_batch():
+    # arrange
+    batches, batch_fn = make_recorder()
+    batcher = MicroBatcher(batch_fn, max_batch_size=8, max_wait_ms=20)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+    # act
+    result = asyncio.run(run())
+    # assert
+    assert result == [0, 2, 4, 6, 8]
+    assert batches == [[0, 1, 2, 3, 4]]
+
+def test_full_batch_runs_without_waiting():
+    # arrange
+    batches, batch_fn = make_recorder()
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=10_000)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(4))),
+            timeout=5
+        )
+
+    # act
+    result = asyncio.run(run())
+    # assert
+    assert result == [0, 2, 4, 6]
+    assert batches == [[0, 1], [2, 3]]
+
+def test_batch_errors_reach_every_caller():
+    # arrange
+    def failing_batch(items):
+        raise RuntimeError("model unavailable")
+    batcher = MicroBatcher(failing_batch, max_batch_size=4, max_wait_ms=1)
+
+    async def run():
+        return await asyncio.gather(
+            *(batcher.submit(i) for i in range(3)),
+            return_exceptions=True
+        )
+
+    # act
+    result = asyncio.run(run())
+    # assert
+    assert all(isinstance(r, RuntimeError) for r in result)
+
+def test_batcher_survives_a_new_event_loop():
+    # arrange
+    batches, batch_fn = make_recorder()
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=1)
+    # act
+    first = asyncio.run(batcher.submit(1))
+    second = asyncio.run(batcher.submit(2))
+    # assert
+    assert (first, second) == (2, 4)
+
+def test_invalid_batch_size():
+    with pytest.raises(ValueError):
+        MicroBatcher(lambda items: items, max_batch_size=0)
@@ -0,0 +1,192 @@
+import os
+import pytest
+from src.agents.TicketAnalysisAgent import TicketAnalysisAgent, ClassifierBackend, create_backend
+from src.models import TicketCategory
+
+# backend returning fixed scores so no model is needed
+class StubBackend(ClassifierBackend):
+    name = "stub"
+
+    def __init__(self, scores):
+        self.scores = scores
+
+    def classify(self, texts):
+        return [self._rank(self.scores) for _ in texts]
+
+def test_confident_backend_decides_category():
+    # arrange
+    agent = TicketAnalysisAgent(classifier=StubBackend({"billing": 0.9, "technical": 0.1}))
+    # act
+    result = agent._classify_ticket("i can't login to my account")
+    # assert
+    assert result == TicketCategory.BILLING
+
+def test_uncertain_backend_falls_back_to_keywords():
+    # arrange
+    agent = TicketAnalysisAgent(classifier=StubBackend({"billing": 0.5, "access": 0.5}))
+    # act
+    result = agent._classify_tickets(["i can't login to my account", "the app crashes"])
+    # assert
+    assert result == [TicketCategory.ACCESS, TicketCategory.TECHNICAL]
+
+def test_rank_orders_scores():
+    # act
+    result = ClassifierBackend._rank({"access": 0.2, "billing": 0.7, "feature": 0.1})
+    # assert
+    assert result == {"labels": ["billing", "access", "feature"], "scores": [0.7, 0.2, 0.1]}
+
+def test_distilbert_input_is_cleaned_without_field_markup():
+    # arrange
+    from src.agents.TicketAnalysisAgent import DistilBertBackend, format_ticket_text
+    text = format_ticket_text("admin", "Cannot access dashboard!", "It says 403.")
+    # act
+    cleaned = DistilBertBackend._clean(text)
+    # assert
+    # markup tokens are neither kept nor glued to the neighbouring words
+    assert cleaned == "admin cannot access dashboard it says 403"
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        create_backend("does_not_exist")
+
+def test_missing_onnx_artifact_falls_back(monkeypatch, tmp_path):
+    # arrange
+    from src.agents.TicketAnalysisAgent import classifiers
+    from src.config.settings import CLASSIFIER_CONFIG
+    monkeypatch.setitem(CLASSIFIER_CONFIG, "onnx", dict(CLASSIFIER_CONFIG["onnx"], model_path=str(tmp_path)))
+    monkeypatch.setitem(classifiers.BACKENDS, "zero_shot", lambda **options: StubBackend({"access": 1.0}))
+    # act
+    backend = create_backend("onnx")
+    # assert
+    assert classifiers.resolve_backend("onnx") == "zero_shot"
+    assert classifiers.backend_version("onnx").startswith("zero_shot:")
+    assert isinstance(backend, StubBackend)
+
+def test_missing_distilbert_model_falls_back(monkeypatch, tmp_path):
+    # arrange
+    from src.agents.TicketAnalysisAgent import classifiers
+    from src.config.settings import CLASSIFIER_CONFIG
+    monkeypatch.setitem(CLASSIFIER_CONFIG, "distilbert",
+                        dict(CLASSIFIER_CONFIG["distilbert"], model_path=str(tmp_path / "ticket_classifier")))
+    monkeypatch.setitem(classifiers.BACKENDS, "zero_shot", lambda **options: StubBackend({"access": 1.0}))
+    # act
+    backend = create_backend("distilbert")
+    # assert
+    assert classifiers.resolve_backend("distilbert") == "zero_shot"
+    assert isinstance(backend, StubBackend)
+
+def test_parity_check_reports_disagreements():
+    # arrange
+    from src.agents.TicketAnalysisAgent.export import parity_check
+    reference = StubBackend({"billing": 0.8, "access": 0.2})
+    candidate = StubBackend({"billing": 0.75, "access": 0.25})
+    flipped = StubBackend({"billing": 0.4, "access": 0.6})
+    # act
+    same = parity_check(reference, candidate, ["a", "b"])
+    different = parity_check(reference, flipped, ["a", "b"])
+    # assert
+    assert same["agreement"] == 1.0 and same["max_score_diff"] == 0.05
+    assert different["agreement"] == 0.0 and different["mismatches"] == [0, 1]
+
+def test_rules_backend_confidence_grows_with_agreeing_terms():
+    # arrange
+    from src.agents.TicketAnalysisAgent import RulesBackend
+    backend = RulesBackend()
+    # act
+    one, two, mixed, none = backend.classify([
+        "my invoice is wrong",
+        "my invoice shows a double charge",
+        "my invoice page shows an error",
+        "hello there"
+    ])
+    # assert
+    assert (one["labels"][0], one["scores"][0]) == ("billing", 0.5)
+    assert (two["labels"][0], two["scores"][0]) == ("billing", 0.75)
+    assert mixed["scores"][0] == 0.25
+    assert none["scores"][0] == 0.0
+
+def test_cascade_escalates_only_uncertain_texts(monkeypatch):
+    # arrange
+    import importlib
+    from src.agents.TicketAnalysisAgent import CascadeBackend, RulesBackend
+    from src.utils.metrics import MetricsRegistry
+    metrics = MetricsRegistry()
+    monkeypatch.setattr(importlib.import_module("src.agents.TicketAnalysisAgent.classifiers"), "registry", metrics)
+    calls = []
+    class ModelBackend(StubBackend):
+        def classify(self, texts):
+            calls.append(list(texts))
+            return super().classify(texts)
+    cascade = CascadeBackend([RulesBackend(), ModelBackend({"technical": 0.9})], {"rules": 0.75})
+    # act
+    results = cascade.classify(["double charge on my invoice", "it does not work", "login password reset"])
+    # assert
+    assert calls == [["it does not work"]]
+    assert [r["labels"][0] for r in results] == ["billing", "technical", "access"]
+    assert [r["tier"] for r in results] == ["rules", "stub", "rules"]
+    assert cascade.stats()["tiers"]["rules"] == {"answered": 2, "hit_rate": 2 / 3}
+    assert metrics.counter("ticket_classifier_tier_total", tier="stub") == 1
+
+def test_cascade_skips_untrained_tiers(monkeypatch, tmp_path):
+    # arrange
+    from src.agents.TicketAnalysisAgent import classifiers
+    from src.config.settings import CLASSIFIER_CONFIG
+    monkeypatch.setitem(CLASSIFIER_CONFIG, "tfidf", {"model_path": str(tmp_path / "missing.joblib")})
+    monkeypatch.setitem(CLASSIFIER_CONFIG, "cascade", {"tiers": ["rules", "tfidf", "zero_shot"], "thresholds": {"rules": 0.75}})
+    monkeypatch.setitem(classifiers.BACKENDS, "zero_shot", lambda **options: StubBackend({"access": 1.0}))
+    # act
+    backend = create_backend("cascade")
+    # assert
+    assert [tier.name for tier in backend.tiers] == ["rules", "stub"]
+    assert classifiers.backend_version("cascade").startswith("cascade:rules:@0.75>zero_shot:")
+
+def test_trained_tfidf_tier_classifies(tmp_path):
+    # arrange
+    pytest.importorskip("sklearn")
+    from src.agents.TicketAnalysisAgent import TfidfBackend
+    from src.agents.TicketAnalysisAgent import classifiers
+    from src.agents.TicketAnalysisAgent.training import train_tfidf
+    path = str(tmp_path / "tfidf.joblib")
+    calibration_path = str(tmp_path / "calibration.json")
+    # act
+    report = train_tfidf(path, limit=400, calibration_path=calibration_path)
+    results = TfidfBackend(path).classify(["<|subject|> refund <|subject|> i want my money back"])
+    # assert
+    assert report["examples"] == 400 and report["holdout"] == 80
+    assert 0.0 <= report["tfidf"]["coverage"] <= 1.0
+    assert report["rules"]["calibrated"]
+    assert set(classifiers.load_calibration(calibration_path)) == {"tfidf", "rules"}
+    assert set(results[0]["labels"]) == {category.value for category in TicketCategory}
+    assert abs(sum(results[0]["scores"]) - 1.0) < 1e-6
+
+def test_calibration_maps_scores_to_held_out_accuracy():
+    # arrange
+    pytest.importorskip("sklearn")
+    from src.agents.TicketAnalysisAgent import TierCalibration
+    # low scores right a quarter of the time, high scores always, one lucky outlier on top
+    scores = [0.2] * 40 + [0.9] * 40 + [0.99]
+    correct = [i % 4 == 0 for i in range(40)] + [True] * 40 + [False]
+    # act
+    calibration = TierCalibration.fit(scores, correct, min_bin=20)
+    # assert
+    assert calibration(0.2) == pytest.approx(0.25)
+    assert calibration(0.0) == pytest.approx(0.25)
+    assert 0.9 < calibration(1.0) < 1.0
+    assert calibration(0.5) <= calibration(0.8)
+
+def test_calibrated_cascade_escalates_inaccurate_tiers(tmp_path):
+    # arrange
+    from src.agents.TicketAnalysisAgent import CascadeBackend, RulesBackend, TierCalibration
+    from src.agents.TicketAnalysisAgent.classifiers import save_calibration
+    path = str(tmp_path / "calibration.json")
+    # the rules' confident answers were right a fifth of the time
+    save_calibration(path, {"rules": TierCalibration([0.0, 1.0], [0.2, 0.2])})
+    texts = ["double charge on my invoice", "login password reset"]
+    # act
+    raw = CascadeBackend([RulesBackend(), StubBackend({"technical": 0.9})], {"rules": 0.75}).classify(texts)
+    calibrated = CascadeBackend([RulesBackend(), StubBackend({"technical": 0.9})], {"rules": 0.75}, path)
+    results = calibrated.classify(texts)
+    # assert
+    assert [r["tier"] for r in raw] == ["rules", "rules"]
+    assert [r["tier"] for r in results] == ["stub", "stub"]
+    assert calibrated.model_id.endswith("#" + path + "@" + str(int(os.path.getmtime(path))))
@@ -0,0 +1,17 @@
+from src.utils.datasets import iter_archive_rows, iter_archive_tickets
+
+def test_archive_streams_without_extracting():
+    # act
+    tickets = list(iter_archive_tickets(limit=5))
+    # assert
+    assert len(tickets) == 5
+    assert tickets[0].id == "ARC-1"
+    assert "{product_purchased}" not in tickets[0].content
+    assert tickets[0].customer_info["product"] in tickets[0].content
+
+def test_archive_rows_keep_dataset_labels():
+    # act
+    row = next(iter_archive_rows(limit=1))
+    # assert
+    assert row["Ticket Type"] == "Technical issue"
+    assert row["Ticket Priority"] == "Critical"
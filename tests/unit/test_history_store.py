@@ -0,0 +1,75 @@
+import time
+import pytest
+from src.utils.history_store import InMemoryHistoryStore, SQLiteHistoryStore
+
+# what TicketProcessor appends per ticket
+def entry(ticket_id, timestamp=None):
+    return {"timestamp": timestamp or time.time(), "ticket_id": ticket_id, "subject": f"subject {ticket_id}"}
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path, closing):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return closing(InMemoryHistoryStore(**kwargs))
+        kwargs.pop("max_customers", None)
+        return closing(SQLiteHistoryStore(str(tmp_path / "history.db"), **kwargs))
+    return factory
+
+def test_keeps_last_n_entries_per_customer(make_store):
+    # arrange
+    store = make_store(max_entries=3)
+    # act
+    for i in range(5):
+        store.append("C1", entry(f"TKT-{i}", timestamp=1_000_000_000 + i))
+    # assert
+    assert [e["ticket_id"] for e in store.get("C1")] == ["TKT-2", "TKT-3", "TKT-4"]
+    assert [e["ticket_id"] for e in store.get("C1", limit=2)] == ["TKT-3", "TKT-4"]
+
+def test_expired_entries_are_dropped(make_store):
+    # arrange
+    store = make_store(max_entries=5, ttl_seconds=60)
+    # act
+    store.append("C1", entry("old", timestamp=time.time() - 120))
+    store.append("C1", entry("new"))
+    # assert
+    assert [e["ticket_id"] for e in store.get("C1")] == ["new"]
+
+def test_snapshot_is_not_affected_by_later_appends(make_store):
+    # arrange
+    store = make_store(max_entries=5)
+    store.append("C1", entry("TKT-1"))
+    version = store.version
+    # act
+    snapshot = store.snapshot("C1")
+    store.append("C1", entry("TKT-2"))
+    # assert
+    assert [e["ticket_id"] for e in snapshot] == ["TKT-1"]
+    assert isinstance(snapshot, tuple)
+    assert store.version > version
+
+def test_unknown_customer(make_store):
+    assert make_store().get("nobody") == []
+
+def test_memory_store_evicts_least_recent_customer():
+    # arrange
+    store = InMemoryHistoryStore(max_entries=2, max_customers=2)
+    # act
+    store.append("C1", entry("a"))
+    store.append("C2", entry("b"))
+    store.append("C1", entry("c"))
+    store.append("C3", entry("d"))
+    # assert
+    assert store.get("C2") == []
+    assert [e["ticket_id"] for e in store.get("C1")] == ["a", "c"]
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    # arrange
+    path = str(tmp_path / "shared.db")
+    writer = SQLiteHistoryStore(path)
+    reader = SQLiteHistoryStore(path)
+    # act
+    writer.append("C1", entry("TKT-1"))
+    # assert
+    assert [e["ticket_id"] for e in reader.get("C1")] == ["TKT-1"]
+    writer.close()
+    reader.close()
@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# libraries that must only be imported once a model is actually used
+HEAVY_MODULES = ["torch", "transformers", "tensorflow", "spacy", "yake", "textblob", "textstat", "nltk"]
+
+# run code in a fresh interpreter and report its duration and heavy imports
+def run_in_subprocess(code):
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=project_root,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+def test_import_models_is_cheap():
+    # act
+    result = run_in_subprocess("import src.models")
+    # assert
+    assert result["heavy"] == []
+    assert result["elapsed"] < 2.0, f"Importing src.models took {result['elapsed']:.2f}s"
+
+def test_import_agents_does_not_load_models():
+    # act
+    result = run_in_subprocess("import src.agents\nimport src.agents.TicketProcessor")
+    # assert
+    assert result["heavy"] == [], f"Heavy modules imported at import time: {result['heavy']}"
+    assert result["elapsed"] < 2.0, f"Importing src.agents took {result['elapsed']:.2f}s"
+
+def test_agents_build_without_loading_models():
+    # act
+    result = run_in_subprocess(
+        "from src.agents import TicketAnalysisAgent, ResponseAgent, TicketProcessor\n"
+        "TicketAnalysisAgent(); ResponseAgent(); TicketProcessor()"
+    )
+    # assert
+    assert result["heavy"] == [], f"Constructing agents imported: {result['heavy']}"
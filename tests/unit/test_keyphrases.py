@@ -0,0 +1,92 @@
+import pytest
+from src.agents.TicketAnalysisAgent import KeyPhraseEngine, StatisticalExtractor, YakeExtractor
+from src.agents.TicketAnalysisAgent.keyphrases import EXTRACTORS
+from src.config.settings import KEYPHRASE_CONFIG
+from src.utils import model_registry
+
+# yake stand-in, lower scores are more relevant like the real extractor
+class StubYake:
+    def __init__(self):
+        self.calls = 0
+
+    def extract_keywords(self, text):
+        self.calls += 1
+        return [("login", 0.3), ("password reset", 0.01), ("the", 0.9), ("account", 0.1)]
+
+@pytest.fixture
+def yake(monkeypatch):
+    stub = StubYake()
+    monkeypatch.setitem(model_registry._models, "keyword_extractor", stub)
+    return stub
+
+def test_most_relevant_yake_phrases_come_first(yake):
+    # arrange
+    engine = KeyPhraseEngine(YakeExtractor(), top_k=3)
+    # act
+    key_points = engine.extract("cannot reset my password")
+    # assert
+    assert key_points == ["password reset", "account", "login"]
+
+def test_results_are_cached_by_content(yake):
+    # arrange
+    engine = KeyPhraseEngine(YakeExtractor())
+    # act
+    first = engine.extract("cannot reset my password")
+    first.append("mutated")
+    second = engine.extract("cannot reset my password")
+    engine.extract("another ticket")
+    # assert
+    assert "mutated" not in second
+    assert yake.calls == 2
+    assert (engine.hits, engine.misses) == (1, 2)
+
+def test_batch_extracts_each_distinct_text_once(yake):
+    # arrange
+    engine = KeyPhraseEngine(YakeExtractor(), cache_size=0)
+    # act
+    results = engine.extract_batch(["a", "b", "a"])
+    # assert
+    assert yake.calls == 2
+    assert results[0] == results[2] == results[1]
+
+def test_cache_is_bounded(yake):
+    # arrange
+    engine = KeyPhraseEngine(YakeExtractor(), cache_size=2)
+    # act
+    engine.extract_batch(["a", "b", "c"])
+    engine.extract("a")
+    # assert
+    assert yake.calls == 4
+
+def test_statistical_extractor_ranks_repeated_phrases():
+    # arrange
+    engine = KeyPhraseEngine(StatisticalExtractor(max_ngram=3), top_k=3)
+    text = (
+        "<|subject|> payment page crashes <|subject|><|content|> the payment page crashes "
+        "when i pay the invoice. please fix the payment page. <|content|>"
+    )
+    # act
+    key_points = engine.extract(text)
+    # assert
+    assert key_points[0] == "payment page crashes"
+    assert not any("<|" in phrase or "subject" in phrase for phrase in key_points)
+    assert len(key_points) == 3
+
+def test_long_runs_are_split_into_ngrams():
+    # act
+    phrases = [phrase for phrase, _ in StatisticalExtractor(max_ngram=2).scored("payment page crashes daily")]
+    # assert
+    assert phrases == ["payment page", "crashes daily"]
+
+def test_extractor_is_selected_by_config(monkeypatch):
+    # arrange
+    monkeypatch.setitem(KEYPHRASE_CONFIG, "extractor", "statistical")
+    # act
+    engine = KeyPhraseEngine.from_config()
+    # assert
+    assert isinstance(engine.extractor, StatisticalExtractor)
+    assert engine.version.startswith("statistical:")
+    monkeypatch.setitem(KEYPHRASE_CONFIG, "extractor", "missing")
+    with pytest.raises(ValueError):
+        KeyPhraseEngine.from_config()
+    assert set(EXTRACTORS) == {"yake", "statistical"}
@@ -0,0 +1,74 @@
+import asyncio
+from src.utils.metrics import MetricsRegistry, collect_timings, percentile, record_timing, span
+
+def test_percentile_nearest_rank():
+    # arrange
+    values = [5, 1, 4, 2, 3]
+    # act / assert
+    assert percentile(values, 50) == 3
+    assert percentile(values, 99) == 5
+    assert percentile([], 95) == 0.0
+
+def test_spans_follow_the_ticket_across_tasks_and_threads():
+    # arrange
+    async def handle(timings, delay):
+        with collect_timings(timings):
+            with span("classify"):
+                await asyncio.sleep(delay)
+            await asyncio.to_thread(record_timing, "render", delay)
+
+    async def run():
+        first, second = {}, {}
+        await asyncio.gather(handle(first, 0.02), handle(second, 0.0))
+        return first, second
+    # act
+    first, second = asyncio.run(run())
+    # assert
+    assert first["classify"] >= 0.02 > second["classify"]
+    assert first["render"] == 0.02 and second["render"] == 0.0
+
+def test_span_outside_a_ticket_is_a_no_op():
+    # act
+    with span("classify"):
+        pass
+    record_timing("render", 1.0)
+
+def test_prometheus_rendering():
+    # arrange
+    metrics = MetricsRegistry(window=3)
+    metrics.describe("ticket_stage_seconds", "summary", "Stage time")
+    for value in (0.1, 0.2, 0.3, 0.4):
+        metrics.observe("ticket_stage_seconds", value, stage="classify")
+    metrics.increment("tickets_processed_total", status="failed")
+    metrics.increment("tickets_processed_total", 2, status='com"pleted')
+    # act
+    text = metrics.render_prometheus()
+    # assert
+    assert "# HELP ticket_stage_seconds Stage time\n# TYPE ticket_stage_seconds summary" in text
+    # quantiles over the last `window` samples, sum and count over all of them
+    assert 'ticket_stage_seconds{stage="classify",quantile="0.5"} 0.3' in text
+    assert 'ticket_stage_seconds_count{stage="classify"} 4' in text
+    assert "# TYPE tickets_processed_total counter" in text
+    assert 'tickets_processed_total{status="com\\"pleted"} 2' in text
+    assert metrics.quantiles("ticket_stage_seconds", stage="classify")["p99"] == 0.4
+
+def test_worker_deltas_merge_into_the_parent():
+    # arrange
+    parent, worker = MetricsRegistry(), MetricsRegistry()
+    worker.increment("ticket_degraded_total", reason="inherited")
+    worker.track_deltas()
+    worker.increment("ticket_degraded_total", reason="inherited")
+    worker.increment("ticket_stage_timeouts_total", stage="analysis")
+    worker.observe("ticket_queue_wait_seconds", 0.5, priority="LOW")
+    # act
+    parent.merge(worker.drain())
+    worker.increment("ticket_stage_timeouts_total", stage="analysis")
+    parent.merge(worker.drain())
+    empty = worker.drain()
+    # assert
+    # only what happened after track_deltas() is shipped, and only once
+    assert parent.counter("ticket_degraded_total", reason="inherited") == 1
+    assert parent.counter("ticket_stage_timeouts_total", stage="analysis") == 2
+    assert parent.quantiles("ticket_queue_wait_seconds", priority="LOW")["p50"] == 0.5
+    assert 'ticket_queue_wait_seconds_count{priority="LOW"} 1' in parent.render_prometheus()
+    assert empty == {"counters": {}, "observations": {}}
@@ -0,0 +1,54 @@
+import threading
+import pytest
+from src.utils import model_registry
+
+def test_model_loads_once_on_first_use():
+    # arrange
+    calls = []
+    model_registry.register_model("test_counter", lambda: calls.append(1) or object(), replace=True)
+    # act
+    first = model_registry.get_model("test_counter")
+    second = model_registry.get_model("test_counter")
+    # assert
+    assert first is second
+    assert len(calls) == 1
+
+def test_concurrent_first_use_loads_once():
+    # arrange
+    calls = []
+    barrier = threading.Barrier(4)
+    def slow_factory():
+        calls.append(1)
+        return object()
+    model_registry.register_model("test_concurrent", slow_factory, replace=True)
+    results = []
+    def worker():
+        barrier.wait()
+        results.append(model_registry.get_model("test_concurrent"))
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    # act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # assert
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
+
+def test_warmup_reports_load_times():
+    # arrange
+    model_registry.register_model("test_warm", lambda: "model", replace=True)
+    # act
+    timings = model_registry.warmup(["test_warm"])
+    # assert
+    assert set(timings) == {"test_warm"}
+    assert model_registry.is_loaded("test_warm")
+
+def test_unknown_model():
+    with pytest.raises(KeyError):
+        model_registry.get_model("not_registered")
+
+def test_duplicate_registration():
+    model_registry.register_model("test_dup", lambda: 1, replace=True)
+    with pytest.raises(ValueError):
+        model_registry.register_model("test_dup", lambda: 2)
@@ -0,0 +1,215 @@
+import asyncio
+import time
+import pytest
+from src.config.settings import NLP_CONFIG
+from src.utils import model_registry
+from tests.unit.helpers import make_processor, make_ticket
+
+pytestmark = pytest.mark.usefixtures("stub_nlp")
+
+def make_tickets(count):
+    return [
+        make_ticket(
+            f"TKT-{i:03d}",
+            content="explode" if i == 3 else "Cant login to account. Jane Doe",
+            customer_id=f"C{i}"
+        )
+        for i in range(count)
+    ]
+
+def test_process_batch_keeps_input_order():
+    # arrange
+    processor = make_processor()
+    tickets = make_tickets(10)
+    # act
+    results = asyncio.run(processor.process_batch(tickets, concurrency=3))
+    # assert
+    assert [r.ticket_id for r in results] == [t.id for t in tickets]
+    assert results[0].response_text == "Hello C0"
+
+def test_process_batch_analyses_urgent_tickets_first():
+    # arrange
+    processor = make_processor()
+    seen = []
+    analyze = processor.analysis_agent.analyze_ticket
+    async def recording_analyze(ticket_content, *args, **kwargs):
+        seen.append(ticket_content)
+        return await analyze(ticket_content, *args, **kwargs)
+    processor.analysis_agent.analyze_ticket = recording_analyze
+    tickets = make_tickets(5)
+    tickets[4].content = "Payroll is down, need this fixed asap"
+    # act
+    results = asyncio.run(processor.process_batch(tickets, concurrency=1))
+    # assert
+    assert "Payroll is down" in seen[0]
+    assert [r.ticket_id for r in results] == [t.id for t in tickets]
+
+def test_process_batch_isolates_failures():
+    # arrange
+    processor = make_processor()
+    # act
+    results = asyncio.run(processor.process_batch(make_tickets(6), concurrency=2))
+    # assert
+    # the failing ticket takes the degraded fast path, the others are untouched
+    assert results[3].status == "completed" and results[3].degraded
+    assert results[3].response_text == "Template C3"
+    assert [r.degraded for i, r in enumerate(results) if i != 3] == [False] * 5
+    assert [r.status for i, r in enumerate(results) if i != 3] == ["completed"] * 5
+
+def test_process_batch_bounds_concurrency():
+    # arrange
+    processor = make_processor()
+    # act
+    asyncio.run(processor.process_batch(make_tickets(12), concurrency=4))
+    # assert
+    assert 1 < processor.analysis_agent.max_active <= 4
+
+def test_process_batch_rejects_invalid_concurrency():
+    with pytest.raises(ValueError):
+        asyncio.run(make_processor().process_batch(make_tickets(1), concurrency=0))
+
+def test_process_batch_parses_contents_in_pipe_batches(stub_nlp, monkeypatch):
+    # arrange
+    monkeypatch.setitem(NLP_CONFIG, "pipe_batch_size", 4)
+    processor = make_processor()
+    # act
+    asyncio.run(processor.process_batch(make_tickets(10), concurrency=2))
+    # assert
+    assert stub_nlp.pipe_calls == [4, 4, 2]
+
+def test_shared_parse_fills_customer_name(stub_nlp):
+    # arrange
+    processor = make_processor()
+    ticket = make_tickets(1)[0]
+    # act
+    ticket_context = processor._build_ticket_contexts([ticket])[0]
+    context = processor._get_response_context(ticket, ticket_context)
+    # assert
+    assert context["customer_info"]["customer_name"] == "Jane Doe"
+    assert ticket_context.analysis_text.startswith("<|role|>")
+    assert stub_nlp.pipe_calls == [1]
+
+def test_history_is_bounded_and_snapshotted():
+    # arrange
+    from src.utils.history_store import InMemoryHistoryStore
+    processor = make_processor()
+    processor.history_store = InMemoryHistoryStore(max_entries=2)
+    tickets = [
+make_ticket(f"TKT-{i}", subject=f"Issue {i}", customer_id="C1")
+        for i in range(4)
+    ]
+    # act
+    results = asyncio.run(processor.process_batch(tickets, concurrency=1))
+    # assert
+    assert [e["ticket_id"] for e in processor.history_store.get("C1")] == ["TKT-2", "TKT-3"]
+    assert [e["ticket_id"] for e in results[2].context_snapshot["customer_history"]["C1"]] == ["TKT-0", "TKT-1"]
+
+def test_resolutions_carry_stage_timings(monkeypatch):
+    # arrange
+    import importlib
+    from src.utils.metrics import MetricsRegistry, span
+    metrics = MetricsRegistry()
+    monkeypatch.setattr(importlib.import_module("src.agents.TicketProcessor.TicketProcessor"), "registry", metrics)
+    processor = make_processor()
+    generate = processor.response_agent.generate_response
+    def render():
+        with span("render"):
+            time.sleep(0.01)
+    async def timed_generate(*args):
+        # spans opened in worker threads still land on the ticket
+        await asyncio.to_thread(render)
+        return await generate(*args)
+    processor.response_agent.generate_response = timed_generate
+    # act
+    results = asyncio.run(processor.process_batch(make_tickets(4), concurrency=2))
+    single = asyncio.run(processor.process_ticket(make_tickets(1)[0]))
+    # assert
+    assert set(results[0].timings) == {"ner", "render"}
+    assert results[0].timings["render"] >= 0.01
+    assert "ner" in results[3].timings and "render" not in results[3].timings
+    assert set(single.timings) == {"ner", "render"}
+    assert metrics.counter("ticket_failures_total") == 0
+    assert metrics.counter("ticket_degraded_total", reason="analysis_failed") == 1
+    assert metrics.counter("tickets_processed_total", status="completed") == 5
+    assert 'ticket_stage_seconds{stage="render",quantile="0.5"}' in metrics.render_prometheus()
+
+# sentence encoder stand-in, bag of words hashed into a small vector
+class StubEncoder:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, batch_size=None, convert_to_numpy=True):
+        import numpy as np
+        self.batches.append(len(texts))
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, sum(map(ord, word)) % 64] += 1
+        return vectors
+
+def make_indexed_processor(monkeypatch):
+    from src.utils.similarity_index import SimilarityIndex
+    encoder = StubEncoder()
+    monkeypatch.setitem(model_registry._models, "sentence_encoder", encoder)
+    return make_processor(similarity_index=SimilarityIndex(capacity=100)), encoder
+
+def test_storm_duplicates_reuse_the_first_analysis(monkeypatch):
+    # arrange
+    processor, encoder = make_indexed_processor(monkeypatch)
+    calls = []
+    analyze = processor.analysis_agent.analyze_ticket
+    async def counting_analyze(*args, **kwargs):
+        calls.append(1)
+        return await analyze(*args, **kwargs)
+    processor.analysis_agent.analyze_ticket = counting_analyze
+    storm = [
+        make_ticket(f"TKT-{i}", subject="Checkout down", content="The checkout page returns error 500",
+                    customer_id="C1" if i < 2 else f"C{i}")
+        for i in range(4)
+    ]
+    # act
+    first = asyncio.run(processor.process_ticket(storm[0]))
+    rest = asyncio.run(processor.process_batch(storm[1:], concurrency=1))
+    # assert
+    assert len(calls) == 1
+    assert [r.duplicate_of for r in rest] == ["TKT-0"] * 3
+    assert all(r.analysis is first.analysis for r in rest)
+    # same customer gets the same response, others get their own
+    assert rest[0].response is first.response
+    assert rest[1].response_text == "Hello C2"
+    assert encoder.batches == [1, 3]
+
+def test_previous_responses_are_the_most_similar(monkeypatch):
+    # arrange
+    processor, _ = make_indexed_processor(monkeypatch)
+    subjects = ["Invoice charged twice", "Password reset email missing", "Refund for double charge"]
+    history = [
+        make_ticket(f"TKT-{i}", subject=subject, content=subject, customer_id="C1")
+        for i, subject in enumerate(subjects)
+    ]
+    asyncio.run(processor.process_batch(history, concurrency=1))
+    ticket = make_ticket("TKT-9", subject="Charged twice", content="My invoice was charged twice", customer_id="C1")
+    ticket_context = processor._build_ticket_contexts([ticket])[0]
+    processor._embed_tickets([ticket], [ticket_context])
+    # act
+    previous = processor._get_previous_responses(ticket, ticket_context)
+    # assert
+    assert previous[0]["ticket_id"] == "TKT-0"
+    assert [p["similarity"] for p in previous] == sorted((p["similarity"] for p in previous), reverse=True)
+    assert len(previous) == 3
+
+def test_quoted_history_is_trimmed_but_signature_names_are_found(stub_nlp):
+    # arrange
+    processor = make_processor()
+    ticket = make_ticket(
+        "TKT-1",
+        content="Still cant login.\n\nRegards,\nJane Doe\n\nOn Monday, Support wrote:\n> Please reset your password",
+        customer_id="C1"
+    )
+    # act
+    ticket_context = processor._build_ticket_contexts([ticket])[0]
+    # assert
+    assert "reset your password" not in ticket_context.analysis_text
+    assert "Jane Doe" not in ticket_context.analysis_text
+    assert ticket_context.person_names == ["Jane Doe"]
+    assert ticket_context.truncation.quoted_lines_removed == 2
@@ -0,0 +1,145 @@
+import asyncio
+import time
+import pytest
+from src.agents.TicketProcessor import CircuitBreaker, StagePolicy, StageTimeout
+from src.utils import model_registry
+from tests.unit.helpers import make_processor, make_ticket
+
+pytestmark = pytest.mark.usefixtures("stub_nlp")
+
+def test_timeout_is_not_retried():
+    # arrange
+    policy = StagePolicy("analysis", timeout=0.05, max_retries=3, backoff=0)
+    calls = []
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(1)
+    # act / assert
+    with pytest.raises(StageTimeout):
+        asyncio.run(policy.run(slow))
+    assert len(calls) == 1
+
+def test_transient_errors_are_retried():
+    # arrange
+    policy = StagePolicy("response", timeout=1, max_retries=2, backoff=0)
+    calls = []
+    async def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise ConnectionError("reset by peer")
+        return "ok"
+    # act
+    result = asyncio.run(policy.run(flaky))
+    # assert
+    assert result == "ok"
+    assert len(calls) == 3
+
+def test_other_errors_and_exhausted_retries_are_raised():
+    # arrange
+    policy = StagePolicy("response", max_retries=1, backoff=0)
+    async def broken():
+        raise ValueError("bad input")
+    async def down():
+        raise ConnectionError("refused")
+    # act / assert
+    with pytest.raises(ValueError):
+        asyncio.run(policy.run(broken))
+    with pytest.raises(ConnectionError):
+        asyncio.run(policy.run(down))
+
+def test_breaker_opens_then_half_opens_after_reset():
+    # arrange
+    breaker = CircuitBreaker("analysis", failure_threshold=2, reset_seconds=0.05)
+    # act
+    breaker.record_failure()
+    still_closed = breaker.state
+    breaker.record_failure()
+    # assert
+    assert still_closed == CircuitBreaker.CLOSED
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow() and breaker.state == CircuitBreaker.HALF_OPEN
+    # a failed trial opens it again, a successful one closes it
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    time.sleep(0.06)
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.consecutive_failures == 0
+
+def test_open_breaker_sends_tickets_down_the_fast_path():
+    # arrange
+    processor = make_processor()
+    processor.breaker = CircuitBreaker(
+        "analysis", failure_threshold=2, reset_seconds=60, system_state=processor.context["system_state"]
+    )
+    tickets = [make_ticket(f"TKT-{i}", subject="Login", content="explode", customer_id=f"C{i}") for i in range(4)]
+    calls = []
+    analyze = processor.analysis_agent.analyze_ticket
+    async def counting_analyze(*args, **kwargs):
+        calls.append(1)
+        return await analyze(*args, **kwargs)
+    processor.analysis_agent.analyze_ticket = counting_analyze
+    # act
+    results = [asyncio.run(processor.process_ticket(ticket)) for ticket in tickets]
+    # assert
+    assert [r.status for r in results] == ["completed"] * 4
+    assert all(r.degraded for r in results)
+    assert results[-1].response_text == "Template C3"
+    # the classifier is skipped once the breaker opens
+    assert len(calls) == 2
+    assert processor.context["system_state"]["circuit"] == CircuitBreaker.OPEN
+    assert processor.context["system_state"]["consecutive_failures"] == 2
+
+def test_slow_response_falls_back_to_the_template():
+    # arrange
+    processor = make_processor()
+    processor.stages["response"] = StagePolicy("response", timeout=0.05)
+    async def slow_generate(*args):
+        await asyncio.sleep(1)
+    processor.response_agent.generate_response = slow_generate
+    ticket = make_ticket("TKT-1", subject="Login", customer_id="C1")
+    # act
+    resolution = asyncio.run(processor.process_ticket(ticket))
+    # assert
+    assert resolution.status == "completed" and resolution.degraded
+    assert resolution.response_text == "Template C1"
+
+def test_failed_ner_only_drops_person_names(monkeypatch):
+    # arrange
+    class BrokenNlp:
+        def pipe(self, texts, batch_size=None):
+            raise OSError("model missing")
+    monkeypatch.setitem(model_registry._models, "spacy_nlp", BrokenNlp())
+    processor = make_processor()
+    tickets = [make_ticket(f"TKT-{i}", subject="Login", customer_id=f"C{i}") for i in range(3)]
+    # act
+    results = asyncio.run(processor.process_batch(tickets, concurrency=2))
+    # assert
+    # the classifier is healthy, so the tickets get the full analysis and response
+    assert [r.status for r in results] == ["completed"] * 3
+    assert not any(r.degraded for r in results)
+    assert [r.response_text for r in results] == ["Hello C0", "Hello C1", "Hello C2"]
+
+def test_first_model_load_happens_before_the_stage_timeouts():
+    # arrange
+    loads = []
+    def slow_load():
+        time.sleep(0.2)
+        loads.append(1)
+        return object()
+    model_registry.register_model("test_slow_classifier", slow_load, replace=True)
+    processor = make_processor(preload=["test_slow_classifier"])
+    processor.stages["analysis"] = StagePolicy("analysis", timeout=0.1)
+    analyze = processor.analysis_agent.analyze_ticket
+    async def loading_analyze(*args, **kwargs):
+        await asyncio.to_thread(model_registry.get_model, "test_slow_classifier")
+        return await analyze(*args, **kwargs)
+    processor.analysis_agent.analyze_ticket = loading_analyze
+    tickets = [make_ticket(f"TKT-{i}", subject="Login", customer_id=f"C{i}") for i in range(4)]
+    # act
+    results = asyncio.run(processor.process_batch(tickets, concurrency=4))
+    # assert
+    assert not any(r.degraded for r in results)
+    assert len(loads) == 1
+    assert processor.breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,102 @@
+import time
+import pytest
+from dataclasses import asdict
+from src.models import Priority, TicketCategory
+from src.utils.resolution_store import InMemoryResolutionStore, SQLiteResolutionStore
+from tests.unit.helpers import make_analysis, make_resolution, make_ticket
+
+# the dicts TicketRunner stores
+def ticket(ticket_id, customer_id="C1"):
+    return asdict(make_ticket(ticket_id, subject=f"subject {ticket_id}", customer_id=customer_id))
+
+def resolution(ticket_id, status="pending", priority=None, category=None):
+    analysis = make_analysis(category, priority) if priority else None
+    return asdict(make_resolution(ticket_id, status, analysis=analysis))
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path, closing):
+    def factory(**kwargs):
+        if request.param == "memory":
+            return closing(InMemoryResolutionStore())
+        return closing(SQLiteResolutionStore(str(tmp_path / "resolutions.db"), **kwargs))
+    return factory
+
+def test_filters_by_status_priority_category_and_customer(make_store):
+    # arrange
+    store = make_store()
+    for i, (status, priority, category, customer) in enumerate([
+        ("needs_approval", Priority.CRITICAL, TicketCategory.TECHNICAL, "C1"),
+        ("needs_approval", Priority.HIGH, TicketCategory.BILLING, "C1"),
+        ("completed", Priority.CRITICAL, TicketCategory.TECHNICAL, "C2"),
+        ("needs_approval", Priority.CRITICAL, TicketCategory.ACCESS, "C2")
+    ]):
+        store.add(ticket(f"TKT-{i}", customer), resolution(f"TKT-{i}"))
+        store.update(resolution(f"TKT-{i}", status, priority, category))
+    # act
+    approvals = store.query(status="needs_approval", priority="critical")
+    # assert
+    assert [r["ticket_id"] for r in approvals] == ["TKT-3", "TKT-0"]
+    assert [r["ticket_id"] for r in store.query(category=TicketCategory.TECHNICAL)] == ["TKT-2", "TKT-0"]
+    assert [r["ticket_id"] for r in store.query(customer_id="C2", priority=Priority.CRITICAL)] == ["TKT-3", "TKT-2"]
+    assert store.count(status="needs_approval") == 3
+
+def test_pagination_and_time_filter(make_store):
+    # arrange
+    store = make_store()
+    for i in range(5):
+        store.add(ticket(f"TKT-{i}"), resolution(f"TKT-{i}"))
+    # act
+    pages = [store.query(limit=2, offset=offset) for offset in (0, 2, 4)]
+    # assert
+    assert [[r["ticket_id"] for r in page] for page in pages] == [["TKT-4", "TKT-3"], ["TKT-2", "TKT-1"], ["TKT-0"]]
+    assert store.count(since=time.time() - 60) == 5
+    assert store.query(since=time.time() + 60) == []
+
+def test_export_streams_tickets_in_submission_order(make_store):
+    # arrange
+    store = make_store()
+    for i in range(3):
+        store.add(ticket(f"TKT-{i}", customer_id=f"C{i % 2}"), resolution(f"TKT-{i}"))
+    # act
+    rows = list(store.export(customer_id="C0"))
+    # assert
+    assert [row["ticket"]["id"] for row in rows] == ["TKT-0", "TKT-2"]
+    assert rows[0]["resolution"]["status"] == "pending"
+
+def test_sqlite_store_survives_restart(tmp_path):
+    # arrange
+    path = str(tmp_path / "resolutions.db")
+    store = SQLiteResolutionStore(path)
+    store.add(ticket("TKT-1"), resolution("TKT-1"))
+    store.update(resolution("TKT-1", "completed", Priority.HIGH, TicketCategory.BILLING))
+    store.close()
+    # act
+    reopened = SQLiteResolutionStore(path)
+    # assert
+    assert reopened.get("TKT-1")["analysis"]["priority"] == "HIGH"
+    assert reopened.get("TKT-1")["analysis"]["category"] == "BILLING"
+    assert reopened.ticket("TKT-1")["subject"] == "subject TKT-1"
+    assert [r["ticket_id"] for r in reopened.query(status="completed", priority="high")] == ["TKT-1"]
+    reopened.close()
+
+def test_sqlite_reads_see_buffered_writes(tmp_path):
+    # arrange
+    store = SQLiteResolutionStore(str(tmp_path / "resolutions.db"), batch_size=1000, flush_interval=60)
+    # act
+    store.add(ticket("TKT-1"), resolution("TKT-1"))
+    store.update(resolution("TKT-1", "completed"))
+    # assert
+    assert store.get("TKT-1")["status"] == "completed"
+    assert store.ticket("TKT-1")["id"] == "TKT-1"
+    assert store.results()[0]["status"] == "completed"
+    store.close()
+
+def test_approval_query_uses_an_index(tmp_path):
+    # arrange
+    store = SQLiteResolutionStore(str(tmp_path / "resolutions.db"))
+    # act
+    plan = " ".join(store.explain(status="needs_approval", priority="CRITICAL", since=time.time() - 3600))
+    # assert
+    assert "USING INDEX idx_resolutions_status" in plan
+    assert "SCAN" not in plan.replace("SCAN resolutions USING INDEX", "")
+    store.close()
@@ -0,0 +1,107 @@
+import pytest
+from textblob import TextBlob
+from src.agents.ResponseAgent import ResponseAgent, ResponseScorer
+from src.agents.ResponseAgent.scoring import template_profile
+from src.config.templates import RESPONSE_TEMPLATES
+from src.models import TicketAnalysis, TicketCategory, Priority
+from src.utils.template_registry import compile_template
+
+scorer = ResponseScorer()
+
+VALUES = [
+    "Ada",
+    "Mr. O'Neil",
+    "login, error, not working!",
+    "Very good news.",
+    "It's not bad",
+    "terrible :)",
+    "Within 1 to 2 weeks.",
+    ""
+]
+
+def rendered_responses():
+    """Every bundled template with a spread of values, some variables left out"""
+    responses = []
+    for source in RESPONSE_TEMPLATES.values():
+        names = sorted(set(template_profile(source).names))
+        for offset in range(len(VALUES)):
+            variables = {
+                name: VALUES[(i + offset) % len(VALUES)]
+                for i, name in enumerate(names) if (i + offset) % 5
+            }
+            responses.append((compile_template(source).render(**variables), source, variables))
+    return responses
+
+@pytest.fixture
+def textstat():
+    """textstat as pinned, reading syllables from the cmudict package"""
+    return pytest.importorskip("textstat")
+
+def test_profile_splits_static_text_and_variables(textstat):
+    # act
+    profile = template_profile("Hi {{name}},\nthanks for the {{ topic }} report.")
+    # assert
+    assert profile.names == ["name", "topic"]
+    assert profile.statics == ["Hi ", ",\nthanks for the ", " report."]
+    assert profile.heads[1] == "," and profile.tails[1] == ""
+
+def test_templates_with_logic_are_not_profiled():
+    # assert
+    assert template_profile("{% if name %}Hi {{name}}{% endif %}") is None
+    assert template_profile("Hi {{ name | upper }}") is None
+
+def test_polarity_matches_textblob(textstat):
+    # act
+    for text, source, variables in rendered_responses():
+        score = scorer.score(text, source, variables)
+        # assert
+        assert score.incremental
+        assert score.polarity == TextBlob(text).sentiment.polarity
+
+def test_readability_matches_textstat(textstat):
+    # act
+    for text, source, variables in rendered_responses():
+        score = scorer.score(text, source, variables)
+        # assert
+        assert score.incremental
+        assert score.readability == textstat.flesch_reading_ease(text)
+
+def test_mismatched_text_is_scored_in_full(textstat):
+    # arrange
+    source = RESPONSE_TEMPLATES["billing"]
+    # act
+    score = scorer.score(source, source, {"name": "Ada"})
+    # assert
+    assert not score.incremental
+    assert score.readability == textstat.flesch_reading_ease(source)
+
+def test_batch_matches_single_scores(textstat):
+    # arrange
+    responses = rendered_responses()
+    # act
+    scores = scorer.score_batch(responses + responses[:3])
+    # assert
+    assert scores[:len(responses)] == [scorer.score(*response) for response in responses]
+    assert scores[-3:] == scores[:3]
+
+def test_confidence_and_approval_are_unchanged(textstat):
+    # arrange
+    agent = ResponseAgent()
+    for priority in Priority:
+        analysis = TicketAnalysis(
+            category=TicketCategory.BILLING,
+            priority=priority,
+            key_points=["invoice", "charged twice"],
+            required_expertise=["billing"],
+            suggested_response_type="billing"
+        )
+        for text, source, variables in rendered_responses():
+            # act
+            confidence = agent._calculate_confidence(text, analysis, source, variables)
+            # assert
+            expected = 0.7 if priority.value < 3 else 0.5
+            expected += 0.2 if textstat.flesch_reading_ease(text) > 60 else -0.1
+            expected += 0.1 * TextBlob(text).sentiment.polarity
+            expected = max(0, min(1, expected))
+            assert confidence == expected
+            assert agent._requires_approval(text, analysis, confidence) == agent._requires_approval(text, analysis, expected)
@@ -0,0 +1,74 @@
+import json
+import pytest
+from src.agents.TicketAnalysisAgent import TicketAnalysisAgent, RuleEngine
+from src.config.rules import TICKET_RULES
+from src.models import Priority, TicketCategory
+
+engine = RuleEngine(TICKET_RULES)
+
+def test_terms_only_match_whole_words():
+    # act
+    result = engine.match("the director wants to address the feedback")
+    # assert
+    assert result.roles == {"director": 1.7}
+    assert "cto" not in result.roles
+    assert result.categories == {}
+
+def test_wildcards_and_multi_word_terms():
+    # act
+    result = engine.match("App CRASHES right\n away when I try to log   in")
+    # assert
+    assert result.categories == {"technical": ["crashes"], "access": ["log in"]}
+    assert result.urgency == ["right away"]
+
+def test_single_pass_scores_priority_and_explains_it():
+    # arrange
+    text = "finance director: 403 error, need this fixed asap for payroll. urgent!"
+    # act
+    result = engine.match(text)
+    # assert
+    assert result.urgency == ["403", "asap", "urgent"]
+    assert result.roles == {"director": 1.7} and result.impact == {"payroll": 2.0}
+    assert result.priority == Priority.CRITICAL
+    assert result.category == TicketCategory.TECHNICAL
+
+def test_most_matched_category_wins():
+    # act
+    result = engine.match("add a payment option to the invoice page")
+    # assert
+    assert result.category == TicketCategory.BILLING
+    assert engine.match("nothing relevant here").category == TicketCategory.TECHNICAL
+
+def test_batch_matches_each_ticket_separately():
+    # arrange
+    texts = ["login failed asap", "", "payroll", "right", "away"]
+    # act
+    results = engine.match_batch(texts)
+    # assert
+    assert results == [engine.match(text) for text in texts]
+    assert results[3].urgency == [] and results[4].urgency == []
+
+def test_rules_load_from_json(tmp_path, monkeypatch):
+    # arrange
+    rules = dict(TICKET_RULES, impact={"outage": 2.0})
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(rules))
+    monkeypatch.setenv("TICKET_RULES_PATH", str(path))
+    # act
+    custom = RuleEngine.from_config()
+    # assert
+    assert custom.match("total outage").impact == {"outage": 2.0}
+    assert custom.version != engine.version
+
+def test_unknown_category_is_rejected():
+    with pytest.raises(ValueError):
+        RuleEngine(dict(TICKET_RULES, categories={"shipping": ["parcel"]}))
+
+def test_agent_attaches_matched_terms():
+    # arrange
+    agent = TicketAnalysisAgent(cache=None)
+    # act
+    analysis = agent._build_analysis("cto says the demo is broken asap", TicketCategory.TECHNICAL, None, key_points=[])
+    # assert
+    assert analysis.matched_terms == {"urgency": ["asap"], "roles": ["cto"], "impact": ["demo"], "category": []}
+    assert analysis.priority == Priority.CRITICAL
@@ -0,0 +1,82 @@
+import pytest
+import time
+from src.agents.TicketProcessor import QueueFull, TicketRunner
+from tests.unit.helpers import SlowProcessor, make_ticket
+
+def wait_for_status(runner, ticket_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while runner.get(ticket_id)["status"] == "pending" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return runner.get(ticket_id)
+
+def test_submit_returns_before_processing():
+    # arrange
+    runner = TicketRunner(processor=SlowProcessor())
+    # act
+    ticket_id = runner.submit(make_ticket("TKT-001"))
+    # assert
+    assert runner.get(ticket_id)["status"] == "pending"
+    assert wait_for_status(runner, ticket_id)["status"] == "completed"
+    runner.shutdown(timeout=5)
+
+def test_runner_failure_marks_ticket_failed():
+    # arrange
+    runner = TicketRunner(processor=SlowProcessor())
+    # act
+    ticket_id = runner.submit(make_ticket("TKT-002", subject="boom"))
+    result = wait_for_status(runner, ticket_id)
+    # assert
+    assert result["status"] == "failed"
+    assert result["error"] == "processor crashed"
+    runner.shutdown(timeout=5)
+
+def test_shutdown_drains_queued_tickets():
+    # arrange
+    runner = TicketRunner(processor=SlowProcessor())
+    ids = [runner.submit(make_ticket(f"TKT-{i:03d}")) for i in range(5)]
+    # act
+    runner.shutdown(timeout=5)
+    # assert
+    assert [runner.get(i)["status"] for i in ids] == ["completed"] * 5
+
+def test_unknown_ticket():
+    runner = TicketRunner(processor=SlowProcessor())
+    assert runner.get("missing") is None
+    runner.shutdown(timeout=5)
+
+def test_full_queue_refuses_tickets():
+    # arrange
+    runner = TicketRunner(processor=SlowProcessor(), max_pending=2)
+    runner.enqueue([make_ticket("TKT-001"), make_ticket("TKT-002")])
+    # act
+    with pytest.raises(QueueFull) as refused:
+        runner.submit(make_ticket("TKT-003"))
+    # assert
+    assert refused.value.pending == 2 and refused.value.retry_after >= 1
+    assert runner.get("TKT-003") is None
+    runner.shutdown(timeout=5)
+
+def test_bulk_submission_is_all_or_nothing():
+    # arrange
+    runner = TicketRunner(processor=SlowProcessor(), max_pending=3)
+    runner.submit(make_ticket("TKT-001"))
+    # act
+    with pytest.raises(QueueFull):
+        runner.enqueue([make_ticket(f"TKT-{i:03d}") for i in range(2, 5)])
+    # assert
+    assert runner.pending == 1
+    assert [r["ticket_id"] for r in runner.results()] == ["TKT-001"]
+    runner.shutdown(timeout=5)
+
+def test_pending_ids_are_rejected_and_futures_resolve():
+    # arrange
+    runner = TicketRunner(processor=SlowProcessor())
+    futures = runner.enqueue([make_ticket("TKT-001"), make_ticket("TKT-002")])
+    # act
+    with pytest.raises(ValueError):
+        runner.submit(make_ticket("TKT-001"))
+    results = [future.result(timeout=5) for future in futures]
+    # assert
+    assert [r["status"] for r in results] == ["completed", "completed"]
+    assert runner.ticket("TKT-002")["subject"] == "Login problems"
+    runner.shutdown(timeout=5)
@@ -0,0 +1,101 @@
+import asyncio
+import importlib
+import pytest
+from src.agents.TicketProcessor.scheduler import PriorityScheduler
+from src.models import Priority
+from src.utils.metrics import MetricsRegistry
+from tests.unit.helpers import make_ticket
+
+scheduler_module = importlib.import_module("src.agents.TicketProcessor.scheduler")
+
+LOW = "please add dark mode to the dashboard"
+CRITICAL = "urgent: payroll is down for the whole company, fix asap"
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = MetricsRegistry()
+    monkeypatch.setattr(scheduler_module, "registry", metrics)
+    return metrics
+
+def test_triage_uses_rule_signals():
+    # arrange
+    scheduler = PriorityScheduler()
+    # act / assert
+    assert scheduler.triage(make_ticket("T1", content=LOW)) == Priority.LOW
+    assert scheduler.triage(make_ticket("T2", content=CRITICAL)) == Priority.CRITICAL
+
+def test_critical_ticket_skips_the_backlog(metrics):
+    # arrange
+    scheduler = PriorityScheduler(concurrency=1)
+    started = []
+
+    async def handle(ticket, hold=0.0):
+        async with scheduler.slot(ticket):
+            started.append(ticket.id)
+            await asyncio.sleep(hold)
+
+    async def run():
+        first = asyncio.create_task(handle(make_ticket("busy", content=LOW), hold=0.05))
+        await asyncio.sleep(0)
+        backlog = [asyncio.create_task(handle(make_ticket(f"low-{i}", content=LOW))) for i in range(5)]
+        await asyncio.sleep(0)
+        urgent = asyncio.create_task(handle(make_ticket("critical", content=CRITICAL)))
+        await asyncio.gather(first, *backlog, urgent)
+
+    # act
+    asyncio.run(run())
+    # assert
+    assert started == ["busy", "critical", "low-0", "low-1", "low-2", "low-3", "low-4"]
+    assert metrics.quantiles("ticket_queue_wait_seconds", priority="CRITICAL")["p50"] > 0
+    # the event loop clock can wake the backlog slightly before 0.05s by perf_counter
+    assert metrics.quantiles("ticket_queue_wait_seconds", priority="LOW")["p99"] >= 0.04
+
+def test_waiting_long_enough_beats_higher_priority():
+    # arrange
+    scheduler = PriorityScheduler(aging_seconds=10)
+    low = make_ticket("low", content=LOW)
+    critical = make_ticket("critical", content=CRITICAL)
+    # act
+    early_low = scheduler.rank(low, Priority.LOW, enqueued=0)
+    newer_critical = scheduler.rank(critical, Priority.CRITICAL, enqueued=20)
+    much_newer_critical = scheduler.rank(critical, Priority.CRITICAL, enqueued=40)
+    # assert
+    assert newer_critical < early_low < much_newer_critical
+
+def test_enterprise_plan_is_weighted_up():
+    # arrange
+    scheduler = PriorityScheduler()
+    tickets = [
+        make_ticket("standard", content="the app is slow"),
+        make_ticket("enterprise", content="the app is slow", plan="Enterprise"),
+        make_ticket("critical", content=CRITICAL)
+    ]
+    # act
+    order = scheduler.order(tickets)
+    # assert
+    assert [tickets[i].id for i in order] == ["critical", "enterprise", "standard"]
+
+def test_cancelled_waiter_passes_its_slot_on(metrics):
+    # arrange
+    scheduler = PriorityScheduler(concurrency=1)
+    started = []
+
+    async def handle(ticket):
+        async with scheduler.slot(ticket):
+            started.append(ticket.id)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        first = asyncio.create_task(handle(make_ticket("first", content=LOW)))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(handle(make_ticket("cancelled", content=CRITICAL)))
+        last = asyncio.create_task(handle(make_ticket("last", content=LOW)))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(first, last)
+
+    # act
+    asyncio.run(run())
+    # assert
+    assert started == ["first", "last"]
+    assert scheduler.waiting == 0
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from src.utils.similarity_index import SimilarityIndex
+
+def unit(*values):
+    return np.array(values, dtype=np.float32)
+
+def test_search_returns_nearest_first():
+    # arrange
+    index = SimilarityIndex(capacity=10)
+    index.add("a", unit(1, 0, 0), {"name": "a"})
+    index.add("b", unit(0, 1, 0), {"name": "b"})
+    index.add("c", unit(1, 1, 0), {"name": "c"})
+    # act
+    matches = index.search(unit(1, 0.1, 0), k=2)
+    # assert
+    assert [key for key, _, _ in matches] == ["a", "c"]
+    assert matches[0][1] == pytest.approx(0.995, abs=1e-3)
+    assert matches[0][2] == {"name": "a"}
+
+def test_vectors_are_stored_as_float16_memmap():
+    # arrange
+    index = SimilarityIndex(capacity=4)
+    # act
+    index.add("a", np.ones(384))
+    # assert
+    assert isinstance(index._vectors, np.memmap)
+    assert index._vectors.dtype == np.float16
+    assert index.dim == 384
+
+def test_min_score_group_and_age_filters():
+    # arrange
+    index = SimilarityIndex(capacity=10)
+    index.add("old", unit(1, 0), group="C1", timestamp=100.0)
+    index.add("new", unit(1, 0.2), group="C1", timestamp=200.0)
+    index.add("other", unit(1, 0), group="C2", timestamp=200.0)
+    index.add("far", unit(0, 1), group="C1", timestamp=200.0)
+    # act
+    recent = index.search(unit(1, 0), k=5, since=150.0, min_score=0.5)
+    customer = index.search(unit(1, 0), k=5, group="C1")
+    # assert
+    assert [key for key, _, _ in recent] == ["other", "new"]
+    assert [key for key, _, _ in customer] == ["old", "new", "far"]
+    assert index.search(unit(1, 0), group="C3") == []
+
+def test_oldest_entries_are_overwritten_when_full():
+    # arrange
+    index = SimilarityIndex(capacity=2)
+    # act
+    index.add("a", unit(1, 0), group="C1")
+    index.add("b", unit(0, 1), group="C1")
+    index.add("c", unit(1, 1), group="C2")
+    # assert
+    assert len(index) == 2
+    assert index.get("a") is None
+    assert [key for key, _, _ in index.search(unit(1, 0), k=5)] == ["c", "b"]
+    assert [key for key, _, _ in index.search(unit(1, 0), k=5, group="C1")] == ["b"]
+
+def test_readding_a_key_replaces_it():
+    # arrange
+    index = SimilarityIndex(capacity=4)
+    index.add("a", unit(1, 0), {"version": 1})
+    # act
+    index.add("a", unit(0, 1), {"version": 2})
+    # assert
+    assert len(index) == 1
+    assert index.search(unit(0, 1))[0][2] == {"version": 2}
+
+def test_mismatched_dimensions_are_rejected():
+    # arrange
+    index = SimilarityIndex(capacity=4)
+    index.add("a", unit(1, 0))
+    # act / assert
+    with pytest.raises(ValueError):
+        index.add("b", unit(1, 0, 0))
+    with pytest.raises(ValueError):
+        index.search(unit(1, 0, 0))
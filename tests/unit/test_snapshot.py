@@ -0,0 +1,94 @@
+import json
+import os
+import pytest
+from src.config.settings import CLASSIFIER_CONFIG, SNAPSHOT_CONFIG
+from src.utils import model_registry, snapshot
+
+@pytest.fixture
+def ner_pipeline():
+    spacy = pytest.importorskip("spacy")
+    nlp = spacy.blank("en")
+    nlp.add_pipe("ner").add_label("ORG")
+    nlp.initialize()
+    return nlp
+
+@pytest.fixture
+def tfidf_model(tmp_path):
+    joblib = pytest.importorskip("joblib")
+    pytest.importorskip("sklearn")
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    path = str(tmp_path / "tfidf.joblib")
+    texts = ["invoice charge refund", "crash error timeout", "password login locked", "feature request idea"]
+    pipeline = make_pipeline(TfidfVectorizer(), LogisticRegression()).fit(texts, ["billing", "technical", "access", "feature"])
+    joblib.dump(pipeline, path)
+    return path
+
+def test_snapshot_is_loaded_instead_of_the_source(monkeypatch, tmp_path, ner_pipeline, tfidf_model):
+    # arrange
+    from src.agents.TicketAnalysisAgent import classifiers
+    directory = str(tmp_path / "snapshot")
+    monkeypatch.setitem(CLASSIFIER_CONFIG, "tfidf", {"model_path": tfidf_model})
+    monkeypatch.setitem(model_registry._models, "spacy_nlp", ner_pipeline)
+    monkeypatch.setitem(model_registry._models, "classifier", classifiers.TfidfBackend(tfidf_model))
+    source_version = classifiers.backend_version("tfidf")
+    # act
+    manifest = snapshot.create_snapshot(directory, ["spacy_nlp", "classifier"])
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "path", directory)
+    nlp = model_registry._load_spacy()
+    backend = classifiers.create_backend("tfidf")
+    # assert
+    assert set(manifest["components"]) == {"spacy_nlp", "classifier/tfidf"}
+    assert nlp.pipe_names == ["ner"]
+    assert backend.model_path == os.path.join(directory, "classifier", "tfidf", "tfidf.joblib")
+    # the copy has the source's version, so cached analyses stay valid
+    assert backend.version == source_version
+    assert backend.classify(["refund my invoice"])[0]["labels"][0] == "billing"
+
+def test_stale_components_load_from_the_source(monkeypatch, tmp_path):
+    # arrange
+    directory = tmp_path / "snapshot"
+    (directory / "spacy_nlp").mkdir(parents=True)
+    manifest = {"components": {"spacy_nlp": {"path": "spacy_nlp", "version": "en_core_web_lg:exclude="}}}
+    (directory / snapshot.MANIFEST_FILE).write_text(json.dumps(manifest))
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "path", str(directory))
+    # act / assert
+    assert snapshot.snapshot_path("spacy_nlp", snapshot.spacy_version()) is None
+    assert snapshot.snapshot_path("spacy_nlp", "en_core_web_lg:exclude=") == str(directory / "spacy_nlp")
+    assert snapshot.snapshot_path("sentence_encoder", snapshot.encoder_version()) is None
+
+def test_using_a_snapshot_disables_hub_requests(monkeypatch, tmp_path):
+    # arrange
+    directory = tmp_path / "snapshot"
+    directory.mkdir()
+    manifest = {"components": {"sentence_encoder": {"path": "sentence_encoder", "version": "model"}}}
+    (directory / snapshot.MANIFEST_FILE).write_text(json.dumps(manifest))
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "path", str(directory))
+    monkeypatch.delenv("HF_HUB_OFFLINE", raising=False)
+    monkeypatch.delenv("TRANSFORMERS_OFFLINE", raising=False)
+    # act
+    snapshot.snapshot_path("sentence_encoder", "model")
+    # assert
+    assert os.environ["HF_HUB_OFFLINE"] == "1"
+    assert os.environ["TRANSFORMERS_OFFLINE"] == "1"
+
+def test_missing_snapshot_is_ignored(monkeypatch, tmp_path):
+    # arrange
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "path", str(tmp_path / "missing"))
+    # act / assert
+    assert snapshot.snapshot_path("spacy_nlp", snapshot.spacy_version()) is None
+
+def test_pipelines_saved_with_tok2vec_are_stale(monkeypatch, tmp_path):
+    # arrange
+    directory = tmp_path / "snapshot"
+    (directory / "spacy_nlp").mkdir(parents=True)
+    before = "en_core_web_sm:exclude=attribute_ruler,lemmatizer,parser,senter,tagger"
+    manifest = {"components": {"spacy_nlp": {"path": "spacy_nlp", "version": before}}}
+    (directory / snapshot.MANIFEST_FILE).write_text(json.dumps(manifest))
+    monkeypatch.setitem(SNAPSHOT_CONFIG, "path", str(directory))
+    # act
+    version = snapshot.spacy_version()
+    # assert
+    assert version == "en_core_web_sm:exclude=attribute_ruler,lemmatizer,parser,senter,tagger,tok2vec"
+    assert snapshot.snapshot_path("spacy_nlp", version) is None
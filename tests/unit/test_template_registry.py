@@ -0,0 +1,67 @@
+import os
+import pytest
+from src.utils.template_registry import TemplateRegistry, compile_template, DEFAULT_TEMPLATES_PATH
+
+def write_templates(path, body, mtime):
+    path.write_text(f"RESPONSE_TEMPLATES = {{'general': {body!r}}}")
+    # explicit mtime so the change is visible regardless of filesystem resolution
+    os.utime(path, (mtime, mtime))
+
+def test_default_templates_are_compiled_once():
+    # arrange
+    from src.agents.ResponseAgent import ResponseAgent
+    registry = TemplateRegistry(DEFAULT_TEMPLATES_PATH)
+    misses = compile_template.cache_info().misses
+    # act
+    rendered = ResponseAgent()._render_template(registry.templates["access"], {"name": "Ada"})
+    # assert
+    # rendering reuses what the registry compiled on load
+    assert "Hello Ada" in rendered
+    assert compile_template.cache_info().misses == misses
+
+def test_edited_file_is_reloaded(tmp_path):
+    # arrange
+    path = tmp_path / "templates.py"
+    write_templates(path, "Hi {{name}}", 1_000_000)
+    registry = TemplateRegistry(str(path), check_interval=0)
+    # act
+    write_templates(path, "Hello {{name}}", 1_000_100)
+    # assert
+    assert compile_template(registry.templates["general"]).render(name="Ada") == "Hello Ada"
+    assert registry.reloads == 2
+
+def test_unchanged_file_is_not_reloaded(tmp_path):
+    # arrange
+    path = tmp_path / "templates.py"
+    write_templates(path, "Hi {{name}}", 1_000_000)
+    registry = TemplateRegistry(str(path), check_interval=0)
+    # act
+    for _ in range(5):
+        registry.templates
+    # assert
+    assert registry.reloads == 1
+
+def test_broken_edit_keeps_previous_templates(tmp_path):
+    # arrange
+    path = tmp_path / "templates.py"
+    write_templates(path, "Hi {{name}}", 1_000_000)
+    registry = TemplateRegistry(str(path), check_interval=0)
+    # act
+    path.write_text("RESPONSE_TEMPLATES = {")
+    os.utime(path, (1_000_100, 1_000_100))
+    # assert
+    assert registry.templates == {"general": "Hi {{name}}"}
+
+def test_missing_file():
+    with pytest.raises(RuntimeError):
+        TemplateRegistry("does/not/exist.py")
+
+def test_broken_template_is_returned_unrendered(caplog):
+    # arrange
+    from src.agents.ResponseAgent import ResponseAgent
+    agent = ResponseAgent()
+    # act
+    rendered = agent._render_template("Hi {{ name", {"name": "Jane"})
+    # assert
+    assert rendered == "Hi {{ name"
+    assert "Template rendering failed" in caplog.text
@@ -0,0 +1,43 @@
+import io
+import json
+import pytest
+from src.utils.ticket_io import iter_json_array, iter_records, ticket_from_record
+
+RECORDS = [
+    {"id": "T1", "subject": "Login", "content": "Cannot log in", "customer_info": {"role": "Admin"}},
+    {"id": 2, "subject": "Billing", "content": "Charged twice [again]", "score": 12345},
+    {"id": "T3", "subject": "Export", "content": "Export \"fails\", see ]"}
+]
+
+def test_json_array_split_across_chunks():
+    # arrange
+    stream = io.StringIO(json.dumps(RECORDS, indent=2))
+    # act
+    records = list(iter_json_array(stream, chunk_size=7))
+    # assert
+    assert records == RECORDS
+
+def test_auto_detects_json_and_jsonl():
+    # arrange
+    array = io.StringIO("\n  " + json.dumps(RECORDS))
+    lines = io.StringIO("\n".join(json.dumps(r) for r in RECORDS) + "\n\n")
+    # act / assert
+    assert list(iter_records(array)) == RECORDS
+    assert list(iter_records(lines)) == RECORDS
+
+def test_empty_and_truncated_input():
+    # arrange / act / assert
+    assert list(iter_records(io.StringIO(""))) == []
+    with pytest.raises(ValueError):
+        list(iter_records(io.StringIO('[{"id": 1}, {"id"'), fmt="json"))
+
+def test_ticket_from_record_validates():
+    # arrange / act
+    ticket = ticket_from_record(RECORDS[1])
+    # assert
+    assert ticket.id == "2"
+    assert ticket.customer_info == {}
+    with pytest.raises(ValueError, match="content"):
+        ticket_from_record({"id": "T4", "subject": "No body"})
+    with pytest.raises(ValueError):
+        ticket_from_record(["not", "a", "ticket"])
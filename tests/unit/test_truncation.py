@@ -0,0 +1,116 @@
+import asyncio
+from src.agents.TicketAnalysisAgent import ClassifierBackend, TicketAnalysisAgent, TicketTrimmer
+
+REPLY = """The export still fails with a timeout after the update.
+
+Thanks,
+Jane Doe
+Data Team, Acme
+
+On Mon, 3 Jun 2024 at 10:00, Support <support@example.com>
+wrote:
+> Could you try exporting again?
+> Regards, Support"""
+
+OUTLOOK = """Same problem today.
+
+-----Original Message-----
+From: Support
+Sent: Monday
+Subject: RE: export
+
+Please retry the export."""
+
+# classifier stand-in that scores each input by its words
+class ChunkBackend(ClassifierBackend):
+    name = "chunk"
+
+    def __init__(self):
+        self.inputs = []
+
+    def classify(self, texts):
+        self.inputs.append(len(texts))
+        return [
+            self._rank({"billing": 0.9, "technical": 0.1} if "invoice" in text else {"billing": 0.2, "technical": 0.8})
+            for text in texts
+        ]
+
+def test_quoted_reply_and_signature_are_stripped():
+    # act
+    subject, content, signature, stats = TicketTrimmer().trim("Export broken", REPLY)
+    # assert
+    assert content.strip() == "The export still fails with a timeout after the update."
+    assert signature.startswith("Thanks,") and "Jane Doe" in signature
+    assert stats.quoted_lines_removed == 4
+    assert stats.signature_lines_removed == 3
+    assert stats.kept_tokens == 12 and not stats.truncated
+
+def test_mid_body_thanks_does_not_start_the_signature():
+    # arrange
+    signed = "Hi team\nThanks!\nI was charged twice for invoice 1234.\nPlease refund the second payment.\nRegards,\nAda"
+    unsigned = "Hi team\nThanks!\nI was charged twice for invoice 1234.\nPlease refund the second payment."
+    # act
+    _, content, signature, stats = TicketTrimmer().trim("Refund", signed)
+    _, unsigned_content, unsigned_signature, _ = TicketTrimmer().trim("Refund", unsigned)
+    # assert
+    assert content.endswith("Please refund the second payment.")
+    assert signature == "Regards,\nAda" and stats.signature_lines_removed == 2
+    assert unsigned_content == unsigned and unsigned_signature == ""
+
+def test_outlook_history_is_stripped():
+    # act
+    _, content, _, stats = TicketTrimmer().trim("Export", OUTLOOK)
+    # assert
+    assert content.strip() == "Same problem today."
+    assert stats.quoted_lines_removed == 6
+
+def test_bare_forward_keeps_the_forwarded_mail():
+    # arrange
+    forward = "---------- Forwarded message ---------\nFrom: billing@example.com\nDate: today\n\nInvoice overdue"
+    # act
+    _, content, _, stats = TicketTrimmer().trim("Fwd: invoice", forward)
+    # assert
+    assert "Invoice overdue" in content
+    assert stats.quoted_lines_removed == 0
+
+def test_budget_keeps_subject_and_newest_content():
+    # arrange
+    trimmer = TicketTrimmer(max_tokens=10, subject_max_tokens=3, chunk_tokens=4)
+    content = " ".join(f"w{i}" for i in range(20))
+    # act
+    subject, kept, _, stats = trimmer.trim("one two three four", content)
+    # assert
+    assert subject == "one two three"
+    assert kept == "w0 w1 w2 w3 w4 w5 w6"
+    assert (stats.original_tokens, stats.kept_tokens, stats.chunks) == (24, 10, 3)
+    assert stats.truncated
+
+def test_long_tickets_are_classified_in_chunks():
+    # arrange
+    backend = ChunkBackend()
+    agent = TicketAnalysisAgent(classifier=backend, cache=None, trimmer=TicketTrimmer(max_tokens=400, chunk_tokens=100))
+    # three quarters of the words are about the app crashing
+    text = " ".join(["invoice"] * 100 + ["crash"] * 300)
+    # act
+    [(category, scores)] = agent._classify_with_scores([text])
+    # assert
+    assert backend.inputs == [4]
+    assert category.value == "technical"
+    assert abs(scores["technical"] - (0.1 * 100 + 0.8 * 300) / 400) < 1e-9
+
+def test_analysis_reports_truncation():
+    # arrange
+    agent = TicketAnalysisAgent(
+        classifier=ChunkBackend(),
+        cache=None,
+        trimmer=TicketTrimmer(max_tokens=50, chunk_tokens=20)
+    )
+    agent._extract_key_points = lambda text: []
+    text = "my invoice is wrong " * 40
+    # act
+    analysis = asyncio.run(agent.analyze_ticket(text))
+    # assert
+    assert analysis.truncation.original_tokens == 160
+    assert analysis.truncation.kept_tokens == 50
+    assert analysis.truncation.chunks == 3
+    assert analysis.truncation.truncated
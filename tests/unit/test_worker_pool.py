@@ -0,0 +1,104 @@
+import asyncio
+import os
+import pytest
+from src.agents.TicketProcessor import WorkerPool, TicketRunner
+from src.utils.metrics import registry
+from tests.unit.helpers import make_resolution, make_ticket
+
+# processor stand-in, "crash" kills the worker the first time (per marker file), "poison" every time
+class CrashingProcessor:
+    def __init__(self, marker):
+        self.marker = marker
+
+    async def process_ticket(self, ticket):
+        await asyncio.sleep(0.01)
+        if ticket.subject == "poison" or (ticket.subject == "crash" and not os.path.exists(self.marker)):
+            open(self.marker, "w").close()
+            os._exit(1)
+        # recorded in the worker's registry, the parent only sees it when merged
+        registry.increment("test_worker_tickets_total")
+        return make_resolution(ticket.id, response_text=f"handled by {os.getpid()}")
+
+class ProcessorFactory:
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __call__(self):
+        return CrashingProcessor(self.marker)
+
+def make_pool(tmp_path, workers=2):
+    return WorkerPool(
+        workers=workers,
+        concurrency=2,
+        processor_factory=ProcessorFactory(str(tmp_path / "crashed")),
+        preload=[]
+    ).start()
+
+def test_pool_spreads_tickets_over_workers(tmp_path):
+    # arrange
+    pool = make_pool(tmp_path)
+    tickets = [make_ticket(f"TKT-{i:03d}") for i in range(12)]
+    # act
+    results = asyncio.run(pool.process_batch(tickets))
+    pool.shutdown(timeout=10)
+    # assert
+    assert [r.ticket_id for r in results] == [t.id for t in tickets]
+    assert {r.status for r in results} == {"completed"}
+    assert len({r.response_text for r in results}) == 2
+
+def test_worker_metrics_reach_the_parent(tmp_path):
+    # arrange
+    pool = make_pool(tmp_path)
+    before = registry.counter("test_worker_tickets_total")
+    # act
+    asyncio.run(pool.process_batch([make_ticket(f"TKT-{i:03d}") for i in range(6)]))
+    merged = registry.counter("test_worker_tickets_total") - before
+    pool.shutdown(timeout=10)
+    # assert
+    assert merged == 6
+
+def test_same_customer_goes_to_same_worker(tmp_path):
+    # arrange
+    pool = make_pool(tmp_path, workers=3)
+    tickets = [make_ticket(f"TKT-{i:03d}", customer_id="C42") for i in range(6)]
+    # act
+    results = asyncio.run(pool.process_batch(tickets))
+    pool.shutdown(timeout=10)
+    # assert
+    assert len({r.response_text for r in results}) == 1
+
+def test_crashed_worker_is_replaced_and_ticket_retried(tmp_path):
+    # arrange
+    pool = make_pool(tmp_path)
+    # act
+    crashed = pool.submit(make_ticket("TKT-001", subject="crash")).result(timeout=20)
+    poisoned = pool.submit(make_ticket("TKT-002", subject="poison")).result(timeout=20)
+    after = pool.submit(make_ticket("TKT-003")).result(timeout=20)
+    pool.shutdown(timeout=10)
+    # assert
+    assert crashed.status == "completed"
+    assert poisoned.status == "failed" and "crashed 2 times" in poisoned.error
+    assert after.status == "completed"
+    assert pool.restarts == 3
+    # replacements are not forked from the pool's threads
+    assert pool._restart_context.get_start_method() in ("forkserver", "spawn")
+
+def test_shutdown_drains_and_rejects_new_tickets(tmp_path):
+    # arrange
+    pool = make_pool(tmp_path)
+    futures = [pool.submit(make_ticket(f"TKT-{i:03d}")) for i in range(8)]
+    # act
+    pool.shutdown(timeout=10)
+    # assert
+    assert all(f.done() and f.result().status == "completed" for f in futures)
+    with pytest.raises(RuntimeError):
+        pool.submit(make_ticket("TKT-009"))
+
+def test_runner_dispatches_to_pool(tmp_path):
+    # arrange
+    runner = TicketRunner(pool=make_pool(tmp_path))
+    ids = [runner.submit(make_ticket(f"TKT-{i:03d}")) for i in range(4)]
+    # act
+    runner.shutdown(timeout=10)
+    # assert
+    assert [runner.get(i)["status"] for i in ids] == ["completed"] * 4
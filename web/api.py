@@ -0,0 +1,141 @@
+"""
+JSON ingestion API for machine clients, served by aiohttp on the TicketRunner's
+event loop next to the Flask UI.
+
+    POST /api/tickets          one ticket object or an array of them -> 202
+    POST /api/tickets/stream   same body, resolutions streamed back as NDJSON
+                               in completion order
+    GET  /api/tickets/{id}     current resolution
+
+Submissions that don't fit in the runner's queue get 429 with Retry-After.
+"""
+import asyncio
+import json
+from typing import Any, Callable, List, Optional, Tuple
+
+from aiohttp import web
+
+from src.agents.TicketProcessor import QueueFull, TicketRunner
+from src.config.settings import INGEST_CONFIG
+from src.models import SupportTicket
+from src.utils.serialization import to_jsonable
+from src.utils.ticket_io import ticket_from_record
+
+RUNNER_KEY = web.AppKey("runner", TicketRunner)
+NEXT_ID_KEY = web.AppKey("next_id", Callable[[], str])
+
+
+def _error(status: int, message: str, **headers: str) -> web.Response:
+    return web.json_response({"error": message}, status=status, headers=headers)
+
+
+def _bad_request(message: str) -> web.HTTPBadRequest:
+    return web.HTTPBadRequest(text=json.dumps({"error": message}), content_type="application/json")
+
+
+async def _read_tickets(request: web.Request) -> Tuple[List[SupportTicket], bool]:
+    """Tickets from a JSON object or array body, ids assigned where missing"""
+    try:
+        body = await request.json()
+    except json.JSONDecodeError as e:
+        raise _bad_request(f"Invalid JSON: {str(e)}")
+
+    bulk = isinstance(body, list)
+    records = body if bulk else [body]
+    if not records:
+        raise _bad_request("No tickets submitted")
+    next_id = request.app[NEXT_ID_KEY]
+    tickets = []
+    for index, record in enumerate(records):
+        if isinstance(record, dict) and "id" not in record:
+            record = dict(record, id=next_id())
+        try:
+            tickets.append(ticket_from_record(record))
+        except (ValueError, TypeError) as e:
+            raise _bad_request((f"Ticket {index}: " if bulk else "") + str(e))
+    return tickets, bulk
+
+
+def _enqueue(request: web.Request, tickets: List[SupportTicket]):
+    """Runner futures for the tickets, or the 429/409 response refusing them"""
+    try:
+        return request.app[RUNNER_KEY].enqueue(tickets), None
+    except QueueFull as e:
+        return None, _error(429, str(e), **{"Retry-After": str(e.retry_after)})
+    except ValueError as e:
+        return None, _error(409, str(e))
+
+
+def _accepted(ticket: SupportTicket) -> dict:
+    return {
+        "ticket_id": ticket.id,
+        "status": "pending",
+        "status_url": f"/api/tickets/{ticket.id}"
+    }
+
+
+async def submit_tickets(request: web.Request) -> web.Response:
+    tickets, bulk = await _read_tickets(request)
+    futures, refused = _enqueue(request, tickets)
+    if refused is not None:
+        return refused
+    if bulk:
+        return web.json_response({"tickets": [_accepted(t) for t in tickets]}, status=202)
+    return web.json_response(_accepted(tickets[0]), status=202)
+
+
+async def stream_tickets(request: web.Request) -> web.StreamResponse:
+    tickets, _ = await _read_tickets(request)
+    futures, refused = _enqueue(request, tickets)
+    if refused is not None:
+        return refused
+
+    response = web.StreamResponse(status=200, headers={"Content-Type": "application/x-ndjson"})
+    await response.prepare(request)
+    # a client that disconnects stops the stream, the tickets are still processed
+    for completed in asyncio.as_completed([asyncio.wrap_future(f) for f in futures]):
+        resolution = await completed
+        await response.write(json.dumps(to_jsonable(resolution)).encode("utf-8") + b"\n")
+    await response.write_eof()
+    return response
+
+
+async def get_ticket(request: web.Request) -> web.Response:
+    resolution = request.app[RUNNER_KEY].get(request.match_info["ticket_id"])
+    if resolution is None:
+        return _error(404, "Unknown ticket")
+    return web.json_response(to_jsonable(resolution))
+
+
+def create_api(runner: TicketRunner, next_id: Callable[[], str]) -> web.Application:
+    app = web.Application(client_max_size=INGEST_CONFIG["max_body_bytes"])
+    app[RUNNER_KEY] = runner
+    app[NEXT_ID_KEY] = next_id
+    app.router.add_post("/api/tickets", submit_tickets)
+    app.router.add_post("/api/tickets/stream", stream_tickets)
+    app.router.add_get("/api/tickets/{ticket_id}", get_ticket)
+    return app
+
+
+def start_api(
+    runner: TicketRunner,
+    next_id: Callable[[], str],
+    host: Optional[str] = None,
+    port: Optional[int] = None
+) -> Any:
+    """Serve the API on the runner's loop, it is closed when the runner shuts down"""
+    app_runner = web.AppRunner(create_api(runner, next_id))
+
+    async def start():
+        await app_runner.setup()
+        site = web.TCPSite(
+            app_runner,
+            host or INGEST_CONFIG["api_host"],
+            port if port is not None else INGEST_CONFIG["api_port"]
+        )
+        await site.start()
+        return site
+
+    site = asyncio.run_coroutine_threadsafe(start(), runner.loop).result()
+    runner.on_shutdown(app_runner.cleanup)
+    return site
@@ -6,29 +6,121 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
-from flask import Flask, render_template, request, redirect, url_for
-from dataclasses import asdict
-import asyncio
-from src.agents.TicketProcessor import TicketProcessor
-from src.models import SupportTicket
+from flask import Flask, Response, render_template, request, redirect, url_for, jsonify, abort, stream_with_context
+from enum import Enum
+import atexit
+import json
+import threading
+import time
+import uuid
+from src.agents.TicketProcessor import QueueFull, TicketRunner, WorkerPool
+from src.config.settings import INGEST_CONFIG, RESOLUTION_STORE_CONFIG, WORKER_CONFIG
+from src.models import Priority, SupportTicket, TicketCategory
+from src.utils.metrics import registry
+from src.utils.resolution_store import create_resolution_store
+from src.utils.serialization import to_jsonable
 
 app = Flask(__name__)
 
-# Simple in-memory storage for demo purposes
-support_tickets = []
-processed_tickets = []
+# one processor per worker, created on first use so forking servers don't share its thread
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> TicketRunner:
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                # TICKET_WORKERS > 0 spreads tickets over worker processes
+                pool = WorkerPool().start() if WORKER_CONFIG["workers"] else None
+                _runner = TicketRunner(pool=pool, store=create_resolution_store())
+                atexit.register(_runner.shutdown, 30)
+                if INGEST_CONFIG["api_port"]:
+                    # JSON ingestion API on the runner's event loop
+                    from web.api import start_api
+                    start_api(_runner, next_ticket_id)
+    return _runner
+
+
+def next_ticket_id() -> str:
+    # random rather than a per-process counter, so app workers sharing a store never collide
+    return f"TKT-{uuid.uuid4().hex[:16]}"
+
+
+def wants_json() -> bool:
+    """JSON for API clients, HTML for browsers"""
+    return request.args.get('format') == 'json' or request.accept_mimetypes.best == 'application/json'
+
+
+@app.template_filter('label')
+def label(value):
+    """Enum name, or the name the SQLite store returns in its place"""
+    return value.name if isinstance(value, Enum) else value
+
+
+def ticket_filters() -> dict:
+    """Store filters from the query string, e.g. ?status=needs_approval&priority=critical&hours=1"""
+    hours = request.args.get('hours', type=float)
+    priority = request.args.get('priority') or None
+    category = request.args.get('category') or None
+    if priority and priority.upper() not in Priority.__members__:
+        abort(400, f"Unknown priority '{priority}'")
+    if category and category.upper() not in TicketCategory.__members__:
+        abort(400, f"Unknown category '{category}'")
+    return {
+        "status": request.args.get('status') or None,
+        "priority": priority,
+        "category": category,
+        "customer_id": request.args.get('customer') or None,
+        "since": time.time() - hours * 3600 if hours else None
+    }
 
 
 @app.route('/')
 def index():
-    return render_template('index.html', tickets=processed_tickets)
+    store = get_runner().store
+    filters = ticket_filters()
+    page = max(1, request.args.get('page', 1, type=int))
+    page_size = RESOLUTION_STORE_CONFIG["page_size"]
+    tickets = store.query(limit=page_size, offset=(page - 1) * page_size, **filters)
+    total = store.count(**filters)
+    if wants_json():
+        return jsonify({"tickets": to_jsonable(tickets), "total": total, "page": page, "page_size": page_size})
+    subjects = {t['ticket_id']: (store.ticket(t['ticket_id']) or {}).get('subject', '') for t in tickets}
+    args = {key: value for key, value in request.args.items() if key != 'page'}
+    return render_template(
+        'index.html',
+        tickets=tickets,
+        subjects=subjects,
+        total=total,
+        page=page,
+        pages=max(1, -(-total // page_size)),
+        args=args
+    )
+
+@app.route('/export')
+def export():
+    """Every matching ticket with its resolution as JSON lines, oldest first"""
+    store = get_runner().store
+    filters = ticket_filters()
+
+    def lines():
+        for row in store.export(**filters):
+            yield json.dumps(to_jsonable(row)) + "\n"
+
+    return Response(
+        stream_with_context(lines()),
+        mimetype='application/x-ndjson',
+        headers={'Content-Disposition': 'attachment; filename=tickets.jsonl'}
+    )
 
 @app.route('/add-ticket', methods=['GET', 'POST'])
 def add_ticket():
     if request.method == 'POST':
         # Create support ticket from form data
         ticket_data = {
-            "id": f"TKT-{len(processed_tickets)+1:03d}",
+            "id": next_ticket_id(),
             "subject": request.form['subject'],
             "content": request.form['content'],
             "customer_info": {
@@ -38,26 +130,41 @@ def add_ticket():
                 "plan": request.form.get('plan', 'Standard')
             }
         }
-        support_tickets.append(ticket_data)
-        # Process ticket asynchronously
-        result = asyncio.run(process_ticket_async(ticket_data))
-        processed_tickets.append(result)
-        
-        return redirect(url_for('index'))
-    
+        # Queue ticket for background processing and return straight away
+        try:
+            ticket_id = get_runner().submit(SupportTicket(**ticket_data))
+        except QueueFull as e:
+            response = jsonify({"error": str(e)}) if wants_json() else Response(str(e), mimetype='text/plain')
+            response.status_code = 429
+            response.headers['Retry-After'] = str(e.retry_after)
+            return response
+
+        if wants_json():
+            return jsonify({
+                "ticket_id": ticket_id,
+                "status": "pending",
+                "status_url": url_for('view_ticket', ticket_id=ticket_id, format='json')
+            }), 202
+        return redirect(url_for('view_ticket', ticket_id=ticket_id))
+
     return render_template('add_ticket.html')
 
 @app.route('/ticket/<ticket_id>')
 def view_ticket(ticket_id):
-    ticket = next((t for t in processed_tickets if t['ticket_id'] == ticket_id), None)
-    original_ticket = next((t for t in support_tickets if t['id'] == ticket_id), None)
+    ticket = get_runner().get(ticket_id)
+    if ticket is None:
+        abort(404)
+    if wants_json():
+        return jsonify(to_jsonable(ticket))
+    original_ticket = get_runner().ticket(ticket_id)
     return render_template('view_ticket.html', ticket=ticket, original_ticket=original_ticket)
 
-async def process_ticket_async(ticket_data):
-    processor = TicketProcessor()
-    support_ticket = SupportTicket(**ticket_data)
-    resolution = await processor.process_ticket(support_ticket)
-    return asdict(resolution)
+@app.route('/metrics')
+def metrics():
+    # Prometheus text exposition format
+    return Response(registry.render_prometheus(), mimetype='text/plain; version=0.0.4')
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    # start the runner (and the JSON API when TICKET_API_PORT is set) up front
+    get_runner()
+    app.run(debug=True, use_reloader=False)